@@ -4,6 +4,8 @@ from pydantic import ValidationError
 
 from .settings.core import CoreSettings
 from .settings.google_drive import GoogleDriveSettings
+from .settings.ingestion import IngestionSettings
+from .settings.parsing import ParsingSettings
 from .settings.smtp import SMTPSettings
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,8 @@ class Config:
             self.core = CoreSettings()
             self.google_drive = GoogleDriveSettings()
             self.smtp = SMTPSettings()
+            self.parsing = ParsingSettings()
+            self.ingestion = IngestionSettings()
 
             logger.info("✅ Configuration loaded successfully")
         except ValidationError as e:
@@ -28,4 +32,6 @@ class Config:
             "core": self.core.model_dump(),
             "google_drive": self.google_drive.model_dump(),
             "smtp": self.smtp.summary(),
+            "parsing": self.parsing.model_dump(),
+            "ingestion": self.ingestion.model_dump(),
         }
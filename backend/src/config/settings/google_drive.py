@@ -1,3 +1,5 @@
+from typing import Literal
+
 from .base import BaseSettingsConfig, SettingsConfigDict
 
 
@@ -7,6 +9,11 @@ class GoogleDriveSettings(BaseSettingsConfig):
     GOOGLE_DRIVE_DIR_ID: str
     GOOGLE_REFRESH_TOKEN: str
     GOOGLE_KEY: str
+    STORAGE_ENCODING: Literal["json", "gzip", "zstd"] = "json"
+    JOB_OFFERS_STORAGE: Literal["single_file", "per_offer"] = "single_file"
+    JOB_OFFERS_WRITE_BEHIND: bool = False
+    JOB_OFFERS_FLUSH_DEBOUNCE_SECONDS: float = 2.0
+    JOB_OFFERS_FLUSH_MAX_DELAY_SECONDS: float = 10.0
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
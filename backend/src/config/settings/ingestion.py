@@ -0,0 +1,32 @@
+from typing import Optional
+
+from .base import BaseSettingsConfig, SettingsConfigDict
+
+
+class IngestionSettings(BaseSettingsConfig):
+    INGESTION_BATCH_WORKERS: int = 2
+    INGESTION_BATCH_TTL_SECONDS: int = 6 * 60 * 60
+    INGESTION_ARCHIVE_CONCURRENCY: int = 4
+    INGESTION_PARSE_CONCURRENCY: int = 4
+    INGESTION_ANALYZE_CONCURRENCY: int = 2
+    INGESTION_STAGE_QUEUE_SIZE: int = 8
+    INGESTION_INITIAL_IN_FLIGHT: int = 8
+    INGESTION_MIN_IN_FLIGHT: int = 2
+    INGESTION_MAX_IN_FLIGHT: int = 32
+    INGESTION_MAX_BACKLOG: int = 200
+    INGESTION_LATENCY_TOLERANCE: float = 2.0
+    INGESTION_CPU_LOAD_THRESHOLD: float = 1.5
+    INGESTION_INTERACTIVE_MAX_FILES: int = 3
+    INGESTION_BULK_MIN_FILES: int = 50
+    INGESTION_ZIP_MAX_ENTRIES: int = 1000
+    INGESTION_ZIP_MAX_TOTAL_MB: int = 1024
+    INGESTION_ZIP_MAX_RATIO: float = 100.0
+    INGESTION_UPLOAD_SESSION_DIR: Optional[str] = None
+    INGESTION_UPLOAD_SESSION_TTL_SECONDS: int = 24 * 60 * 60
+    INGESTION_UPLOAD_MAX_CHUNK_MB: int = 16
+    INGESTION_UPLOAD_MAX_REQUEST_MB: int = 1024
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False
+    )
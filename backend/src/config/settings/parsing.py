@@ -0,0 +1,17 @@
+from typing import Optional
+
+from .base import BaseSettingsConfig, SettingsConfigDict
+
+
+class ParsingSettings(BaseSettingsConfig):
+    PARSER_SANDBOX_ENABLED: bool = True
+    PARSER_WORKERS: int = 4
+    PARSER_TIMEOUT_SECONDS: float = 60.0
+    PARSER_MAX_RSS_MB: int = 1024
+    PARSER_MAX_PAGES: int = 10
+    NAME_GAZETTEER_PATH: Optional[str] = None
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False
+    )
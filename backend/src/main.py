@@ -1,6 +1,7 @@
 from dotenv import load_dotenv
 
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
@@ -8,10 +9,17 @@ from backend.src.config.logging_config import configure_logging
 from backend.src.config.loader import Config
 from backend.src.routes.google_drive_route import router as drive_router
 from backend.src.routes.upload_route import router as upload_router
+from backend.src.routes.upload_sessions_route import router as upload_sessions_router
 from backend.src.routes.job_offers_route import router as job_offers_router
 from backend.src.routes.synonym_recognizer_route import router as synonym_recognizer_router
 from backend.src.routes.candidates_route import router as candidates_router
 from backend.src.routes.email_route import router as email_router
+from backend.src.services.document_parsing import get_parsing_sandbox
+from backend.src.services.ingestion_batches import get_batch_queue
+from backend.src.services.ingestion_pipeline import get_ingestion_pipeline
+from backend.src.services.job_offers.job_offers_repository import get_job_offer_repository
+from backend.src.services.upload_sessions import get_upload_sessions
+from backend.src.utils.json_codec import FastJSONResponse
 
 configure_logging()
 logger = logging.getLogger(__name__)
@@ -19,7 +27,25 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 config = Config()
 
-app = FastAPI(title=config.core.APP_NAME)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    batch_queue = get_batch_queue()
+    await batch_queue.start()
+    yield
+    try:
+        await get_upload_sessions().stop()
+        await batch_queue.stop()
+        get_ingestion_pipeline().shutdown()
+        sandbox = get_parsing_sandbox()
+        if sandbox is not None:
+            sandbox.close()
+    finally:
+        # Pending job offer changes are only in memory until this runs.
+        await get_job_offer_repository().flush()
+
+
+app = FastAPI(title=config.core.APP_NAME, lifespan=lifespan, default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,6 +57,7 @@ app.add_middleware(
 
 app.include_router(drive_router)
 app.include_router(upload_router)
+app.include_router(upload_sessions_router)
 app.include_router(synonym_recognizer_router)
 app.include_router(job_offers_router)
 app.include_router(candidates_router)
@@ -34,3 +34,19 @@ class JobOffer(JobOfferCreate):
 
 class JobOfferList(BaseModel):
     items: List[JobOffer]
+
+
+class JobOfferUpdate(JobOfferCreate):
+    id: str
+
+
+class JobOfferBulkRequest(BaseModel):
+    create: List[JobOfferCreate] = Field(default_factory=list)
+    update: List[JobOfferUpdate] = Field(default_factory=list)
+    delete: List[str] = Field(default_factory=list)
+
+
+class JobOfferBulkResult(BaseModel):
+    created: List[JobOffer]
+    updated: List[JobOffer]
+    deleted: List[str]
@@ -0,0 +1,10 @@
+from __future__ import annotations
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class UploadFileCreate(BaseModel):
+    file_name: str = Field(..., min_length=1)
+    content_type: str
+    size: int = Field(..., ge=0)
+    sha256: Optional[str] = Field(default=None, pattern=r"^[0-9a-fA-F]{64}$")
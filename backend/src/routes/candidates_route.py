@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional, List, Dict, Any
 
 from fastapi import APIRouter, Query, HTTPException, status
-from fastapi.responses import JSONResponse
 
-from backend.src.services.candidate_storage import GoogleDriveCandidateStore, CandidateRecord
+from backend.src.services.candidate_storage import GoogleDriveCandidateStore
+from backend.src.utils.json_codec import FastJSONResponse
 
 router = APIRouter(prefix="/candidates", tags=["Candidates"])
 
@@ -22,10 +23,28 @@ async def list_candidates(
             "Jeśli true – tylko kandydaci globalnie odrzuceni lub bez dopasowań"
         ),
     ),
+    created_from: Optional[datetime] = Query(
+        None,
+        description=(
+            "Tylko kandydaci dodani od tej chwili (ISO 8601); "
+            "kandydaci bez daty dodania są zawsze zwracani"
+        ),
+    ),
+    created_to: Optional[datetime] = Query(
+        None,
+        description=(
+            "Tylko kandydaci dodani do tej chwili (ISO 8601); "
+            "kandydaci bez daty dodania są zawsze zwracani"
+        ),
+    ),
 ):
     try:
         store = GoogleDriveCandidateStore()
-        records: List[CandidateRecord] = store.load_all()
+        records, total = store.query_with_total(
+            job_id=job_id,
+            created_from=created_from,
+            created_to=created_to,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -64,12 +83,12 @@ async def list_candidates(
         result.append(data)
 
     response_body = {
-        "total_candidates": len(records),
+        "total_candidates": total,
         "returned_candidates": len(result),
         "candidates": result,
     }
 
-    return JSONResponse(status_code=status.HTTP_200_OK, content=response_body)
+    return FastJSONResponse(status_code=status.HTTP_200_OK, content=response_body)
 
 
 @router.delete("/{candidate_id}")
@@ -89,7 +108,7 @@ async def delete_candidate(candidate_id: str):
             detail=f"Kandydat o id={candidate_id} nie istnieje",
         )
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_200_OK,
         content={"status": "ok", "deleted_id": candidate_id},
     )
@@ -0,0 +1,9 @@
+from typing import Literal
+
+from fastapi import Query
+
+Priority = Literal["interactive", "normal", "bulk"]
+PRIORITY_QUERY = Query(
+    None,
+    description="Priorytet przetwarzania; domyślnie zależy od liczby plików (mało plików – interactive, dużo – bulk)",
+)
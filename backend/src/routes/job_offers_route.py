@@ -1,18 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from typing import List
 
-from backend.src.models.job_offers_model import JobOffer, JobOfferCreate
-from backend.src.services.job_offers.job_offers_repository import JobOfferRepository
-from backend.src.services.job_offers.job_offers_store import GoogleDriveJobOfferStore
+from backend.src.models.job_offers_model import JobOffer, JobOfferBulkRequest, JobOfferBulkResult, JobOfferCreate
+from backend.src.services.job_offers.job_offers_repository import JobOfferRepository, get_job_offer_repository
 
 router = APIRouter(prefix="/jobs", tags=["Job Offers"])
 
-store = GoogleDriveJobOfferStore()
-repo = JobOfferRepository(store)
-
 
 def get_repo() -> JobOfferRepository:
-    return repo
+    return get_job_offer_repository()
 
 
 @router.get("", response_model=List[JobOffer])
@@ -36,6 +32,21 @@ async def create_job(
     return await repository.create(payload)
 
 
+@router.post("/bulk", response_model=JobOfferBulkResult)
+async def bulk_jobs(
+    payload: JobOfferBulkRequest,
+    repository: JobOfferRepository = Depends(get_repo),
+):
+    """Creates, updates and deletes many offers at once, with one write to Drive."""
+    try:
+        created, updated, deleted = await repository.bulk(payload.create, payload.update, payload.delete)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail={"message": "Job offer not found", "ids": e.args[0]})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"message": "Job offer listed more than once", "ids": e.args[0]})
+    return JobOfferBulkResult(created=created, updated=updated, deleted=deleted)
+
+
 @router.put("/{job_id}", response_model=JobOffer)
 async def update_job(
     job_id: str, payload: JobOfferCreate, repository: JobOfferRepository = Depends(get_repo)
@@ -3,223 +3,326 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import List, Optional, Dict, Any
-
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, Query
-from fastapi.responses import JSONResponse
-
-from backend.src.services.document_parsing import DocumentParsingService
-from backend.src.services.job_offers.job_offers_store import GoogleDriveJobOfferStore
-from backend.src.utils.file_validation import validate_file
-from backend.src.services.cv_storage import save_cv_file_to_drive
-from backend.src.services.cv_processing import (
-    process_file,
-    CandidateProcessingResult,
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, List, Optional
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, status, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from fastapi.routing import APIRoute
+from starlette.background import BackgroundTask
+
+from backend.src.config.settings.ingestion import IngestionSettings
+from backend.src.routes.ingestion_params import PRIORITY_QUERY, Priority
+from backend.src.services.admission import (
+    AdmissionRejected,
+    Reservation,
+    get_admission_controller,
+    priority_for_batch,
 )
-from backend.src.models.job_offers_model import JobOffer
+from backend.src.services.cancellation import CancellationToken, IngestionCancelled
+from backend.src.services.cv_ingestion import (
+    create_parsing_service,
+    ingest_as_completed,
+    load_jobs,
+    summarize_results,
+)
+from backend.src.services.cv_processing import CandidateProcessingResult
+from backend.src.services.ingestion_batches import get_batch_queue
+from backend.src.services.upload_intake import IntakeFile, spool_upload
+from backend.src.services.zip_intake import ZipArchiveRejected, ZipIntake, ZipLimits
+from backend.src.utils import json_codec
+from backend.src.utils.file_validation import validate_upload
+from backend.src.utils.json_codec import FastJSONResponse
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+
+ingestion_settings = IngestionSettings()
+
+DISCONNECT_POLL_SECONDS = 0.5
+# Non-standard "Client Closed Request"; only ends up in access logs, the client is gone.
+CLIENT_CLOSED_REQUEST = 499
+
+
+class _UploadLimitRoute(APIRoute):
+    """
+    Refuses a request whose Content-Length exceeds INGESTION_UPLOAD_MAX_REQUEST_MB
+    before FastAPI reads and spools the multipart body. Per-file sizes are only
+    known once the body is parsed; validate_upload checks those.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        max_bytes = ingestion_settings.INGESTION_UPLOAD_MAX_REQUEST_MB * 1024 * 1024
+
+        async def limited_handler(request: Request) -> Response:
+            length = request.headers.get("content-length", "")
+            if length.isdigit() and int(length) > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Request too large: limit is {ingestion_settings.INGESTION_UPLOAD_MAX_REQUEST_MB} MB.",
+                )
+            return await handler(request)
+
+        return limited_handler
+
+
+router = APIRouter(route_class=_UploadLimitRoute)
 
 
 @router.post("/upload")
 async def upload_files(
+    request: Request,
     top_n: int = Query(3, ge=1, le=20),
+    background: bool = Query(
+        False,
+        description="Jeśli true – przyjmij paczkę do kolejki i zwróć batch_id (status: GET /upload/{batch_id})",
+    ),
+    priority: Optional[Priority] = PRIORITY_QUERY,
     files: List[UploadFile] = File(...),
 ):
     if not files:
         raise HTTPException(status_code=400, detail="No files sent")
 
-    parsing_service = DocumentParsingService()
+    priority = priority or _default_priority(len(files))
+    if background:
+        return await _enqueue_batch(files, top_n, priority)
 
-    job_store = GoogleDriveJobOfferStore()
-    offers_data = await job_store.load_all()
-    jobs: List[JobOffer] = [JobOffer(**o) for o in offers_data]
+    reservation = _reserve(len(files))
+    try:
+        parsing_service = create_parsing_service()
+        jobs = await load_jobs()
+        intakes = [IntakeFile.from_upload(f) for f in files]
 
-    if not jobs:
-        logger.warning("No job offers available for matching.")
+        candidate_results: List[CandidateProcessingResult] = []
+        async with _cancel_on_disconnect(request) as cancel_token:
+            async for _, result in ingest_as_completed(
+                intakes,
+                parsing_service,
+                jobs,
+                reservation=reservation,
+                priority=priority,
+                cancel_token=cancel_token,
+            ):
+                if result is not None:
+                    candidate_results.append(result)
+    except IngestionCancelled:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    finally:
+        reservation.close()
+
+    response_body = summarize_results(candidate_results, top_n)
+    return FastJSONResponse(status_code=status.HTTP_200_OK, content=response_body)
+
+
+@router.post("/upload/stream")
+async def upload_files_stream(
+    request: Request,
+    top_n: int = Query(3, ge=1, le=20),
+    priority: Optional[Priority] = PRIORITY_QUERY,
+    files: List[UploadFile] = File(...),
+):
+    """
+    Same processing as /upload, streamed as NDJSON: one "result" event per CV
+    as soon as it is finished, then a final "summary" event with the ranking.
+    """
+    if not files:
+        raise HTTPException(status_code=400, detail="No files sent")
 
-    sem = asyncio.Semaphore(10)
+    priority = priority or _default_priority(len(files))
+    reservation = _reserve(len(files))
+    try:
+        parsing_service = create_parsing_service()
+        jobs = await load_jobs()
+    except BaseException:
+        reservation.close()
+        raise
+    intakes = [IntakeFile.from_upload(f) for f in files]
+
+    async def events() -> AsyncIterator[bytes]:
+        candidate_results: List[CandidateProcessingResult] = []
+        processed = 0
+
+        try:
+            async with _cancel_on_disconnect(request) as cancel_token:
+                async for intake, result in ingest_as_completed(
+                    intakes,
+                    parsing_service,
+                    jobs,
+                    reservation=reservation,
+                    priority=priority,
+                    cancel_token=cancel_token,
+                ):
+                    processed += 1
+                    event: Dict[str, Any] = {
+                        "event": "result",
+                        "file_name": intake.filename,
+                        "processed_files": processed,
+                        "total_files": len(intakes),
+                        "record": None,
+                    }
+                    if result is not None:
+                        candidate_results.append(result)
+                        event["record"] = result.record.model_dump(mode="json")
+                    yield _ndjson(event)
+        except IngestionCancelled:
+            return
 
-    async def handle_single_file(file: UploadFile) -> Optional[CandidateProcessingResult]:
-        async with sem:
-            file_bytes = await file.read()
+        yield _ndjson({"event": "summary", **summarize_results(candidate_results, top_n)})
 
-            is_valid, info = validate_file(
-                file_bytes, file.filename, file.content_type
-            )
-            if not is_valid:
-                logger.warning(
-                    "File rejected during validation",
-                    extra={
-                        "event": "cv_validation_rejected",
-                        "file_name": file.filename,
-                        "reason": info,
-                    },
-                )
-                return None
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(reservation.close),
+    )
 
-            try:
-                cv_drive_file_id = save_cv_file_to_drive(
-                    file_bytes=file_bytes,
-                    filename=file.filename,
-                    content_type=file.content_type,
-                )
-            except Exception as e:
-                logger.exception(
-                    "Failed to store CV in Google Drive",
-                    extra={
-                        "event": "cv_drive_store_error",
-                        "file_name": file.filename,
-                    },
-                )
-                return None
 
-            result: CandidateProcessingResult = await asyncio.to_thread(
-                process_file,
-                file_bytes,
-                file.filename,
-                file.content_type,
-                parsing_service,
-                cv_drive_file_id,
-                jobs,
-            )
-            return result
+@router.post("/upload/zip")
+async def upload_zip(
+    request: Request,
+    top_n: int = Query(3, ge=1, le=20),
+    priority: Optional[Priority] = PRIORITY_QUERY,
+    file: UploadFile = File(...),
+):
+    """
+    Processes every PDF/DOCX inside a ZIP archive like /upload, reading entries
+    one by one straight from the archive. Entries that cannot be processed safely
+    are listed under "skipped".
+    """
+    try:
+        archive = await asyncio.to_thread(ZipIntake, file.file, _zip_limits())
+    except ZipArchiveRejected as e:
+        logger.warning(
+            "ZIP archive rejected",
+            extra={"event": "cv_zip_rejected", "file_name": file.filename, "reason": str(e)},
+        )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Nieprawidłowe archiwum ZIP: {e}",
+        )
 
-    tasks = [handle_single_file(f) for f in files]
-    raw_results = await asyncio.gather(*tasks, return_exceptions=True)
+    try:
+        priority = priority or _default_priority(len(archive.entries))
+        reservation = _reserve(len(archive.entries))
+        try:
+            parsing_service = create_parsing_service()
+            jobs = await load_jobs()
+
+            candidate_results: List[CandidateProcessingResult] = []
+            async with _cancel_on_disconnect(request) as cancel_token:
+                async for intake, result in ingest_as_completed(
+                    archive.iter_files(),
+                    parsing_service,
+                    jobs,
+                    reservation=reservation,
+                    priority=priority,
+                    cancel_token=cancel_token,
+                ):
+                    intake.close()
+                    if result is not None:
+                        candidate_results.append(result)
+        except IngestionCancelled:
+            return Response(status_code=CLIENT_CLOSED_REQUEST)
+        finally:
+            reservation.close()
+    finally:
+        archive.close()
+
+    response_body = summarize_results(candidate_results, top_n)
+    response_body["skipped"] = [
+        {"file_name": s.file_name, "reason": s.reason} for s in archive.skipped
+    ]
+    return FastJSONResponse(status_code=status.HTTP_200_OK, content=response_body)
+
+
+def _zip_limits() -> ZipLimits:
+    return ZipLimits(
+        max_entries=ingestion_settings.INGESTION_ZIP_MAX_ENTRIES,
+        max_total_bytes=ingestion_settings.INGESTION_ZIP_MAX_TOTAL_MB * 1024 * 1024,
+        max_ratio=ingestion_settings.INGESTION_ZIP_MAX_RATIO,
+    )
+
+
+@asynccontextmanager
+async def _cancel_on_disconnect(request: Request) -> AsyncIterator[CancellationToken]:
+    """Yields a token that gets cancelled as soon as the client goes away."""
+    token = CancellationToken()
+
+    async def watch() -> None:
+        while not await request.is_disconnected():
+            await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+        logger.info(
+            "Client disconnected, cancelling CV processing",
+            extra={"event": "cv_upload_client_disconnected", "path": request.url.path},
+        )
+        token.cancel()
+
+    watcher = asyncio.create_task(watch())
+    try:
+        yield token
+    finally:
+        watcher.cancel()
+
+
+def _default_priority(file_count: int) -> str:
+    return priority_for_batch(
+        file_count,
+        interactive_max_files=ingestion_settings.INGESTION_INTERACTIVE_MAX_FILES,
+        bulk_min_files=ingestion_settings.INGESTION_BULK_MIN_FILES,
+    )
+
+
+def _reserve(file_count: int) -> Reservation:
+    try:
+        return get_admission_controller().reserve(file_count)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Serwer przetwarza zbyt wiele CV, spróbuj ponownie później",
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
-    candidate_results: List[CandidateProcessingResult] = []
-    for res in raw_results:
-        if isinstance(res, Exception):
-            logger.exception(
-                "Internal error occurred when processing CV",
-                extra={"event": "cv_processing_error"},
-            )
-            continue
-        if res is None:
-            continue
-        candidate_results.append(res)
-
-    total_cv = len(candidate_results)
-
-    jobs_map: Dict[str, Dict[str, Any]] = {}
-    rejected_list: List[Dict[str, Any]] = []
-
-    for res in candidate_results:
-        record = res.record
-        matches = record.job_matches or []
-
-        global_reason = record.global_rejection_reason
-
-        valid_matches = [m for m in matches if getattr(m, "status", None) == "MATCHED"]
-
-        if global_reason or not valid_matches:
-            reason = global_reason
-
-            if not reason:
-                rejection_reasons: List[str] = []
-                for m in matches:
-                    rr = getattr(m, "rejection_reasons", None)
-                    if rr:
-                        rejection_reasons.extend(rr)
-                if rejection_reasons:
-                    seen = set()
-                    unique = []
-                    for r in rejection_reasons:
-                        if r not in seen:
-                            seen.add(r)
-                            unique.append(r)
-                    reason = "; ".join(unique)
-                else:
-                    reason = "Brak dopasowania do ofert"
-
-            rejected_list.append(
-                {
-                    "candidate_id": record.id,
-                    "file_name": res.file_name,
-                    "reason": reason,
-                }
-            )
-            continue
 
-        sorted_matches = sorted(
-            valid_matches, key=lambda jm: jm.score_percent, reverse=True
-        )
-        best = sorted_matches[0]
-
-        job_id = best.job_id
-        job_title = best.job_title
-
-        if job_id not in jobs_map:
-            jobs_map[job_id] = {
-                "job_id": job_id,
-                "job_title": job_title,
-                "candidates": [],
-            }
-
-        def _req_list(reqs):
-            result = []
-            for r in reqs or []:
-                name = getattr(r, "name", None) or getattr(
-                    r, "requirement_name", None
-                )
-                weight = getattr(r, "weight", None)
-                result.append(
-                    {
-                        "name": name,
-                        "weight": weight,
-                    }
-                )
-            return result
+def _ndjson(payload: Dict[str, Any]) -> bytes:
+    return json_codec.dumps(payload) + b"\n"
 
-        matched_reqs = _req_list(best.matched_requirements)
-        unmatched_reqs = _req_list(
-            (best.missing_required or []) + (best.missing_optional or [])
-        )
 
-        other_matches = [
-            {
-                "job_title": m.job_title,
-                "score": m.score_percent,
-            }
-            for m in sorted_matches[1:]
-        ]
-
-        candidate_view = {
-            "candidate_id": record.id,
-            "file_name": res.file_name,
-            "score": best.score_percent,
-            "total_score": best.total_score,
-            "max_score": best.max_score,
-            "matched_requirements": matched_reqs,
-            "unmatched_requirements": unmatched_reqs,
-            "other_matches": other_matches,
-            "rank": None,
-            "is_top": False,
-        }
-
-        jobs_map[job_id]["candidates"].append(candidate_view)
-
-    matched_cv = 0
-    for job in jobs_map.values():
-        cands = job["candidates"]
-        cands.sort(key=lambda c: c["score"], reverse=True)
-
-        for idx, c in enumerate(cands, start=1):
-            c["rank"] = idx
-            c["is_top"] = idx <= top_n
-
-        matched_cv += len(cands)
-
-    rejected_cv = len(rejected_list)
-
-    response_body = {
-        "total_cv": total_cv,
-        "matched_cv": matched_cv,
-        "rejected_cv": rejected_cv,
-        "jobs": list(jobs_map.values()),
-        "rejected": rejected_list,
-    }
-
-    return JSONResponse(status_code=status.HTTP_200_OK, content=response_body)
+async def _enqueue_batch(files: List[UploadFile], top_n: int, priority: str) -> FastJSONResponse:
+    intakes: List[IntakeFile] = []
+    for file in files:
+        is_valid, info = validate_upload(file.size, file.filename, file.content_type)
+        if not is_valid:
+            logger.warning(
+                "File rejected during validation",
+                extra={
+                    "event": "cv_validation_rejected",
+                    "file_name": file.filename,
+                    "reason": info,
+                },
+            )
+            continue
+        # Starlette closes request files once the response is sent, so the batch keeps its own copy.
+        intakes.append(await spool_upload(file))
+
+    batch = get_batch_queue().submit(intakes, top_n=top_n, priority=priority)
+
+    return FastJSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "batch_id": batch.id,
+            "status": batch.status,
+            "priority": batch.priority,
+            "total_files": batch.total_files,
+            "status_url": f"/upload/{batch.id}",
+        },
+    )
+
+
+@router.get("/upload/{batch_id}")
+async def get_upload_batch(batch_id: str):
+    batch = get_batch_queue().get(batch_id)
+    if batch is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Paczka o id={batch_id} nie istnieje",
+        )
+    return FastJSONResponse(status_code=status.HTTP_200_OK, content=batch.to_view())
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from starlette.requests import ClientDisconnect
+
+from backend.src.models.upload_session_model import UploadFileCreate
+from backend.src.routes.ingestion_params import PRIORITY_QUERY, Priority
+from backend.src.services.upload_sessions import (
+    SessionFile,
+    UploadOffsetMismatch,
+    UploadStateError,
+    get_upload_sessions,
+)
+from backend.src.utils.file_validation import validate_upload
+from backend.src.utils.json_codec import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/upload-sessions", tags=["Upload sessions"])
+
+NOT_FOUND = "Sesja lub plik nie istnieje"
+
+
+def _file_response(session_file: SessionFile, status_code: int = status.HTTP_200_OK) -> FastJSONResponse:
+    return FastJSONResponse(
+        status_code=status_code,
+        content=session_file.to_view(),
+        headers={"Upload-Offset": str(session_file.offset)},
+    )
+
+
+def _offset_conflict(e: UploadOffsetMismatch) -> FastJSONResponse:
+    return FastJSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "Nieprawidłowy offset fragmentu", "offset": e.offset},
+        headers={"Upload-Offset": str(e.offset)},
+    )
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def create_session(
+    top_n: int = Query(3, ge=1, le=20),
+    priority: Optional[Priority] = PRIORITY_QUERY,
+):
+    session = get_upload_sessions().create_session(top_n=top_n, priority=priority or "normal")
+    return session.to_view()
+
+
+@router.get("/{session_id}")
+async def get_session(session_id: str):
+    try:
+        return get_upload_sessions().get_session(session_id).to_view()
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+
+
+@router.post("/{session_id}/complete")
+async def complete_session(session_id: str):
+    """Closes the session for new files; queued files are still processed."""
+    try:
+        return get_upload_sessions().complete(session_id).to_view()
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+
+
+@router.post("/{session_id}/files", status_code=status.HTTP_201_CREATED)
+async def add_file(session_id: str, payload: UploadFileCreate):
+    is_valid, info = validate_upload(payload.size, payload.file_name, payload.content_type)
+    if not is_valid:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=info)
+
+    try:
+        session_file = get_upload_sessions().add_file(
+            session_id,
+            filename=payload.file_name,
+            content_type=payload.content_type,
+            size=payload.size,
+            sha256=payload.sha256,
+        )
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+    except UploadStateError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return _file_response(session_file, status.HTTP_201_CREATED)
+
+
+@router.get("/{session_id}/files/{file_id}")
+async def get_file(session_id: str, file_id: str):
+    try:
+        return _file_response(get_upload_sessions().get_file(session_id, file_id))
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+
+
+@router.put("/{session_id}/files/{file_id}")
+async def put_chunk(
+    session_id: str,
+    file_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Pozycja w pliku, od której zaczyna się fragment"),
+):
+    """Raw bytes of the next fragment in the body. On 409 resume from the returned offset."""
+    manager = get_upload_sessions()
+    try:
+        session_file = await manager.write_chunk(session_id, file_id, offset, request.stream())
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+    except UploadOffsetMismatch as e:
+        return _offset_conflict(e)
+    except UploadStateError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ClientDisconnect:
+        logger.info(
+            "Chunk upload interrupted",
+            extra={"event": "cv_upload_chunk_interrupted", "session_id": session_id, "file_id": file_id},
+        )
+        raise
+    return _file_response(session_file)
+
+
+@router.post("/{session_id}/files/{file_id}/finalize", status_code=status.HTTP_202_ACCEPTED)
+async def finalize_file(session_id: str, file_id: str):
+    try:
+        session_file = await get_upload_sessions().finalize(session_id, file_id)
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+    except UploadOffsetMismatch as e:
+        return _offset_conflict(e)
+    except UploadStateError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return _file_response(session_file, status.HTTP_202_ACCEPTED)
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import os
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from backend.src.config.settings.ingestion import IngestionSettings
+
+logger = logging.getLogger(__name__)
+
+
+PRIORITY_WEIGHTS: Dict[str, int] = {
+    "interactive": 8,
+    "normal": 2,
+    "bulk": 1,
+}
+
+
+def priority_for_batch(file_count: int, *, interactive_max_files: int = 3, bulk_min_files: int = 50) -> str:
+    """Default priority when the client does not pick one: small uploads are interactive, big ones bulk."""
+    if file_count <= interactive_max_files:
+        return "interactive"
+    if file_count >= bulk_min_files:
+        return "bulk"
+    return "normal"
+
+
+class Flow:
+    """
+    One stream of CVs competing for slots, e.g. a single upload or batch.
+    Flows are served in proportion to their priority weight.
+    """
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.weight = PRIORITY_WEIGHTS[priority]
+        self.last_finish = 0.0
+
+
+class AdmissionRejected(Exception):
+    """Raised when the ingestion backlog is full; retry_after is a hint in seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Ingestion backlog is full, retry after {retry_after}s.")
+        self.retry_after = retry_after
+
+
+def _cpu_load() -> Optional[float]:
+    """1-minute load average per CPU, or None where the platform does not report it."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+
+class Reservation:
+    """Backlog places held by one request; each finished CV gives one back."""
+
+    def __init__(self, controller: AdmissionController, size: int):
+        self._controller = controller
+        self._remaining = size
+
+    def release(self, count: int = 1) -> None:
+        count = min(count, self._remaining)
+        self._remaining -= count
+        self._controller.release_backlog(count)
+
+    def close(self) -> None:
+        self.release(self._remaining)
+
+
+class AdmissionController:
+    """
+    Process-wide cap on CVs in flight in the ingestion pipeline.
+
+    The limit follows AIMD: it grows by one per window while the pipeline is
+    saturated and CV service time stays near its baseline, and is cut by
+    decrease_factor when service time exceeds latency_tolerance x baseline or
+    the CPU load per core goes above cpu_threshold. Parsing and analysis keep
+    every core busy by design, which puts the load at about 1.0 per core, so
+    the threshold sits above that and only oversubscription backs off.
+
+    Requests reserve backlog places up front; once limit + max_backlog CVs are
+    reserved, new requests get AdmissionRejected instead of queueing.
+
+    Waiting CVs are woken in weighted fair queuing order: every request of a
+    flow is tagged with a virtual finish time advanced by 1/weight, and the
+    smallest tag goes first. A single interactive upload therefore overtakes
+    a long bulk import instead of queueing behind all of it.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 2,
+        max_limit: int = 32,
+        max_backlog: int = 200,
+        latency_tolerance: float = 2.0,
+        cpu_threshold: float = 1.5,
+        decrease_factor: float = 0.75,
+        window_s: float = 1.0,
+    ):
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._max_backlog = max_backlog
+        self._latency_tolerance = latency_tolerance
+        self._cpu_threshold = cpu_threshold
+        self._decrease_factor = decrease_factor
+        self._window_s = window_s
+
+        self._limit = max(min_limit, min(initial_limit, max_limit))
+        self._in_flight = 0
+        self._backlog = 0
+        self._waiters: List[Tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+
+        self._baseline_s: Optional[float] = None
+        self._avg_latency_s: Optional[float] = None
+        self._window_started = time.monotonic()
+        self._window_latencies = 0.0
+        self._window_samples = 0
+        self._window_saturated = False
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def reserve(self, size: int) -> Reservation:
+        """
+        Reserves backlog places for size CVs. A request larger than the whole
+        backlog is still accepted when nothing else is waiting.
+        """
+        if self._backlog > 0 and self._backlog + size > self._limit + self._max_backlog:
+            retry_after = self.retry_after()
+            logger.warning(
+                "Ingestion backlog full, rejecting request",
+                extra={
+                    "event": "cv_admission_rejected",
+                    "backlog": self._backlog,
+                    "requested": size,
+                    "limit": self._limit,
+                    "retry_after": retry_after,
+                },
+            )
+            raise AdmissionRejected(retry_after)
+
+        self._backlog += size
+        return Reservation(self, size)
+
+    def release_backlog(self, count: int) -> None:
+        """Gives back backlog places taken by reserve()."""
+        self._backlog = max(0, self._backlog - count)
+
+    def retry_after(self) -> int:
+        latency = self._avg_latency_s or 1.0
+        waves = max(self._backlog - self._limit, 0) / self._limit
+        return max(1, min(300, math.ceil(waves * latency)))
+
+    def flow(self, priority: str = "normal") -> Flow:
+        return Flow(priority)
+
+    async def acquire(self, flow: Optional[Flow] = None) -> None:
+        flow = flow or Flow("normal")
+        tag = max(self._virtual_time, flow.last_finish) + 1.0 / flow.weight
+        flow.last_finish = tag
+
+        self._drop_cancelled()
+        if self._in_flight < self._limit and not self._waiters:
+            self._in_flight += 1
+            self._virtual_time = max(self._virtual_time, tag - 1.0 / flow.weight)
+            return
+
+        self._window_saturated = True
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (tag, next(self._seq), waiter))
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was already handed over; pass it on.
+                self._in_flight -= 1
+                self._wake()
+            raise
+
+    def release(self, service_s: Optional[float] = None) -> None:
+        self._in_flight -= 1
+        if service_s is not None:
+            self._observe(service_s)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self._limit:
+            tag, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self._in_flight += 1
+                self._virtual_time = tag
+                waiter.set_result(None)
+
+    def _drop_cancelled(self) -> None:
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+
+    def _observe(self, service_s: float) -> None:
+        self._window_latencies += service_s
+        self._window_samples += 1
+        if self._in_flight + 1 >= self._limit:
+            self._window_saturated = True
+
+        now = time.monotonic()
+        if now - self._window_started < self._window_s:
+            return
+
+        avg = self._window_latencies / self._window_samples
+        self._avg_latency_s = avg if self._avg_latency_s is None else 0.8 * self._avg_latency_s + 0.2 * avg
+        # The baseline drifts up slowly so a permanently heavier workload is not treated as overload forever.
+        self._baseline_s = avg if self._baseline_s is None else min(self._baseline_s * 1.01, avg)
+
+        cpu_load = _cpu_load()
+        overloaded = avg > self._baseline_s * self._latency_tolerance or (
+            cpu_load is not None and cpu_load > self._cpu_threshold
+        )
+
+        previous = self._limit
+        if overloaded:
+            self._limit = max(self._min_limit, math.floor(self._limit * self._decrease_factor))
+        elif self._window_saturated:
+            self._limit = min(self._max_limit, self._limit + 1)
+
+        if self._limit != previous:
+            logger.info(
+                "Ingestion concurrency limit changed %d -> %d",
+                previous,
+                self._limit,
+                extra={
+                    "event": "cv_admission_limit",
+                    "latency_s": round(avg, 3),
+                    "baseline_s": round(self._baseline_s, 3),
+                    "cpu_load": cpu_load,
+                },
+            )
+            self._wake()
+
+        self._window_started = now
+        self._window_latencies = 0.0
+        self._window_samples = 0
+        self._window_saturated = False
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller() -> AdmissionController:
+    settings = IngestionSettings()
+    return AdmissionController(
+        initial_limit=settings.INGESTION_INITIAL_IN_FLIGHT,
+        min_limit=settings.INGESTION_MIN_IN_FLIGHT,
+        max_limit=settings.INGESTION_MAX_IN_FLIGHT,
+        max_backlog=settings.INGESTION_MAX_BACKLOG,
+        latency_tolerance=settings.INGESTION_LATENCY_TOLERANCE,
+        cpu_threshold=settings.INGESTION_CPU_LOAD_THRESHOLD,
+    )
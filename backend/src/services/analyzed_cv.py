@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import re
+import threading
+from typing import Any, List, Optional, Tuple, Union
+
+_EMAIL_RE = re.compile(r"\S+@\S+")
+_URL_RE = re.compile(r"https?://\S+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"[^\w\d\s]")
+
+
+class AnalyzedCV:
+    """
+    One CV text with the derived views the matching stages need, each computed
+    at most once: normalized (lowercased) text, text without e-mails and URLs,
+    non-empty lines, cleaned tokens, and - given the spaCy pipeline and the
+    sentence model - filtered lemmas and their embeddings.
+
+    Stages accept either a plain str or an AnalyzedCV; AnalyzedCV.of() wraps
+    the former, so a CV analysed once is shared by extraction, job selection,
+    synonym recognition and scoring.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._normalized: Optional[str] = None
+        self._without_contacts: Optional[str] = None
+        self._lines: Optional[List[str]] = None
+        self._tokens: Optional[List[str]] = None
+        self._lemmas: Optional[List[Tuple[str, str]]] = None
+        self._embeddings: Any = None
+        self._embeddings_done = False
+        self._nlp_lock = threading.Lock()
+
+    @classmethod
+    def of(cls, cv: Union[str, "AnalyzedCV"]) -> "AnalyzedCV":
+        return cv if isinstance(cv, AnalyzedCV) else cls(cv)
+
+    @property
+    def normalized(self) -> str:
+        if self._normalized is None:
+            self._normalized = self.text.lower()
+        return self._normalized
+
+    @property
+    def without_contacts(self) -> str:
+        """Normalized text with e-mails and URLs removed and whitespace collapsed."""
+        if self._without_contacts is None:
+            text = _EMAIL_RE.sub(" ", self.normalized)
+            text = _URL_RE.sub(" ", text)
+            self._without_contacts = _WHITESPACE_RE.sub(" ", text)
+        return self._without_contacts
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = [line.strip() for line in self.text.splitlines() if line.strip()]
+        return self._lines
+
+    @property
+    def tokens(self) -> List[str]:
+        """Whitespace tokens, lowercased and stripped of punctuation."""
+        if self._tokens is None:
+            self._tokens = [_PUNCT_RE.sub("", token.lower()) for token in self.text.split()]
+        return self._tokens
+
+    def lemmas(self, nlp) -> List[Tuple[str, str]]:
+        """(token, lemma) pairs without stop words, punctuation, spaces and digits."""
+        with self._nlp_lock:
+            if self._lemmas is None:
+                doc = nlp(" ".join(self.tokens))
+                self._lemmas = [
+                    (token.text, token.lemma_)
+                    for token in doc
+                    if not token.is_stop
+                    and not token.is_punct
+                    and not token.is_space
+                    and not token.is_digit
+                ]
+            return self._lemmas
+
+    def embeddings(self, nlp, model) -> Any:
+        """Sentence-model embeddings of the lemmas, or None for a CV without any."""
+        lemmas = self.lemmas(nlp)
+        with self._nlp_lock:
+            if not self._embeddings_done:
+                if lemmas:
+                    self._embeddings = model.encode([lemma for _, lemma in lemmas], convert_to_tensor=True)
+                self._embeddings_done = True
+            return self._embeddings
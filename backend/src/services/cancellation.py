@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, List
+
+
+class IngestionCancelled(Exception):
+    """Raised when CV work is abandoned, e.g. because the client disconnected."""
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag shared by the event loop and executor threads.
+    Work that already started is not interrupted; callers check the token
+    between steps and stop before starting the next one.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Runs callback on cancel(), or right away if the token is already cancelled."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise IngestionCancelled("CV processing was cancelled.")
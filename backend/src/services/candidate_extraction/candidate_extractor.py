@@ -1,13 +1,65 @@
 import re
-from typing import Optional, List, Tuple
+import threading
+from functools import lru_cache
+from typing import Optional, List, Tuple, Union
 
 from backend.src.models.candidate_profile import CandidateProfile
+from backend.src.services.analyzed_cv import AnalyzedCV
+from backend.src.services.candidate_extraction.name_gazetteer import (
+    AMBIGUOUS,
+    FIRST_NAME,
+    SURNAME,
+    NameGazetteer,
+    get_name_gazetteer,
+)
 
 try:
     import morfeusz2
 except ImportError:
     morfeusz2 = None
 
+TOKEN_CACHE_SIZE = 50_000
+
+# (orth, tags, labels) of one Morfeusz segment, all interpretations merged.
+Segment = Tuple[str, Tuple[str, ...], Tuple[str, ...]]
+
+_local = threading.local()
+
+
+def _get_morfeusz():
+    """Morfeusz instances are not thread-safe, so every thread gets its own."""
+    if morfeusz2 is None:
+        return None
+    morfeusz = getattr(_local, "morfeusz", None)
+    if morfeusz is None:
+        morfeusz = _local.morfeusz = morfeusz2.Morfeusz()
+    return morfeusz
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def analyse_token(token: str) -> Tuple[Segment, ...]:
+    """
+    Morfeusz analysis of a single whitespace-delimited token. Names repeat a lot
+    across CVs, so results are cached; segments at the same position are merged.
+
+    Analysing tokens one by one is not guaranteed to segment exactly like
+    analysing the whole text at once, since Morfeusz sees no context across
+    whitespace; the name extraction regression test compares both on test_CVs.
+    """
+    analyses = _get_morfeusz().analyse(token)
+
+    by_position = {}
+    for start, end, analysis in analyses:
+        orth, _, tag, labels, *_ = analysis
+        _, tags, all_labels = by_position.setdefault((start, end), (orth, [], []))
+        tags.append(tag)
+        all_labels.extend(labels or [])
+
+    return tuple(
+        (orth, tuple(tags), tuple(labels))
+        for _, (orth, tags, labels) in sorted(by_position.items())
+    )
+
 
 class CandidateExtractor:
     EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
@@ -16,19 +68,12 @@ class CandidateExtractor:
         r"(imię\s+i\s+nazwisko|imię\s+nazwisko)\s*[:\-]\s*(.+)",
         re.IGNORECASE,
     )
+    NAME_PUNCTUATION = ".,;:()[]\"'"
 
-    _morfeusz_instance = None
-
-    @classmethod
-    def _get_morfeusz(cls):
-        if morfeusz2 is None:
-            return None
-        if cls._morfeusz_instance is None:
-            cls._morfeusz_instance = morfeusz2.Morfeusz()
-        return cls._morfeusz_instance
-
-    def extract(self, text: str) -> CandidateProfile:
-        lines = [l.strip() for l in text.splitlines() if l.strip()]
+    def extract(self, cv: Union[str, AnalyzedCV]) -> CandidateProfile:
+        cv = AnalyzedCV.of(cv)
+        text = cv.text
+        lines = cv.lines
 
         name, surname = self._extract_name_surname(text, lines)
 
@@ -51,12 +96,22 @@ class CandidateExtractor:
         if name_from_label:
             return name_from_label
 
-        morf = self._get_morfeusz()
-        if morf is not None and lines:
-            name_from_morph = self._extract_with_morfeusz(morf, lines)
+        ambiguous = None
+        gazetteer = get_name_gazetteer()
+        if gazetteer is not None and lines:
+            name_from_gazetteer, certain = self._extract_with_gazetteer(gazetteer, lines)
+            if certain:
+                return name_from_gazetteer
+            ambiguous = name_from_gazetteer
+
+        if morfeusz2 is not None and lines:
+            name_from_morph = self._extract_with_morfeusz(lines)
             if name_from_morph:
                 return name_from_morph
 
+        if ambiguous:
+            return ambiguous
+
         if lines:
             tokens = lines[0].split()
             if len(tokens) >= 2:
@@ -75,42 +130,38 @@ class CandidateExtractor:
                 return tokens[0], " ".join(tokens[1:])
         return None
 
-    def _extract_with_morfeusz(
-        self, morfeusz, lines: List[str]
-    ) -> Optional[Tuple[str, str]]:
-        candidate_text = "\n".join(lines[:10])
-        analyses = morfeusz.analyse(candidate_text)
-
-        tokens_raw: List[Tuple[str, List[str], List[str], int, int]] = []
-
-        for start, end, analysis in analyses:
-            orth, lemma, tag, labels, *rest = analysis
-            tokens_raw.append((orth, [tag], labels or [], start, end))
-
-        merged: List[Tuple[str, List[str], List[str]]] = []
-        last_pos = None
-        temp_orth = ""
-        temp_tags: List[str] = []
-        temp_labels: List[str] = []
-
-        for orth, tags, labels, start, end in sorted(
-            tokens_raw, key=lambda t: (t[3], t[4])
-        ):
-            pos = (start, end)
-            if pos != last_pos:
-                if last_pos is not None:
-                    merged.append((temp_orth, temp_tags, temp_labels))
-                temp_orth = orth
-                temp_tags = list(tags)
-                temp_labels = list(labels)
-                last_pos = pos
-            else:
-                temp_tags.extend(tags)
-                temp_labels.extend(labels)
-
-        if last_pos is not None:
-            merged.append((temp_orth, temp_tags, temp_labels))
+    def _extract_with_gazetteer(
+        self, gazetteer: NameGazetteer, lines: List[str]
+    ) -> Tuple[Optional[Tuple[str, str]], bool]:
+        """
+        First capitalised first name followed by a surname. The bool is False when
+        either form is also a common word, which is left to Morfeusz to decide.
+        """
+        tokens = [t.strip(self.NAME_PUNCTUATION) for line in lines[:10] for t in line.split()]
+        candidate = None
+        for first, second in zip(tokens, tokens[1:]):
+            if not first[:1].isupper() or not second[:1].isupper():
+                continue
+            first_flags = gazetteer.lookup(first)
+            if not first_flags & FIRST_NAME:
+                continue
+            second_flags = gazetteer.lookup(second)
+            if not second_flags & SURNAME:
+                continue
+            if not (first_flags | second_flags) & AMBIGUOUS:
+                return (first, second), True
+            candidate = candidate or (first, second)
+        return candidate, False
+
+    def _extract_with_morfeusz(self, lines: List[str]) -> Optional[Tuple[str, str]]:
+        merged: List[Segment] = []
+        for line in lines[:10]:
+            for token in line.split():
+                merged.extend(analyse_token(token))
+        return self._name_from_segments(merged)
 
+    @staticmethod
+    def _name_from_segments(merged: List[Segment]) -> Optional[Tuple[str, str]]:
         def has_label(labels: List[str], value: str) -> bool:
             return any(l.lower() == value for l in labels)
 
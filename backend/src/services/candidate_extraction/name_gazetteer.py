@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from backend.src.config.settings.parsing import ParsingSettings
+
+logger = logging.getLogger(__name__)
+
+FIRST_NAME = 0x01
+SURNAME = 0x02
+# The form is also an ordinary word (e.g. "Róża", "Kowal"), so only Morfeusz
+# can tell from context whether it is a name.
+AMBIGUOUS = 0x04
+
+MAGIC = b"CVNAMES1"
+_HEADER = struct.Struct("<8sI")
+_OFFSET = struct.Struct("<I")
+
+DEFAULT_PATH = Path(__file__).resolve().parent / "data" / "names.gaz"
+
+
+def normalize(form: str) -> str:
+    return form.strip().lower()
+
+
+class NameGazetteer:
+    """
+    Read-only set of Polish first-name and surname forms, each with FIRST_NAME /
+    SURNAME / AMBIGUOUS flags. The file is memory-mapped and searched with a
+    binary search, so loading is instant and pages are shared between workers.
+
+    Layout: MAGIC, entry count, one uint32 offset per entry, then the entries
+    sorted by their UTF-8 bytes, each stored as <form>\\0<flags byte>.
+    """
+
+    def __init__(self, path: os.PathLike | str):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a name gazetteer file.")
+        self._offsets_at = _HEADER.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def lookup(self, form: str) -> int:
+        """Flags of the form (case-insensitive), 0 when it is not a known name."""
+        key = normalize(form).encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry, flags = self._entry(mid)
+            if entry < key:
+                lo = mid + 1
+            elif entry > key:
+                hi = mid
+            else:
+                return flags
+        return 0
+
+    def _entry(self, index: int) -> Tuple[bytes, int]:
+        (start,) = _OFFSET.unpack_from(self._mm, self._offsets_at + index * _OFFSET.size)
+        end = self._mm.find(b"\0", start)
+        return self._mm[start:end], self._mm[end + 1]
+
+    @staticmethod
+    def write(path: os.PathLike | str, entries: Iterable[Tuple[str, int]]) -> int:
+        """Writes (form, flags) pairs; flags of repeated forms are OR-ed. Returns the entry count."""
+        merged = {}
+        for form, flags in entries:
+            key = normalize(form).encode("utf-8")
+            if key and b"\0" not in key:
+                merged[key] = merged.get(key, 0) | flags
+
+        keys = sorted(merged)
+        data_at = _HEADER.size + len(keys) * _OFFSET.size
+        offsets = bytearray()
+        data = bytearray()
+        for key in keys:
+            offsets += _OFFSET.pack(data_at + len(data))
+            data += key + b"\0" + bytes([merged[key]])
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(keys)))
+            f.write(offsets)
+            f.write(data)
+        os.replace(tmp_path, path)
+        return len(keys)
+
+
+@lru_cache(maxsize=1)
+def get_name_gazetteer() -> Optional[NameGazetteer]:
+    """The configured gazetteer, or None when it has not been built."""
+    path = ParsingSettings().NAME_GAZETTEER_PATH or DEFAULT_PATH
+    if not os.path.exists(path):
+        logger.info("Name gazetteer %s not found, names are extracted with Morfeusz only.", path)
+        return None
+    try:
+        gazetteer = NameGazetteer(path)
+    except (OSError, ValueError, struct.error):
+        logger.exception("Could not load the name gazetteer from %s", path)
+        return None
+    logger.info("Loaded name gazetteer with %d forms from %s", len(gazetteer), path)
+    return gazetteer
@@ -1,18 +1,30 @@
 from __future__ import annotations
 
 import io
-import json
 import logging
+import re
 import uuid
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from googleapiclient.discovery import Resource
-from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
-from pydantic import BaseModel, ValidationError
+from googleapiclient.http import MediaIoBaseUpload
+from pydantic import BaseModel
 
 from backend.src.models.candidate_matching import JobMatch
 from backend.src.models.candidate_profile import CandidateProfile
-from backend.src.services.google_drive_connect import get_service, list_files
+from backend.src.services.drive_folders import resolve_folder
+from backend.src.services.google_drive_connect import download_bytes, get_service, list_folder_files
+from backend.src.services.storage_format import (
+    MIME_TYPES,
+    app_properties,
+    decode,
+    encode,
+    is_trusted,
+    load_models,
+    storage_encoding,
+)
+from backend.src.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
@@ -24,143 +36,117 @@ class CandidateRecord(BaseModel):
 
     job_matches: List[JobMatch] = []
     global_rejection_reason: Optional[str] = None
+    # None for records stored before candidates were sharded by month.
+    created_at: Optional[datetime] = None
 
     class Config:
         extra = "forbid"
 
 
-class GoogleDriveCandidateStore:
-    FOLDER_NAME = "CV"
-    FILE_NAME = "candidates.json"
-
-    def __init__(self) -> None:
-        self.service: Resource = get_service()
-        self.folder_id: str = self._ensure_cv_folder()
-
-    def _ensure_cv_folder(self) -> str:
-        files = list_files(self.service, page_size=100)
-
-        for f in files:
-            if (
-                f.get("name") == self.FOLDER_NAME
-                and f.get("mimeType") == "application/vnd.google-apps.folder"
-            ):
-                return f["id"]
-
-        logger.info("Directory 'CV' does not exist. Creating a new folder on Google Drive.")
-        metadata = {
-            "name": self.FOLDER_NAME,
-            "mimeType": "application/vnd.google-apps.folder",
-        }
-        created = self.service.files().create(body=metadata, fields="id").execute()
-        return created["id"]
-
-    def _find_json_file(self) -> Optional[str]:
-        query = (
-            f"'{self.folder_id}' in parents and "
-            f"trashed = false and "
-            f"name = '{self.FILE_NAME}'"
-        )
+LEGACY_SHARD = "legacy"
 
-        result = (
-            self.service.files()
-            .list(
-                q=query,
-                fields="files(id, name, mimeType, modifiedTime)",
-            )
-            .execute()
-        )
-        files = result.get("files", [])
-
-        if not files:
-            return None
 
-        if len(files) == 1:
-            return files[0]["id"]
-
-        files_sorted = sorted(
-            files,
-            key=lambda f: f.get("modifiedTime", ""),
-            reverse=True,
-        )
-        newest = files_sorted[0]
-        to_delete = files_sorted[1:]
+def shard_key(created_at: Optional[datetime]) -> str:
+    return created_at.strftime("%Y-%m") if created_at else LEGACY_SHARD
 
-        for old in to_delete:
-            try:
-                self.service.files().delete(fileId=old["id"]).execute()
-                logger.warning(
-                    "Deleting duplicate candidates.json (id=%s)", old.get("id")
-                )
-            except Exception as e:
-                logger.error(
-                    "Could not delete duplicate candidates.json (id=%s): %s",
-                    old.get("id"),
-                    e,
-                )
 
-        return newest["id"]
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
 
-    def load_all(self) -> List[CandidateRecord]:
-        file_id = self._find_json_file()
-        if not file_id:
-            return []
 
-        request = self.service.files().get_media(fileId=file_id)
-        buffer = io.BytesIO()
-        downloader = MediaIoBaseDownload(buffer, request)
+def _month_bounds(key: str) -> tuple[datetime, datetime]:
+    start = datetime.strptime(key, "%Y-%m").replace(tzinfo=timezone.utc)
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return start, end
 
-        done = False
-        while not done:
-            status, done = downloader.next_chunk()
 
-        buffer.seek(0)
+class GoogleDriveCandidateStore:
+    """
+    Candidates are stored in monthly shards, candidates-YYYY-MM.json, by
+    created_at. Records from before sharding stay in candidates.json, the
+    legacy shard. candidates_manifest.json lists the record count and job ids
+    of every shard and whether it has globally rejected candidates, so
+    queries by job or date read only the shards that can match. Appends touch
+    only the current month's shard.
+    """
 
-        try:
-            raw_list = json.load(io.TextIOWrapper(buffer, encoding="utf-8"))
-        except json.JSONDecodeError as e:
-            logger.error("Wrong JSON in candidates.json, returning empty list: %s", e)
-            return []
+    FOLDER_NAME = "CV"
+    FILE_NAME = "candidates.json"
+    SHARD_NAME_RE = re.compile(r"^candidates-(\d{4}-\d{2})\.json$")
+    MANIFEST_NAME = "candidates_manifest.json"
+    # Bump whenever CandidateRecord changes in a way old files do not satisfy.
+    SCHEMA_VERSION = "1"
 
-        records: List[CandidateRecord] = []
-        for item in raw_list:
-            try:
-                records.append(CandidateRecord(**item))
-            except ValidationError as e:
-                logger.error(
-                    "Wrong record in candidates.json, skipping: %s", e
-                )
+    def __init__(self) -> None:
+        self.service: Resource = get_service()
+        self.folder_id: str = resolve_folder(self.service, self.FOLDER_NAME)
+
+    def _shard_file_name(self, key: str) -> str:
+        return self.FILE_NAME if key == LEGACY_SHARD else f"candidates-{key}.json"
+
+    def _is_store_file(self, name: str) -> bool:
+        return name in (self.FILE_NAME, self.MANIFEST_NAME) or bool(self.SHARD_NAME_RE.match(name))
+
+    def _list_files(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Store files by name. Of duplicates left by interrupted writes, the
+        newest wins. Other files the query finds, such as CVs with
+        "candidates" in the name, are left alone.
+        """
+        files = [
+            f
+            for f in list_folder_files(self.service, self.folder_id, name_contains="candidates")
+            if self._is_store_file(f["name"])
+        ]
+
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for f in sorted(files, key=lambda f: f.get("modifiedTime", ""), reverse=True):
+            if f["name"] not in by_name:
+                by_name[f["name"]] = f
                 continue
-
-        return records
-
-    def save_all(self, records: List[CandidateRecord]) -> None:
-        json_bytes = json.dumps(
-            [r.model_dump() for r in records],
-            ensure_ascii=False,
-            indent=2,
-        ).encode("utf-8")
-
-        existing_file_id = self._find_json_file()
-        if existing_file_id:
             try:
-                self.service.files().delete(fileId=existing_file_id).execute()
+                self.service.files().delete(fileId=f["id"]).execute()
+                logger.warning("Deleting duplicate %s (id=%s)", f["name"], f.get("id"))
+            except Exception as e:
+                logger.error("Could not delete duplicate %s (id=%s): %s", f["name"], f.get("id"), e)
+        return by_name
+
+    def _shard_files(self, files: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Shard key -> file, the legacy shard first, then months in order."""
+        shards: Dict[str, Dict[str, Any]] = {}
+        if self.FILE_NAME in files:
+            shards[LEGACY_SHARD] = files[self.FILE_NAME]
+        for name in sorted(files):
+            m = self.SHARD_NAME_RE.match(name)
+            if m:
+                shards[m.group(1)] = files[name]
+        return shards
+
+    def _upload(
+        self,
+        name: str,
+        payload: bytes,
+        mimetype: str,
+        existing: Optional[Dict[str, Any]],
+        properties: Optional[Dict[str, str]] = None,
+    ) -> None:
+        if existing:
+            try:
+                self.service.files().delete(fileId=existing["id"]).execute()
             except Exception as e:
-                logger.error(
-                    "Could not delete old candidate from candidates.json (id=%s): %s",
-                    existing_file_id,
-                    e,
-                )
+                logger.error("Could not delete old %s (id=%s): %s", name, existing["id"], e)
 
         media = MediaIoBaseUpload(
-            io.BytesIO(json_bytes),
-            mimetype="application/json",
+            io.BytesIO(payload),
+            mimetype=mimetype,
             resumable=False,
         )
-        metadata = {
-            "name": self.FILE_NAME,
+        metadata: Dict[str, Any] = {
+            "name": name,
             "parents": [self.folder_id],
         }
+        if properties:
+            metadata["appProperties"] = properties
 
         self.service.files().create(
             body=metadata,
@@ -168,7 +154,155 @@ class GoogleDriveCandidateStore:
             fields="id",
         ).execute()
 
-        logger.info("Saved %d caniddates to candidates.json", len(records))
+    def _load_shard(self, shard_file: Dict[str, Any]) -> List[CandidateRecord]:
+        payload = download_bytes(self.service, shard_file["id"])
+
+        try:
+            raw_list = json_codec.loads(decode(payload))
+        except ValueError as e:
+            logger.error("Wrong JSON in %s, returning empty list: %s", shard_file["name"], e)
+            return []
+
+        trusted = is_trusted(payload, shard_file.get("appProperties"), self.SCHEMA_VERSION)
+        return load_models(CandidateRecord, raw_list, trusted=trusted, source=shard_file["name"])
+
+    def _save_shard(self, key: str, records: List[CandidateRecord], existing: Optional[Dict[str, Any]]) -> None:
+        name = self._shard_file_name(key)
+        encoding = storage_encoding()
+        json_bytes = encode(json_codec.dumps([r.model_dump() for r in records]), encoding)
+        self._upload(
+            name,
+            json_bytes,
+            MIME_TYPES[encoding],
+            existing,
+            app_properties(json_bytes, self.SCHEMA_VERSION),
+        )
+        logger.info("Saved %d candidates to %s", len(records), name)
+
+    def _load_manifest(self, files: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        manifest_file = files.get(self.MANIFEST_NAME)
+        if not manifest_file:
+            return {}
+        try:
+            shards = json_codec.loads(download_bytes(self.service, manifest_file["id"])).get("shards", {})
+        except (ValueError, AttributeError) as e:
+            logger.error("Wrong %s, reading every shard: %s", self.MANIFEST_NAME, e)
+            return {}
+        return shards if isinstance(shards, dict) else {}
+
+    def _save_manifest(self, shards: Dict[str, Dict[str, Any]], files: Dict[str, Dict[str, Any]]) -> None:
+        payload = json_codec.dumps({"shards": shards})
+        self._upload(self.MANIFEST_NAME, payload, "application/json", files.get(self.MANIFEST_NAME))
+
+    @staticmethod
+    def _shard_summary(records: Iterable[CandidateRecord]) -> Dict[str, Any]:
+        count = 0
+        job_ids = set()
+        has_global_rejections = False
+        for r in records:
+            count += 1
+            job_ids.update(m.job_id for m in r.job_matches)
+            has_global_rejections = has_global_rejections or r.global_rejection_reason is not None
+        return {"count": count, "job_ids": sorted(job_ids), "has_global_rejections": has_global_rejections}
+
+    @staticmethod
+    def _shard_may_match(
+        key: str,
+        summary: Optional[Dict[str, Any]],
+        job_id: Optional[str],
+        created_from: Optional[datetime],
+        created_to: Optional[datetime],
+    ) -> bool:
+        # Legacy records have no created_at, so date ranges do not exclude them.
+        if (created_from or created_to) and key != LEGACY_SHARD:
+            start, end = _month_bounds(key)
+            if (created_from and end <= created_from) or (created_to and start > created_to):
+                return False
+
+        if job_id and summary is not None:
+            # Globally rejected candidates are listed under every job.
+            return job_id in summary.get("job_ids", []) or summary.get("has_global_rejections", True)
+        return True
+
+    def load_all(self) -> List[CandidateRecord]:
+        return self.query()
+
+    def query(
+        self,
+        *,
+        job_id: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[CandidateRecord]:
+        """
+        Records of the shards that can hold candidates for job_id created within
+        [created_from, created_to], filtered by the dates. Undated legacy
+        records are always returned. Filtering by job is left to the caller:
+        shards are only skipped when nothing in them matches.
+        """
+        records, _ = self._query(job_id, created_from, created_to, with_total=False)
+        return records
+
+    def query_with_total(
+        self,
+        *,
+        job_id: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Tuple[List[CandidateRecord], int]:
+        """query() and the number of all stored candidates; skipped shards are counted from the manifest."""
+        return self._query(job_id, created_from, created_to, with_total=True)
+
+    def _query(
+        self,
+        job_id: Optional[str],
+        created_from: Optional[datetime],
+        created_to: Optional[datetime],
+        *,
+        with_total: bool,
+    ) -> Tuple[List[CandidateRecord], int]:
+        created_from = _as_utc(created_from) if created_from else None
+        created_to = _as_utc(created_to) if created_to else None
+
+        files = self._list_files()
+        shards = self._shard_files(files)
+        manifest = self._load_manifest(files) if job_id or with_total else {}
+
+        records: List[CandidateRecord] = []
+        total = 0
+        for key, shard_file in shards.items():
+            summary = manifest.get(key)
+            if not self._shard_may_match(key, summary, job_id, created_from, created_to):
+                if with_total:
+                    # Summaries written before the manifest had counts cost a read.
+                    count = (summary or {}).get("count")
+                    total += count if isinstance(count, int) else len(self._load_shard(shard_file))
+                continue
+
+            shard_records = self._load_shard(shard_file)
+            total += len(shard_records)
+            for record in shard_records:
+                if record.created_at and (created_from or created_to):
+                    created_at = _as_utc(record.created_at)
+                    if (created_from and created_at < created_from) or (created_to and created_at > created_to):
+                        continue
+                records.append(record)
+        return records, total
+
+    def save_all(self, records: List[CandidateRecord]) -> None:
+        """Replaces all stored candidates, each record going to the shard of its created_at."""
+        files = self._list_files()
+        shards = self._shard_files(files)
+
+        grouped: Dict[str, List[CandidateRecord]] = {}
+        for record in records:
+            grouped.setdefault(shard_key(record.created_at), []).append(record)
+
+        self._save_manifest({key: self._shard_summary(rs) for key, rs in grouped.items()}, files)
+        for key in set(shards) - set(grouped):
+            self.service.files().delete(fileId=shards[key]["id"]).execute()
+        for key, shard_records in grouped.items():
+            self._save_shard(key, shard_records, shards.get(key))
 
     def append_candidate(
         self,
@@ -177,30 +311,73 @@ class GoogleDriveCandidateStore:
         cv_drive_file_id: Optional[str] = None,
         global_rejection_reason: Optional[str] = None,
     ) -> CandidateRecord:
-        records = self.load_all()
-
         new_record = CandidateRecord(
             id=str(uuid.uuid4()),
             profile=profile,
             cv_drive_file_id=cv_drive_file_id,
             job_matches=job_matches or [],
             global_rejection_reason=global_rejection_reason,
+            created_at=datetime.now(timezone.utc),
         )
-
-        records.append(new_record)
-        self.save_all(records)
-
+        self.append_candidates([new_record])
         return new_record
 
+    def append_candidates(self, new_records: List[CandidateRecord]) -> None:
+        """
+        Appends many records with one read and one write per affected shard,
+        normally just the current month's. Records without created_at get now.
+        """
+        if not new_records:
+            return
+
+        now = datetime.now(timezone.utc)
+        grouped: Dict[str, List[CandidateRecord]] = {}
+        for record in new_records:
+            if record.created_at is None:
+                record.created_at = now
+            grouped.setdefault(shard_key(record.created_at), []).append(record)
+
+        files = self._list_files()
+        shards = self._shard_files(files)
+        manifest = self._load_manifest(files)
+        manifest_changed = False
+
+        updated: Dict[str, List[CandidateRecord]] = {}
+        for key, shard_records in grouped.items():
+            records = self._load_shard(shards[key]) if key in shards else []
+            records.extend(shard_records)
+            updated[key] = records
+
+            summary = self._shard_summary(records)
+            if manifest.get(key) != summary:
+                manifest[key] = summary
+                manifest_changed = True
+
+        # The manifest goes first: if a shard write then fails, it only lists
+        # job ids the shard does not have yet, which costs a read, not a result.
+        if manifest_changed:
+            self._save_manifest(manifest, files)
+        for key, records in updated.items():
+            self._save_shard(key, records, shards.get(key))
+
     def delete_candidate(self, candidate_id: str) -> bool:
-        records = self.load_all()
-        before = len(records)
-        records = [r for r in records if r.id != candidate_id]
-        after = len(records)
+        files = self._list_files()
+        shards = self._shard_files(files)
+
+        # Recent shards first: those are the candidates most likely to be deleted.
+        for key in reversed(list(shards)):
+            records = self._load_shard(shards[key])
+            remaining = [r for r in records if r.id != candidate_id]
+            if len(remaining) == len(records):
+                continue
 
-        if after == before:
-            return False
+            self._save_shard(key, remaining, shards[key])
+            manifest = self._load_manifest(files)
+            summary = self._shard_summary(remaining)
+            if manifest.get(key) != summary:
+                manifest[key] = summary
+                self._save_manifest(manifest, files)
+            logger.info("Candidate %s was deleted from %s", candidate_id, self._shard_file_name(key))
+            return True
 
-        self.save_all(records)
-        logger.info("Candidate %s was deleted from candidates.json", candidate_id)
-        return True
+        return False
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from backend.src.config.settings.parsing import ParsingSettings
+from backend.src.models.job_offers_model import JobOffer
+from backend.src.services.admission import Reservation
+from backend.src.services.cancellation import CancellationToken
+from backend.src.services.cv_processing import CandidateProcessingResult
+from backend.src.services.document_parsing import DocumentParsingService, get_parsing_sandbox
+from backend.src.services.ingestion_pipeline import IngestionSource, get_ingestion_pipeline
+from backend.src.services.job_offers.job_offers_store import JobOfferStore, create_job_offer_store
+from backend.src.services.upload_intake import IntakeFile
+
+logger = logging.getLogger(__name__)
+
+parsing_settings = ParsingSettings()
+
+
+def create_parsing_service() -> DocumentParsingService:
+    return DocumentParsingService(
+        sandbox=get_parsing_sandbox(),
+        max_pages=parsing_settings.PARSER_MAX_PAGES,
+    )
+
+
+@lru_cache(maxsize=1)
+def _job_offer_store() -> JobOfferStore:
+    # Shared by all uploads, so the per-offer store downloads only offers changed since the last load.
+    return create_job_offer_store()
+
+
+async def load_jobs() -> List[JobOffer]:
+    job_store = _job_offer_store()
+    jobs: List[JobOffer] = await job_store.load_all()
+
+    if not jobs:
+        logger.warning("No job offers available for matching.")
+    return jobs
+
+
+def ingest_as_completed(
+    source: IngestionSource,
+    parsing_service: DocumentParsingService,
+    jobs: List[JobOffer],
+    *,
+    reservation: Optional[Reservation] = None,
+    priority: str = "normal",
+    cancel_token: Optional[CancellationToken] = None,
+) -> AsyncIterator[Tuple[IntakeFile, Optional[CandidateProcessingResult]]]:
+    """
+    Runs files through the shared ingestion pipeline and yields (file, result) pairs
+    in completion order. Rejected or failed files yield None; remaining work is
+    cancelled if the consumer stops early or cancel_token is cancelled.
+    """
+    return get_ingestion_pipeline().run(
+        source,
+        parsing_service,
+        jobs,
+        reservation=reservation,
+        priority=priority,
+        cancel_token=cancel_token,
+    )
+
+
+def summarize_results(
+    candidate_results: List[CandidateProcessingResult],
+    top_n: int,
+) -> Dict[str, Any]:
+    """Builds the per-job ranking and rejection list returned by /upload."""
+    total_cv = len(candidate_results)
+
+    jobs_map: Dict[str, Dict[str, Any]] = {}
+    rejected_list: List[Dict[str, Any]] = []
+
+    for res in candidate_results:
+        record = res.record
+        matches = record.job_matches or []
+
+        global_reason = record.global_rejection_reason
+
+        valid_matches = [m for m in matches if getattr(m, "status", None) == "MATCHED"]
+
+        if global_reason or not valid_matches:
+            reason = global_reason
+
+            if not reason:
+                rejection_reasons: List[str] = []
+                for m in matches:
+                    rr = getattr(m, "rejection_reasons", None)
+                    if rr:
+                        rejection_reasons.extend(rr)
+                if rejection_reasons:
+                    seen = set()
+                    unique = []
+                    for r in rejection_reasons:
+                        if r not in seen:
+                            seen.add(r)
+                            unique.append(r)
+                    reason = "; ".join(unique)
+                else:
+                    reason = "Brak dopasowania do ofert"
+
+            rejected_list.append(
+                {
+                    "candidate_id": record.id,
+                    "file_name": res.file_name,
+                    "reason": reason,
+                }
+            )
+            continue
+
+        sorted_matches = sorted(
+            valid_matches, key=lambda jm: jm.score_percent, reverse=True
+        )
+        best = sorted_matches[0]
+
+        job_id = best.job_id
+        job_title = best.job_title
+
+        if job_id not in jobs_map:
+            jobs_map[job_id] = {
+                "job_id": job_id,
+                "job_title": job_title,
+                "candidates": [],
+            }
+
+        def _req_list(reqs):
+            result = []
+            for r in reqs or []:
+                name = getattr(r, "name", None) or getattr(
+                    r, "requirement_name", None
+                )
+                weight = getattr(r, "weight", None)
+                result.append(
+                    {
+                        "name": name,
+                        "weight": weight,
+                    }
+                )
+            return result
+
+        matched_reqs = _req_list(best.matched_requirements)
+        unmatched_reqs = _req_list(
+            (best.missing_required or []) + (best.missing_optional or [])
+        )
+
+        other_matches = [
+            {
+                "job_title": m.job_title,
+                "score": m.score_percent,
+            }
+            for m in sorted_matches[1:]
+        ]
+
+        candidate_view = {
+            "candidate_id": record.id,
+            "file_name": res.file_name,
+            "score": best.score_percent,
+            "total_score": best.total_score,
+            "max_score": best.max_score,
+            "matched_requirements": matched_reqs,
+            "unmatched_requirements": unmatched_reqs,
+            "other_matches": other_matches,
+            "rank": None,
+            "is_top": False,
+        }
+
+        jobs_map[job_id]["candidates"].append(candidate_view)
+
+    matched_cv = 0
+    for job in jobs_map.values():
+        cands = job["candidates"]
+        cands.sort(key=lambda c: c["score"], reverse=True)
+
+        for idx, c in enumerate(cands, start=1):
+            c["rank"] = idx
+            c["is_top"] = idx <= top_n
+
+        matched_cv += len(cands)
+
+    rejected_cv = len(rejected_list)
+
+    return {
+        "total_cv": total_cv,
+        "matched_cv": matched_cv,
+        "rejected_cv": rejected_cv,
+        "jobs": list(jobs_map.values()),
+        "rejected": rejected_list,
+    }
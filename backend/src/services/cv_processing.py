@@ -7,11 +7,14 @@ from typing import List, Optional
 from backend.src.models.candidate_profile import CandidateProfile
 from backend.src.models.candidate_matching import JobMatch, CandidateRecord
 from backend.src.models.job_offers_model import JobOffer
+from backend.src.services.analyzed_cv import AnalyzedCV
 from backend.src.services.candidate_extraction.candidate_extractor import CandidateExtractor
+from backend.src.services.cancellation import CancellationToken
 from backend.src.services.candidate_storage import GoogleDriveCandidateStore
 from backend.src.services.job_selection import JobSelectionService
 from backend.src.services.job_scoring import JobMatchScorer
 from backend.src.services.synonym_recognition import SynonymRecognizer
+from backend.src.services.upload_intake import ContentBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -22,21 +25,35 @@ class CandidateProcessingResult:
     file_name: str
 
 
-def process_file(
-    file_bytes: bytes,
+@dataclass
+class CandidateAnalysis:
+    profile: CandidateProfile
+    job_matches: List[JobMatch]
+    global_rejection_reason: Optional[str]
+
+
+def parse_cv(
+    file_bytes: ContentBuffer,
     filename: str,
     content_type: Optional[str],
     parsing_service,
-    cv_drive_file_id: Optional[str],
-    jobs: List[JobOffer],
-) -> CandidateProcessingResult:
+) -> str:
     parsed_document = parsing_service.extract_text(
         file_bytes, filename=filename, content_type=content_type
     )
-    cv_text: str = parsed_document.text
+    return parsed_document.text
+
+
+def analyze_cv(
+    cv_text: str,
+    jobs: List[JobOffer],
+    filename: str,
+    cancel_token: Optional[CancellationToken] = None,
+) -> CandidateAnalysis:
+    cv = AnalyzedCV(cv_text)
 
     extractor = CandidateExtractor()
-    profile: CandidateProfile = extractor.extract(cv_text)
+    profile: CandidateProfile = extractor.extract(cv)
 
     missing_fields = []
     if not profile.name:
@@ -61,24 +78,42 @@ def process_file(
             "Odrzucam CV %s – brakujące pola: %s", filename, pretty
         )
     else:
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
         selection_service = JobSelectionService()
-        selection_result = selection_service.select_jobs(cv_text, jobs)
+        selection_result = selection_service.select_jobs(cv, jobs)
 
         global_reason = selection_result.global_rejection_reason
 
         if not global_reason:
-            synonym_recognizer = SynonymRecognizer(cv_text)
+            synonym_recognizer = SynonymRecognizer(cv)
             scorer = JobMatchScorer(synonym_recognizer)
 
-            job_matches = [
-                scorer.score_for_job(cv_text, job)
-                for job in selection_result.jobs_to_consider
-            ]
+            for job in selection_result.jobs_to_consider:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                job_matches.append(scorer.score_for_job(cv, job))
+
+    return CandidateAnalysis(
+        profile=profile,
+        job_matches=job_matches,
+        global_rejection_reason=global_reason,
+    )
+
+
+def persist_candidate(
+    analysis: CandidateAnalysis,
+    cv_drive_file_id: Optional[str],
+    filename: str,
+) -> CandidateProcessingResult:
+    profile = analysis.profile
+    global_reason = analysis.global_rejection_reason
 
     store = GoogleDriveCandidateStore()
     record = store.append_candidate(
         profile=profile,
-        job_matches=job_matches,
+        job_matches=analysis.job_matches,
         cv_drive_file_id=cv_drive_file_id,
         global_rejection_reason=global_reason,
     )
@@ -96,3 +131,4 @@ def process_file(
         record=record,
         file_name=filename,
     )
+
@@ -1,74 +1,47 @@
-import os
-import tempfile
 import logging
-from typing import Optional
+from typing import BinaryIO, Optional
 
-from googleapiclient.discovery import Resource
+from googleapiclient.http import MediaIoBaseUpload
 
-from backend.src.services.google_drive_connect import (
-    get_service,
-    list_files,
-    upload_file,
-)
+from backend.src.services.drive_folders import resolve_folder
+from backend.src.services.google_drive_connect import get_service
 
 logger = logging.getLogger(__name__)
 
+CV_FOLDER_NAME = "CV"
 
-def _ensure_cv_folder(service: Resource) -> str:
-    files = list_files(service, page_size=100)
 
-    for f in files:
-        if (
-            f.get("name") == "CV"
-            and f.get("mimeType") == "application/vnd.google-apps.folder"
-        ):
-            return f["id"]
+def save_cv_stream_to_drive(
+    stream: BinaryIO,
+    filename: str,
+    content_type: Optional[str] = None,
+) -> str:
+    """Uploads the CV straight from a seekable stream, without a temporary file copy."""
+    service = get_service()
+    folder_id = resolve_folder(service, CV_FOLDER_NAME)
 
-    logger.info("Directory 'CV' not found on Google Drive. Creating a new one.")
+    media = MediaIoBaseUpload(
+        stream,
+        mimetype=content_type or "application/octet-stream",
+        resumable=True,
+    )
     metadata = {
-        "name": "CV",
-        "mimeType": "application/vnd.google-apps.folder",
+        "name": filename,
+        "parents": [folder_id],
     }
-    created = service.files().create(body=metadata, fields="id").execute()
-    return created["id"]
+    created = service.files().create(
+        body=metadata,
+        media_body=media,
+        fields="id, name, mimeType",
+    ).execute()
 
+    file_id = created["id"]
+    logger.info("Saved CV '%s' to Google Drive (id=%s)", filename, file_id)
+    return file_id
 
-def save_cv_file_to_drive(
-    file_bytes: bytes,
-    filename: str,
-    content_type: Optional[str] = None,
-) -> str:
-    service = get_service()
-    folder_id = _ensure_cv_folder(service)
 
-    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-        tmp.write(file_bytes)
-        tmp_path = tmp.name
 
-    try:
-        created = upload_file(
-            service=service,
-            file_path=tmp_path,
-            mime_type=content_type or "application/octet-stream",
-            parent_folder_id=folder_id,
-            file_name=filename,
-        )
-        file_id = created["id"]
-        logger.info("Saved CV '%s' to Google Drive (id=%s)", filename, file_id)
-        return file_id
-    finally:
-        if os.path.exists(tmp_path):
-            try:
-                os.remove(tmp_path)
-            except PermissionError as e:
-                logger.warning(
-                    "Nie udało się usunąć pliku tymczasowego %s: %s",
-                    tmp_path,
-                    e,
-                )
-            except OSError as e:
-                logger.warning(
-                    "Błąd podczas usuwania pliku tymczasowego %s: %s",
-                    tmp_path,
-                    e,
-                )
\ No newline at end of file
+def delete_cv_from_drive(file_id: str) -> None:
+    service = get_service()
+    service.files().delete(fileId=file_id).execute()
+    logger.info("Deleted CV from Google Drive (id=%s)", file_id)
@@ -1,5 +1,7 @@
 from .document_parsing_service import DocumentParsingService, ParsedDocument
 from .exceptions import DocumentParsingError, UnsupportedFormatError, ExtractionError
+from .parsers.document_parser import open_stream
+from .sandbox import ParsingSandbox, get_parsing_sandbox
 
 __all__ = [
     "DocumentParsingService",
@@ -7,4 +9,7 @@ __all__ = [
     "DocumentParsingError",
     "UnsupportedFormatError",
     "ExtractionError",
+    "ParsingSandbox",
+    "get_parsing_sandbox",
+    "open_stream",
 ]
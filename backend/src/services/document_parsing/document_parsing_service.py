@@ -1,12 +1,14 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 
 import logging
 
-from .exceptions import DocumentParsingError, UnsupportedFormatError
+from .exceptions import DocumentParsingError, ExtractionError, UnsupportedFormatError
 from .mime_sniffing import sniff_mime, guess_ext_from_filename
 from .parser_registry import ParserRegistry
+from .parsers.document_parser import DocumentParser
+from .sandbox import ParsingSandbox
 from .text_cleanup import normalize_text
 
 logger = logging.getLogger(__name__)
@@ -20,17 +22,27 @@ class ParsedDocument:
 
 
 class DocumentParsingService:
-    def __init__(self, registry: Optional[ParserRegistry] = None, *, max_bytes: int = 50 * 1024 * 1024):
+    def __init__(
+        self,
+        registry: Optional[ParserRegistry] = None,
+        *,
+        max_bytes: int = 50 * 1024 * 1024,
+        min_text_chars: int = 32,
+        sandbox: Optional[ParsingSandbox] = None,
+        max_pages: Optional[int] = None,
+    ):
         self._registry = registry or ParserRegistry()
         self._max_bytes = max_bytes
+        self._min_text_chars = min_text_chars
+        self._sandbox = sandbox
+        self._max_pages = max_pages
 
-    def extract_text(
+    def _resolve(
         self,
         content: bytes,
-        *,
-        filename: Optional[str] = None,
-        content_type: Optional[str] = None
-    ) -> ParsedDocument:
+        filename: Optional[str],
+        content_type: Optional[str],
+    ) -> Tuple[Optional[str], List[DocumentParser]]:
         if content is None:
             raise DocumentParsingError("No content provided.")
         if len(content) > self._max_bytes:
@@ -40,12 +52,97 @@ class DocumentParsingService:
         ext = guess_ext_from_filename(filename)
 
         try:
-            parser = self._registry.find(mime=mime, ext=ext)
+            return mime, self._registry.find_all(mime=mime, ext=ext)
         except UnsupportedFormatError:
             logger.info("Unsupported format; mime=%s ext=%s", mime, ext)
             raise
 
-        logger.debug("Extracting text using %s", parser.name)
-        text = parser.extract_text(content)
-        normalized_text = normalize_text(text)
-        return ParsedDocument(text=normalized_text, mime=mime, used_parser=parser.name)
+    def _run_parser(self, parser: DocumentParser, content: bytes, max_pages: Optional[int]) -> str:
+        if not max_pages:
+            if self._sandbox is None:
+                return parser.extract_text(content)
+            return self._sandbox.run(parser, content)
+
+        return parser.page_separator.join(self._parser_pages(parser, content, max_pages))
+
+    def _parser_pages(self, parser: DocumentParser, content: bytes, max_pages: Optional[int]) -> Iterator[str]:
+        if self._sandbox is None:
+            return parser.iter_pages(content, max_pages=max_pages)
+        return self._sandbox.iter_pages(parser, content, max_pages)
+
+    def iter_pages(
+        self,
+        content: bytes,
+        *,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Yields normalized pages from the first parser that extracts one; stopping early skips the rest
+        of the document. Parsers are only retried before the first page (max_pages as in extract_text)."""
+        _, parsers = self._resolve(content, filename, content_type)
+        if max_pages is None:
+            max_pages = self._max_pages
+
+        last_error: Optional[ExtractionError] = None
+        for parser in parsers:
+            pages = self._parser_pages(parser, content, max_pages or None)
+            try:
+                try:
+                    first = next(pages, None)
+                except ExtractionError as e:
+                    logger.warning("Parser %s failed, trying next one: %s", parser.name, e)
+                    last_error = e
+                    continue
+                if first is None:
+                    continue
+                yield normalize_text(first)
+                for page in pages:
+                    yield normalize_text(page)
+                return
+            finally:
+                pages.close()
+
+        if last_error is not None:
+            raise last_error
+
+    def extract_text(
+        self,
+        content: bytes,
+        *,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+        max_pages: Optional[int] = None,
+    ) -> ParsedDocument:
+        """Extracts the whole document, or only its first max_pages pages
+        (defaults to the service-wide page budget; 0 means no limit)."""
+        mime, parsers = self._resolve(content, filename, content_type)
+        if max_pages is None:
+            max_pages = self._max_pages
+
+        best: Optional[ParsedDocument] = None
+        last_error: Optional[ExtractionError] = None
+
+        for parser in parsers:
+            logger.debug("Extracting text using %s", parser.name)
+            try:
+                text = self._run_parser(parser, content, max_pages)
+            except ExtractionError as e:
+                logger.warning("Parser %s failed, trying next one: %s", parser.name, e)
+                last_error = e
+                continue
+
+            parsed = ParsedDocument(text=normalize_text(text), mime=mime, used_parser=parser.name)
+            if len(parsed.text) >= self._min_text_chars:
+                return parsed
+
+            logger.info(
+                "Parser %s returned only %d characters, trying next one",
+                parser.name, len(parsed.text),
+            )
+            if best is None or len(parsed.text) > len(best.text):
+                best = parsed
+
+        if best is not None:
+            return best
+        raise last_error
@@ -5,6 +5,9 @@ import os
 
 logger = logging.getLogger(__name__)
 
+# Type detection only needs the head of a file; avoids copying whole mmaps.
+_SNIFF_BYTES = 1024 * 1024
+
 @lru_cache(maxsize=1)
 def _get_magic_mime():
     try:
@@ -27,6 +30,9 @@ def sniff_mime(content: bytes) -> Optional[str]:
     if m is None:
         return None
 
+    if not isinstance(content, bytes):
+        content = bytes(content[:_SNIFF_BYTES])
+
     try:
         return m.from_buffer(content, mime=True)  # type: ignore[attr-defined]
     except Exception as e:
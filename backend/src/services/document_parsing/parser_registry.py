@@ -1,11 +1,13 @@
 from __future__ import annotations
 import logging
-from typing import Iterable, List, Optional, Type
+from typing import Iterable, List, Optional
 
 from .exceptions import UnsupportedFormatError
 from .parsers.document_parser import DocumentParser
 from .parsers.pdf_parser import PdfParser
+from .parsers.pdfium_parser import PdfiumParser
 from .parsers.docx_parser import DocxParser
+from .parsers.ooxml_docx_parser import OoxmlDocxParser
 
 logger = logging.getLogger(__name__)
 
@@ -13,15 +15,26 @@ logger = logging.getLogger(__name__)
 class ParserRegistry:
     def __init__(self, parsers: Optional[Iterable[DocumentParser]] = None):
         self._parsers: List[DocumentParser] = list(parsers or [
+            PdfiumParser(),
             PdfParser(),
+            OoxmlDocxParser(),
             DocxParser(),
         ])
 
-    def find(self, *, mime: Optional[str], ext: Optional[str]) -> DocumentParser:
-        candidates = [p for p in self._parsers if p.supports(mime=mime, ext=ext)]
-        if not candidates:
+    def find_all(self, *, mime: Optional[str], ext: Optional[str]) -> List[DocumentParser]:
+        """Returns all supporting parsers, best first (registration order breaks ties)."""
+        ranked = []
+        for idx, parser in enumerate(self._parsers):
+            match = parser.match(mime=mime, ext=ext)
+            if match is not None:
+                ranked.append((-match.priority, idx, parser))
+        if not ranked:
             raise UnsupportedFormatError(f"No parser for mime={mime!r}, ext={ext!r}")
-        chosen = candidates[0]
+        ranked.sort(key=lambda r: (r[0], r[1]))
+        return [parser for _, _, parser in ranked]
+
+    def find(self, *, mime: Optional[str], ext: Optional[str]) -> DocumentParser:
+        chosen = self.find_all(mime=mime, ext=ext)[0]
         logger.debug("Chosen parser %s for mime=%s ext=%s",
                      chosen.name, mime, ext)
         return chosen
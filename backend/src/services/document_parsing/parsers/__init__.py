@@ -1,5 +1,7 @@
-from .document_parser import DocumentParser
+from .document_parser import DocumentParser, ParserMatch
 from .pdf_parser import PdfParser
+from .pdfium_parser import PdfiumParser
 from .docx_parser import DocxParser
+from .ooxml_docx_parser import OoxmlDocxParser
 
-__all__ = ["DocumentParser", "PdfParser", "DocxParser"]
+__all__ = ["DocumentParser", "ParserMatch", "PdfParser", "PdfiumParser", "DocxParser", "OoxmlDocxParser"]
@@ -1,7 +1,56 @@
 from __future__ import annotations
+import io
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import BinaryIO, Iterator, Optional
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only stream over any buffer (e.g. mmap) without copying it."""
+
+    def __init__(self, content) -> None:
+        self._view = memoryview(content).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = max(0, min(len(buffer), len(self._view) - self._pos))
+        buffer[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def open_stream(content) -> BinaryIO:
+    """
+    Binary stream over document content. Content may be bytes or any other
+    buffer (bytearray, memoryview, mmap) - the latter are never copied.
+    """
+    if isinstance(content, bytes):
+        return io.BytesIO(content)
+    return io.BufferedReader(_BufferReader(content))
 
 
 @dataclass(frozen=True)
@@ -13,8 +62,12 @@ class ParserMatch:
 class DocumentParser(ABC):
     """
     Strategy interface - implementations should be stateless singletons.
+    Parsers with higher priority are tried first; the rest act as fallbacks.
     """
     name: str = "base"
+    priority: int = 0
+    # Joins the texts from iter_pages(); extract_text() uses the same separator.
+    page_separator: str = "\n"
 
     @abstractmethod
     def supports(self, *, mime: Optional[str], ext: Optional[str]) -> bool:
@@ -23,3 +76,14 @@ class DocumentParser(ABC):
     @abstractmethod
     def extract_text(self, content: bytes) -> str:
         """Returns contents of file as plain text"""
+
+    def iter_pages(self, content: bytes, *, max_pages: Optional[int] = None) -> Iterator[str]:
+        """Lazily yields text page by page, at most max_pages pages.
+        Formats without a page model yield the whole document as a single page."""
+        yield self.extract_text(content)
+
+    def match(self, *, mime: Optional[str], ext: Optional[str]) -> Optional[ParserMatch]:
+        """Returns ranking information when parser supports the file, None otherwise"""
+        if not self.supports(mime=mime, ext=ext):
+            return None
+        return ParserMatch(name=self.name, priority=self.priority)
@@ -1,10 +1,9 @@
 from __future__ import annotations
 import logging
 from typing import Optional
-from io import BytesIO
 from docx import Document
 
-from .document_parser import DocumentParser
+from .document_parser import DocumentParser, open_stream
 from ..exceptions import ExtractionError
 
 logger = logging.getLogger(__name__)
@@ -12,6 +11,7 @@ logger = logging.getLogger(__name__)
 
 class DocxParser(DocumentParser):
     name = "python-docx"
+    priority = 10
 
     def supports(self, *, mime: Optional[str], ext: Optional[str]) -> bool:
         docx_mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
@@ -21,7 +21,8 @@ class DocxParser(DocumentParser):
 
     def extract_text(self, content: bytes) -> str:
         try:
-            doc = Document(BytesIO(content))
+            with open_stream(content) as stream:
+                doc = Document(stream)
             parts = []
             for p in doc.paragraphs:
                 if p.text:
@@ -0,0 +1,163 @@
+from __future__ import annotations
+import logging
+import zipfile
+from typing import Dict, Iterator, List, Optional
+
+from lxml import etree
+
+from .document_parser import DocumentParser, open_stream
+from ..exceptions import ExtractionError
+
+logger = logging.getLogger(__name__)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY = _W + "body"
+_P = _W + "p"
+_R = _W + "r"
+_HYPERLINK = _W + "hyperlink"
+_TBL = _W + "tbl"
+_TR = _W + "tr"
+_TC = _W + "tc"
+_TYPE = _W + "type"
+_VAL = _W + "val"
+
+_RUN_CHARS = {
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+
+DOCUMENT_PART = "word/document.xml"
+
+
+def _run_text(run) -> str:
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == _W + "t":
+            parts.append(child.text or "")
+        elif tag == _W + "br":
+            if child.get(_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in _RUN_CHARS:
+            parts.append(_RUN_CHARS[tag])
+    return "".join(parts)
+
+
+def _paragraph_text(p) -> str:
+    parts = []
+    for child in p:
+        if child.tag == _R:
+            parts.append(_run_text(child))
+        elif child.tag == _HYPERLINK:
+            parts.extend(_run_text(r) for r in child if r.tag == _R)
+    return "".join(parts)
+
+
+def _cell_text(tc) -> str:
+    return "\n".join(_paragraph_text(p) for p in tc if p.tag == _P)
+
+
+def _release(el) -> None:
+    """Frees an already processed element and its preceding siblings."""
+    el.clear(keep_tail=True)
+    parent = el.getparent()
+    while el.getprevious() is not None:
+        del parent[0]
+
+
+def _int_prop(parent, path: str, default: int) -> int:
+    el = parent.find(path)
+    if el is None:
+        return default
+    try:
+        return int(el.get(_VAL))
+    except (TypeError, ValueError):
+        return default
+
+
+class _TableState:
+    """Grid texts of the previous row, needed to resolve vertically merged cells."""
+
+    def __init__(self) -> None:
+        self.prev_row: Dict[int, List[str]] = {}
+
+    def row_cells(self, tr) -> List[str]:
+        grid: Dict[int, List[str]] = {}
+        cells: List[str] = []
+        offset = _int_prop(tr, f"{_W}trPr/{_W}gridBefore", 0)
+
+        for tc in tr:
+            if tc.tag != _TC:
+                continue
+            vmerge = tc.find(f"{_W}tcPr/{_W}vMerge")
+            if vmerge is not None and vmerge.get(_VAL, "continue") == "continue":
+                spanned = self.prev_row.get(offset, [""])
+            else:
+                spanned = [_cell_text(tc)] * _int_prop(tc, f"{_W}tcPr/{_W}gridSpan", 1)
+
+            grid[offset] = spanned
+            cells.extend(spanned)
+            offset += len(spanned)
+
+        self.prev_row = grid
+        return cells
+
+
+class OoxmlDocxParser(DocumentParser):
+    """
+    Streams word/document.xml straight from the package without building the
+    python-docx object model; media and other parts are never read.
+    Body paragraphs and table rows are emitted in document order.
+    """
+    name = "ooxml-stream"
+    priority = 100
+
+    def supports(self, *, mime: Optional[str], ext: Optional[str]) -> bool:
+        docx_mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        if mime is not None:
+            return mime == docx_mime
+        return ext is not None and ext.lower() == ".docx"
+
+    def extract_text(self, content: bytes) -> str:
+        try:
+            return "\n".join(self._iter_blocks(content))
+        except ExtractionError:
+            raise
+        except Exception as e:
+            raise ExtractionError(f"Failed to extract text from DOCX: {e}") from e
+
+    def _iter_blocks(self, content: bytes) -> Iterator[str]:
+        with open_stream(content) as stream, zipfile.ZipFile(stream) as package:
+            try:
+                part = package.open(DOCUMENT_PART)
+            except KeyError as e:
+                raise ExtractionError(f"DOCX package has no {DOCUMENT_PART}.") from e
+
+            with part:
+                tables: Dict[object, _TableState] = {}
+                for _, el in etree.iterparse(part, events=("end",), resolve_entities=False, huge_tree=True):
+                    parent = el.getparent()
+                    if parent is None:
+                        continue
+
+                    if el.tag == _P and parent.tag == _BODY:
+                        text = _paragraph_text(el)
+                        if text:
+                            yield text
+                        _release(el)
+
+                    elif el.tag == _TR and parent.tag == _TBL and parent.getparent().tag == _BODY:
+                        state = tables.setdefault(parent, _TableState())
+                        cells = [c.strip() for c in state.row_cells(el)]
+                        if any(cells):
+                            yield " | ".join(cells)
+                        _release(el)
+
+                    elif el.tag == _TBL and parent.tag == _BODY:
+                        tables.pop(el, None)
+                        _release(el)
+
+                    elif parent.tag == _BODY:
+                        _release(el)
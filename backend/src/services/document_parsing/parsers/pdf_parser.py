@@ -1,10 +1,13 @@
 from __future__ import annotations
 import io
 import logging
-from typing import Optional
-from pdfminer.high_level import extract_text as pdfminer_extract
+from typing import Iterator, Optional
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
 
-from .document_parser import DocumentParser
+from .document_parser import DocumentParser, open_stream
 from ..exceptions import ExtractionError
 
 logger = logging.getLogger(__name__)
@@ -12,6 +15,9 @@ logger = logging.getLogger(__name__)
 
 class PdfParser(DocumentParser):
     name = "pdfminer"
+    priority = 10
+    # pdfminer already ends every page with a form feed.
+    page_separator = ""
 
     def supports(self, *, mime: Optional[str], ext: Optional[str]) -> bool:
         pdf_mime = "application/pdf"
@@ -20,10 +26,30 @@ class PdfParser(DocumentParser):
         return ext is not None and ext.lower() == ".pdf"
 
     def extract_text(self, content: bytes) -> str:
+        return self.page_separator.join(self.iter_pages(content))
+
+    def iter_pages(self, content: bytes, *, max_pages: Optional[int] = None) -> Iterator[str]:
+        fp = open_stream(content)
         try:
-            text = pdfminer_extract(io.BytesIO(content))
-            if text is None:
-                text = ""
-            return text
+            output = io.StringIO()
+            rsrcmgr = PDFResourceManager(caching=True)
+            device = TextConverter(rsrcmgr, output, codec="utf-8", laparams=LAParams())
+            interpreter = PDFPageInterpreter(rsrcmgr, device)
+            pages = PDFPage.get_pages(fp, maxpages=max_pages or 0, caching=True)
         except Exception as e:
+            fp.close()
             raise ExtractionError(f"Failed to extract text from PDF: {e}") from e
+
+        with fp:
+            while True:
+                try:
+                    page = next(pages, None)
+                    if page is None:
+                        return
+                    interpreter.process_page(page)
+                    text = output.getvalue()
+                    output.seek(0)
+                    output.truncate()
+                except Exception as e:
+                    raise ExtractionError(f"Failed to extract text from PDF: {e}") from e
+                yield text
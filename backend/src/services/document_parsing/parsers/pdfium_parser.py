@@ -0,0 +1,67 @@
+from __future__ import annotations
+import logging
+import threading
+from typing import Iterator, Optional
+
+from .document_parser import DocumentParser, open_stream
+from ..exceptions import ExtractionError
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+logger = logging.getLogger(__name__)
+
+# PDFium is not thread-safe; all calls into the library have to be serialized.
+_PDFIUM_LOCK = threading.Lock()
+
+
+class PdfiumParser(DocumentParser):
+    name = "pypdfium2"
+    priority = 100
+
+    def supports(self, *, mime: Optional[str], ext: Optional[str]) -> bool:
+        if pdfium is None:
+            return False
+        pdf_mime = "application/pdf"
+        if mime is not None:
+            return mime == pdf_mime
+        return ext is not None and ext.lower() == ".pdf"
+
+    def extract_text(self, content: bytes) -> str:
+        return self.page_separator.join(self.iter_pages(content))
+
+    def iter_pages(self, content: bytes, *, max_pages: Optional[int] = None) -> Iterator[str]:
+        if pdfium is None:
+            raise ExtractionError("pypdfium2 is not installed.")
+        source = content if isinstance(content, bytes) else open_stream(content)
+        try:
+            with _PDFIUM_LOCK:
+                pdf = pdfium.PdfDocument(source)
+                page_count = len(pdf)
+        except Exception as e:
+            if source is not content:
+                source.close()
+            raise ExtractionError(f"Failed to extract text from PDF: {e}") from e
+
+        if max_pages:
+            page_count = min(page_count, max_pages)
+
+        try:
+            for index in range(page_count):
+                try:
+                    with _PDFIUM_LOCK:
+                        page = pdf[index]
+                        textpage = page.get_textpage()
+                        text = textpage.get_text_range()
+                        textpage.close()
+                        page.close()
+                except Exception as e:
+                    raise ExtractionError(f"Failed to extract text from PDF: {e}") from e
+                yield text
+        finally:
+            with _PDFIUM_LOCK:
+                pdf.close()
+            if source is not content:
+                source.close()
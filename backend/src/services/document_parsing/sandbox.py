@@ -0,0 +1,310 @@
+from __future__ import annotations
+import logging
+import mmap
+import multiprocessing
+import os
+import threading
+import time
+from functools import lru_cache
+from multiprocessing.reduction import recv_handle, send_handle
+from typing import Iterator, List, Optional
+
+from backend.src.config.settings.parsing import ParsingSettings
+
+from .exceptions import ExtractionError
+from .parsers.document_parser import DocumentParser
+
+logger = logging.getLogger(__name__)
+
+_READY = "ready"
+_NEXT = "next"
+_STOP = "stop"
+
+
+def _worker_main(conn) -> None:
+    conn.send((_READY, None))
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        parser, content, stream, max_pages = task
+        mapped = None
+        try:
+            if content is None:
+                content = mapped = _map_received_file(conn)
+            if stream:
+                _send_pages(conn, parser.iter_pages(content, max_pages=max_pages))
+            else:
+                conn.send(("ok", parser.extract_text(content)))
+        except ExtractionError as e:
+            conn.send(("error", str(e)))
+        except BaseException as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+        finally:
+            if mapped is not None:
+                content = None
+                _close_map(mapped)
+
+
+def _send_pages(conn, pages: Iterator[str]) -> None:
+    """Sends one page at a time and parses the next only when the parent asks for it."""
+    try:
+        for page in pages:
+            conn.send(("page", page))
+            if conn.recv() != _NEXT:
+                break
+    finally:
+        pages.close()
+    conn.send(("done", None))
+
+
+def _map_received_file(conn) -> mmap.mmap:
+    """Maps the file whose descriptor the parent sent after the task."""
+    fd = recv_handle(conn)
+    try:
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
+
+def _close_map(mapped: mmap.mmap) -> None:
+    try:
+        mapped.close()
+    except BufferError:
+        pass  # a parser still holds a view; the map goes with it
+
+
+class _Worker:
+    def __init__(self, ctx) -> None:
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks_done = 0
+
+    def wait_ready(self, timeout: float) -> None:
+        if not self.conn.poll(timeout):
+            self.kill()
+            raise ExtractionError("Parsing worker did not start in time.")
+        self.conn.recv()
+
+    def rss_bytes(self) -> Optional[int]:
+        try:
+            with open(f"/proc/{self.process.pid}/statm", "rb") as f:
+                resident_pages = int(f.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            return None
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+    def kill(self) -> None:
+        try:
+            self.process.kill()
+            self.process.join(timeout=5)
+        finally:
+            self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+            self.process.join(timeout=5)
+        except (OSError, EOFError):
+            pass
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class ParsingSandbox:
+    """
+    Runs parsers in separate, killable worker processes.
+
+    Each document gets a wall-clock timeout and a resident memory limit.
+    A worker that breaches either limit (or crashes) is killed and replaced,
+    and the caller gets ExtractionError.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 4,
+        timeout_s: float = 60.0,
+        max_rss_bytes: Optional[int] = 1024 * 1024 * 1024,
+        max_tasks_per_worker: int = 200,
+        startup_timeout_s: float = 60.0,
+        poll_interval_s: float = 0.05,
+    ):
+        self._ctx = multiprocessing.get_context("spawn")
+        self._timeout_s = timeout_s
+        self._max_rss_bytes = max_rss_bytes
+        self._max_tasks_per_worker = max_tasks_per_worker
+        self._startup_timeout_s = startup_timeout_s
+        self._poll_interval_s = poll_interval_s
+
+        self._slots = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self._idle: List[_Worker] = []
+        self._closed = False
+
+    def _acquire(self) -> _Worker:
+        self._slots.acquire()
+        try:
+            with self._lock:
+                if self._closed:
+                    raise ExtractionError("Parsing sandbox is closed.")
+                if self._idle:
+                    return self._idle.pop()
+            worker = _Worker(self._ctx)
+            worker.wait_ready(self._startup_timeout_s)
+            return worker
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, worker: Optional[_Worker]) -> None:
+        try:
+            if worker is None:
+                return
+            if worker.tasks_done >= self._max_tasks_per_worker:
+                worker.stop()
+                return
+            with self._lock:
+                if not self._closed:
+                    self._idle.append(worker)
+                    return
+            worker.stop()
+        finally:
+            self._slots.release()
+
+    def run(self, parser: DocumentParser, content: bytes) -> str:
+        worker: Optional[_Worker] = self._acquire()
+        try:
+            self._send(worker, parser, content, stream=False, max_pages=None)
+            _, text = self._receive(worker, parser)
+            worker.tasks_done += 1
+            return text
+        except ExtractionError:
+            if not worker.process.is_alive():
+                worker = None
+            raise
+        except BaseException:
+            worker.kill()
+            worker = None
+            raise
+        finally:
+            self._release(worker)
+
+    def iter_pages(self, parser: DocumentParser, content: bytes, max_pages: Optional[int] = None) -> Iterator[str]:
+        """
+        Yields pages as the worker extracts them. The worker parses the next page
+        only once the previous one was consumed, so closing the iterator early
+        skips the rest of the document. The time limit applies to each page.
+        """
+        worker: Optional[_Worker] = self._acquire()
+        try:
+            self._send(worker, parser, content, stream=True, max_pages=max_pages)
+            while True:
+                status, page = self._receive(worker, parser)
+                if status != "page":
+                    break
+                try:
+                    yield page
+                except GeneratorExit:
+                    worker = self._stop(worker, parser)
+                    raise
+                worker.conn.send(_NEXT)
+            worker.tasks_done += 1
+        except ExtractionError:
+            if worker is not None and not worker.process.is_alive():
+                worker = None
+            raise
+        except GeneratorExit:
+            raise
+        except BaseException:
+            worker.kill()
+            worker = None
+            raise
+        finally:
+            self._release(worker)
+
+    def _stop(self, worker: _Worker, parser: DocumentParser) -> Optional[_Worker]:
+        """Ends a stream the consumer closed early; returns None if the worker had to be dropped."""
+        try:
+            worker.conn.send(_STOP)
+            self._receive(worker, parser)
+        except (ExtractionError, OSError):
+            worker.kill()
+            return None
+        worker.tasks_done += 1
+        return worker
+
+    def _send(
+        self,
+        worker: _Worker,
+        parser: DocumentParser,
+        content: bytes,
+        *,
+        stream: bool,
+        max_pages: Optional[int],
+    ) -> None:
+        fileno = getattr(content, "fileno", None)
+        if callable(fileno):
+            # A file-backed buffer: the worker maps the file itself instead of receiving a pickled copy.
+            worker.conn.send((parser, None, stream, max_pages))
+            send_handle(worker.conn, fileno(), worker.process.pid)
+        else:
+            worker.conn.send((parser, bytes(content), stream, max_pages))
+
+    def _receive(self, worker: _Worker, parser: DocumentParser):
+        deadline = time.monotonic() + self._timeout_s
+
+        while not worker.conn.poll(self._poll_interval_s):
+            if not worker.process.is_alive():
+                worker.kill()
+                raise ExtractionError(f"Parser {parser.name} crashed (exit code {worker.process.exitcode}).")
+
+            if time.monotonic() > deadline:
+                worker.kill()
+                logger.warning("Parser %s exceeded %.1fs time limit", parser.name, self._timeout_s)
+                raise ExtractionError(f"Parser {parser.name} timed out after {self._timeout_s:.1f}s.")
+
+            rss = worker.rss_bytes()
+            if self._max_rss_bytes is not None and rss is not None and rss > self._max_rss_bytes:
+                worker.kill()
+                logger.warning("Parser %s exceeded memory limit (rss=%d bytes)", parser.name, rss)
+                raise ExtractionError(f"Parser {parser.name} exceeded memory limit of {self._max_rss_bytes} bytes.")
+
+        try:
+            status, payload = worker.conn.recv()
+        except EOFError as e:
+            worker.kill()
+            raise ExtractionError(f"Parser {parser.name} crashed.") from e
+
+        if status == "error":
+            worker.tasks_done += 1
+            raise ExtractionError(payload)
+        return status, payload
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+
+@lru_cache(maxsize=1)
+def get_parsing_sandbox() -> Optional[ParsingSandbox]:
+    settings = ParsingSettings()
+    if not settings.PARSER_SANDBOX_ENABLED:
+        return None
+
+    return ParsingSandbox(
+        workers=settings.PARSER_WORKERS,
+        timeout_s=settings.PARSER_TIMEOUT_SECONDS,
+        max_rss_bytes=settings.PARSER_MAX_RSS_MB * 1024 * 1024,
+    )
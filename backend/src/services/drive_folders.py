@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from googleapiclient.discovery import Resource
+
+from backend.src.services.google_drive_connect import list_files
+from backend.src.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+FOLDER_MIME = "application/vnd.google-apps.folder"
+FOLDER_ID_TTL_S = 5 * 60
+
+_flight = SingleFlight()
+_lock = threading.Lock()
+_resolved: Dict[str, Tuple[str, float]] = {}
+
+
+def find_folder(service: Resource, name: str) -> Optional[str]:
+    for f in list_files(service, page_size=100):
+        if f.get("name") == name and f.get("mimeType") == FOLDER_MIME:
+            return f["id"]
+    return None
+
+
+def resolve_folder(service: Resource, name: str) -> str:
+    """
+    Returns the id of the top-level Drive folder with this name, creating it
+    if missing. Concurrent lookups of one folder share a single Drive scan and
+    the id is reused for FOLDER_ID_TTL_S seconds.
+    """
+    with _lock:
+        cached = _resolved.get(name)
+    if cached is not None and time.monotonic() - cached[1] < FOLDER_ID_TTL_S:
+        return cached[0]
+
+    folder_id = _flight.do(name, lambda: _find_or_create(service, name))
+    with _lock:
+        _resolved[name] = (folder_id, time.monotonic())
+    return folder_id
+
+
+def _find_or_create(service: Resource, name: str) -> str:
+    folder_id = find_folder(service, name)
+    if folder_id:
+        return folder_id
+
+    logger.info("Directory '%s' does not exist. Creating a new folder on Google Drive.", name)
+    created = service.files().create(
+        body={"name": name, "mimeType": FOLDER_MIME},
+        fields="id",
+    ).execute()
+    return created["id"]
@@ -75,12 +75,36 @@ def list_files(service, page_size: int = 10) -> List[Dict]:
     return results.get("files", [])
 
 
+def list_folder_files(service, folder_id: str, *, name_contains: Optional[str] = None,
+                      order_by: Optional[str] = None) -> List[Dict]:
+    """Every file in the folder, following pagination."""
+    query = f"'{folder_id}' in parents and trashed = false"
+    if name_contains:
+        query += f" and name contains '{name_contains}'"
+
+    files: List[Dict] = []
+    page_token = None
+    while True:
+        result = service.files().list(
+            q=query,
+            orderBy=order_by,
+            fields="nextPageToken, files(id, name, mimeType, modifiedTime, appProperties)",
+            pageToken=page_token,
+        ).execute()
+        files.extend(result.get("files", []))
+        page_token = result.get("nextPageToken")
+        if not page_token:
+            return files
+
+
 def upload_file(service, file_path: str, mime_type: Optional[str] = None, parent_folder_id: Optional[str] = None,
-                file_name: Optional[str] = None) -> Dict:
+                file_name: Optional[str] = None, app_properties: Optional[Dict[str, str]] = None) -> Dict:
     name = file_name if file_name else os.path.basename(file_path)
     metadata = {"name": name}
     if parent_folder_id:
         metadata["parents"] = [parent_folder_id]
+    if app_properties:
+        metadata["appProperties"] = app_properties
     media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True)
     created = service.files().create(body=metadata, media_body=media, fields="id, name, mimeType").execute()
     return created
@@ -96,6 +120,16 @@ def download_file(service, file_id: str, dest_path: str) -> None:
     fh.close()
 
 
+def download_bytes(service, file_id: str) -> bytes:
+    request = service.files().get_media(fileId=file_id)
+    buffer = io.BytesIO()
+    downloader = MediaIoBaseDownload(buffer, request)
+    done = False
+    while not done:
+        status, done = downloader.next_chunk()
+    return buffer.getvalue()
+
+
 def delete_file(service, file_id: str) -> bool:
     try:
         service.files().delete(fileId=file_id).execute()
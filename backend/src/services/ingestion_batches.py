@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from backend.src.config.settings.ingestion import IngestionSettings
+from backend.src.services.admission import PRIORITY_WEIGHTS
+from backend.src.services.cv_ingestion import (
+    create_parsing_service,
+    ingest_as_completed,
+    load_jobs,
+    summarize_results,
+)
+from backend.src.services.cv_processing import CandidateProcessingResult
+from backend.src.services.upload_intake import IntakeFile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestionBatch:
+    id: str
+    top_n: int
+    files: List[IntakeFile]
+    total_files: int
+    priority: str = "bulk"
+    status: str = "queued"
+    processed_files: int = 0
+    failed_files: int = 0
+    results: List[CandidateProcessingResult] = field(default_factory=list)
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def to_view(self) -> Dict[str, Any]:
+        """Progress plus the same jobs/rejected view /upload returns, built from results so far."""
+        view: Dict[str, Any] = {
+            "batch_id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "total_files": self.total_files,
+            "processed_files": self.processed_files,
+            "failed_files": self.failed_files,
+            "error": self.error,
+        }
+        view.update(summarize_results(self.results, self.top_n))
+        return view
+
+
+class BatchIngestionQueue:
+    """
+    In-process queue of /upload batches handled by a fixed pool of background workers.
+    Queued batches are picked by priority, then in submission order.
+    Finished batches are kept for ttl_s seconds so clients can poll their results.
+    """
+
+    def __init__(self, *, workers: int = 2, ttl_s: int = 6 * 60 * 60):
+        self._workers = workers
+        self._ttl_s = ttl_s
+        self._batches: Dict[str, IngestionBatch] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._seq = itertools.count()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"ingestion-worker-{i}")
+            for i in range(self._workers)
+        ]
+        logger.info("Started %d ingestion workers", self._workers)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for batch in self._batches.values():
+            if not batch.finished:
+                self._close_files(batch)
+
+    def submit(self, files: List[IntakeFile], *, top_n: int, priority: str = "bulk") -> IngestionBatch:
+        if self._queue is None:
+            raise RuntimeError("Ingestion queue is not running.")
+        self._evict_expired()
+
+        batch = IngestionBatch(
+            id=str(uuid.uuid4()),
+            top_n=top_n,
+            files=files,
+            total_files=len(files),
+            priority=priority,
+        )
+        self._batches[batch.id] = batch
+        self._queue.put_nowait((-PRIORITY_WEIGHTS[priority], next(self._seq), batch))
+        logger.info(
+            "Queued ingestion batch",
+            extra={
+                "event": "cv_batch_queued",
+                "batch_id": batch.id,
+                "files": batch.total_files,
+                "priority": batch.priority,
+            },
+        )
+        return batch
+
+    def get(self, batch_id: str) -> Optional[IngestionBatch]:
+        self._evict_expired()
+        return self._batches.get(batch_id)
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        expired = [
+            b.id for b in self._batches.values()
+            if b.finished_at is not None and now - b.finished_at > self._ttl_s
+        ]
+        for batch_id in expired:
+            del self._batches[batch_id]
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, batch = await self._queue.get()
+            try:
+                await self._run(batch)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, batch: IngestionBatch) -> None:
+        batch.status = "running"
+        try:
+            parsing_service = create_parsing_service()
+            jobs = await load_jobs()
+
+            async for intake, result in ingest_as_completed(
+                batch.files, parsing_service, jobs, priority=batch.priority
+            ):
+                intake.close()
+                batch.processed_files += 1
+                if result is None:
+                    batch.failed_files += 1
+                else:
+                    batch.results.append(result)
+
+            batch.status = "done"
+        except Exception as e:
+            logger.exception(
+                "Ingestion batch failed",
+                extra={"event": "cv_batch_error", "batch_id": batch.id},
+            )
+            batch.status = "failed"
+            batch.error = str(e)
+        finally:
+            self._close_files(batch)
+            batch.files = []
+            batch.finished_at = time.time()
+
+    @staticmethod
+    def _close_files(batch: IngestionBatch) -> None:
+        for intake in batch.files:
+            intake.close()
+
+
+@lru_cache(maxsize=1)
+def get_batch_queue() -> BatchIngestionQueue:
+    settings = IngestionSettings()
+    return BatchIngestionQueue(
+        workers=settings.INGESTION_BATCH_WORKERS,
+        ttl_s=settings.INGESTION_BATCH_TTL_SECONDS,
+    )
@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, List, Optional, Set, Tuple, TypeVar, Union
+
+from backend.src.config.settings.ingestion import IngestionSettings
+from backend.src.models.job_offers_model import JobOffer
+from backend.src.services.admission import AdmissionController, Reservation, get_admission_controller
+from backend.src.services.cancellation import CancellationToken, IngestionCancelled
+from backend.src.services.cv_processing import (
+    CandidateAnalysis,
+    CandidateProcessingResult,
+    analyze_cv,
+    parse_cv,
+    persist_candidate,
+)
+from backend.src.services.cv_storage import delete_cv_from_drive, save_cv_stream_to_drive
+from backend.src.services.document_parsing import DocumentParsingService, open_stream
+from backend.src.services.upload_intake import ContentBuffer, IntakeFile
+from backend.src.utils.file_validation import validate_upload
+
+logger = logging.getLogger(__name__)
+
+IngestionSource = Union[Iterable[IntakeFile], AsyncIterable[IntakeFile]]
+IngestionOutcome = Tuple[IntakeFile, Optional[CandidateProcessingResult]]
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class StageLimits:
+    archive: int = 4
+    parse: int = 4
+    analyze: int = 2
+    queue_size: int = 8
+
+
+@dataclass(eq=False)
+class _WorkItem:
+    intake: IntakeFile
+    buffer: Optional[ContentBuffer] = None
+    archive_job: Optional[Future] = None
+    archive: Optional[asyncio.Future] = None
+    cv_text: Optional[str] = None
+    analysis: Optional[CandidateAnalysis] = None
+    admitted: bool = False
+    service_s: float = 0.0
+    resources: contextlib.ExitStack = field(default_factory=contextlib.ExitStack)
+
+
+class IngestionPipeline:
+    """
+    CV ingestion split into stages connected by bounded queues:
+    intake -> parse -> analyze (NLP + scoring) -> persist, with the Drive archive
+    upload started at intake and running alongside parsing. A CV that fails to
+    parse or analyze has its archive upload cancelled, or its archived copy
+    deleted if the upload already started.
+
+    Every stage has its own executor, shared by all batches in the process, so
+    the limits hold globally. Persisting runs on a single thread because each
+    write rewrites the whole candidates file.
+
+    The total number of CVs in flight is capped by the admission controller,
+    which is fed the parse + analyze time of every finished CV.
+    """
+
+    def __init__(self, limits: StageLimits = StageLimits(), admission: Optional[AdmissionController] = None):
+        self._limits = limits
+        self._admission = admission or AdmissionController()
+        self._archive_executor = ThreadPoolExecutor(limits.archive, thread_name_prefix="cv-archive")
+        self._parse_executor = ThreadPoolExecutor(limits.parse, thread_name_prefix="cv-parse")
+        self._analyze_executor = ThreadPoolExecutor(limits.analyze, thread_name_prefix="cv-analyze")
+        self._persist_executor = ThreadPoolExecutor(1, thread_name_prefix="cv-persist")
+
+    def shutdown(self) -> None:
+        for executor in (
+            self._archive_executor,
+            self._parse_executor,
+            self._analyze_executor,
+            self._persist_executor,
+        ):
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _discard_archive(self, item: _WorkItem) -> None:
+        """Keeps a CV that will not be stored from being left behind on Drive."""
+        job = item.archive_job
+        if job is None or job.cancel():
+            return
+
+        def delete_archived(done: Future) -> None:
+            if done.cancelled() or done.exception() is not None:
+                return
+            try:
+                self._archive_executor.submit(_delete_archived, done.result(), item.intake.filename)
+            except RuntimeError:
+                # Executor already shut down.
+                logger.warning(
+                    "Archived copy of a failed CV left on Google Drive",
+                    extra={"event": "cv_archive_orphaned", "file_name": item.intake.filename},
+                )
+
+        job.add_done_callback(delete_archived)
+
+    async def run(
+        self,
+        source: IngestionSource,
+        parsing_service: DocumentParsingService,
+        jobs: List[JobOffer],
+        *,
+        reservation: Optional[Reservation] = None,
+        priority: str = "normal",
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> AsyncIterator[IngestionOutcome]:
+        """
+        Yields (file, result) pairs in completion order; result is None for rejected or failed files.
+        Each finished file gives back one place of the caller's backlog reservation.
+        The run competes for in-flight slots as one flow with the given priority.
+
+        Cancelling the token (or closing the generator early) stops all stages: queued
+        work is dropped, running steps finish their current unit and go no further,
+        and the generator raises IngestionCancelled. A persist that already started
+        always completes, so stored candidates stay consistent.
+        """
+        token = cancel_token or CancellationToken()
+        flow = self._admission.flow(priority)
+        loop = asyncio.get_running_loop()
+        size = self._limits.queue_size
+        parse_q: asyncio.Queue = asyncio.Queue(size)
+        analyze_q: asyncio.Queue = asyncio.Queue(size)
+        persist_q: asyncio.Queue = asyncio.Queue(size)
+        out_q: asyncio.Queue = asyncio.Queue()
+        admitted = 0
+        in_flight: Set[_WorkItem] = set()
+        intake_done = asyncio.Event()
+        cancelled = asyncio.Event()
+        workers: List[asyncio.Task] = []
+
+        def on_cancel() -> None:
+            cancelled.set()
+            for worker in workers:
+                worker.cancel()
+
+        def schedule_cancel() -> None:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(on_cancel)
+
+        token.add_callback(schedule_cancel)
+
+        def finish(item: _WorkItem, result: Optional[CandidateProcessingResult]) -> None:
+            # The archive upload may still be reading the buffer; it is released once the upload ends.
+            _release_when_archived(item)
+            item.buffer = None
+            in_flight.discard(item)
+            if item.admitted:
+                item.admitted = False
+                self._admission.release(item.service_s)
+            if reservation is not None:
+                reservation.release()
+            out_q.put_nowait((item.intake, result))
+
+        def fail(item: _WorkItem, stage: str) -> None:
+            if not token.cancelled:
+                logger.exception(
+                    "Internal error occurred when processing CV",
+                    extra={"event": "cv_processing_error", "file_name": item.intake.filename, "stage": stage},
+                )
+            if stage in ("parse", "analyze"):
+                self._discard_archive(item)
+            finish(item, None)
+
+        def archive(buffer: ContentBuffer, intake: IntakeFile) -> str:
+            token.raise_if_cancelled()
+            with open_stream(buffer) as stream:
+                return save_cv_stream_to_drive(
+                    stream=stream,
+                    filename=intake.filename,
+                    content_type=intake.content_type,
+                )
+
+        async def intake_stage() -> None:
+            nonlocal admitted
+            try:
+                async for intake in _iterate(source):
+                    admitted += 1
+                    item = _WorkItem(intake=intake)
+                    in_flight.add(item)
+
+                    is_valid, info = validate_upload(intake.size, intake.filename, intake.content_type)
+                    if not is_valid:
+                        logger.warning(
+                            "File rejected during validation",
+                            extra={
+                                "event": "cv_validation_rejected",
+                                "file_name": intake.filename,
+                                "reason": info,
+                            },
+                        )
+                        finish(item, None)
+                        continue
+
+                    await self._admission.acquire(flow)
+                    item.admitted = True
+
+                    try:
+                        item.buffer = item.resources.enter_context(intake.open_buffer())
+                    except Exception:
+                        fail(item, "intake")
+                        continue
+
+                    item.archive_job = self._archive_executor.submit(archive, item.buffer, intake)
+                    item.archive = asyncio.wrap_future(item.archive_job)
+                    await parse_q.put(item)
+            finally:
+                intake_done.set()
+
+        async def parse_stage() -> None:
+            while True:
+                item: _WorkItem = await parse_q.get()
+                started = time.monotonic()
+                try:
+                    item.cv_text = await loop.run_in_executor(
+                        self._parse_executor,
+                        _unless_cancelled(token, parse_cv),
+                        item.buffer,
+                        item.intake.filename,
+                        item.intake.content_type,
+                        parsing_service,
+                    )
+                except Exception:
+                    fail(item, "parse")
+                    continue
+                item.service_s += time.monotonic() - started
+                await analyze_q.put(item)
+
+        async def analyze_stage() -> None:
+            while True:
+                item: _WorkItem = await analyze_q.get()
+                started = time.monotonic()
+                try:
+                    item.analysis = await loop.run_in_executor(
+                        self._analyze_executor,
+                        analyze_cv,
+                        item.cv_text,
+                        jobs,
+                        item.intake.filename,
+                        token,
+                    )
+                except Exception:
+                    fail(item, "analyze")
+                    continue
+                item.service_s += time.monotonic() - started
+                await persist_q.put(item)
+
+        async def persist_stage() -> None:
+            while True:
+                item: _WorkItem = await persist_q.get()
+                try:
+                    # Shielded: cancelling this stage must not cancel an upload that is still reading the buffer.
+                    cv_drive_file_id = await asyncio.shield(item.archive)
+                except Exception:
+                    logger.exception(
+                        "Failed to store CV in Google Drive",
+                        extra={
+                            "event": "cv_drive_store_error",
+                            "file_name": item.intake.filename,
+                        },
+                    )
+                    finish(item, None)
+                    continue
+
+                try:
+                    result = await loop.run_in_executor(
+                        self._persist_executor,
+                        _unless_cancelled(token, persist_candidate),
+                        item.analysis,
+                        cv_drive_file_id,
+                        item.intake.filename,
+                    )
+                except Exception:
+                    fail(item, "persist")
+                    continue
+                finish(item, result)
+
+        workers.append(asyncio.create_task(intake_stage()))
+        workers += [asyncio.create_task(parse_stage()) for _ in range(self._limits.parse)]
+        workers += [asyncio.create_task(analyze_stage()) for _ in range(self._limits.analyze)]
+        workers.append(asyncio.create_task(persist_stage()))
+        intake_worker = workers[0]
+
+        async def next_outcome() -> Optional[IngestionOutcome]:
+            getter = asyncio.ensure_future(out_q.get())
+            waits = {getter, asyncio.ensure_future(cancelled.wait())}
+            if not intake_done.is_set():
+                waits.add(asyncio.ensure_future(intake_done.wait()))
+            try:
+                await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for wait in waits:
+                    wait.cancel()
+            return getter.result() if getter.done() and not getter.cancelled() else None
+
+        yielded = 0
+        completed = False
+        try:
+            while not (intake_done.is_set() and yielded == admitted):
+                outcome = await next_outcome()
+                if cancelled.is_set():
+                    logger.info(
+                        "CV ingestion cancelled",
+                        extra={"event": "cv_ingestion_cancelled", "processed": yielded, "admitted": admitted},
+                    )
+                    raise IngestionCancelled("CV processing was cancelled.")
+                if outcome is not None:
+                    yielded += 1
+                    yield outcome
+
+            if intake_worker.exception() is not None:
+                raise intake_worker.exception()
+            completed = True
+        finally:
+            if not completed:
+                token.cancel()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for item in in_flight:
+                if item.admitted:
+                    self._admission.release()
+                _release_when_archived(item)
+            if reservation is not None:
+                reservation.close()
+
+
+def _unless_cancelled(token: CancellationToken, func: Callable[..., T]) -> Callable[..., T]:
+    def run(*args) -> T:
+        token.raise_if_cancelled()
+        return func(*args)
+    return run
+
+
+def _release_when_archived(item: _WorkItem) -> None:
+    if item.archive is None or item.archive.done():
+        item.resources.close()
+    else:
+        item.archive.add_done_callback(lambda _: item.resources.close())
+
+
+def _delete_archived(file_id: str, filename: Optional[str]) -> None:
+    try:
+        delete_cv_from_drive(file_id)
+    except Exception:
+        logger.exception(
+            "Failed to delete archived copy of a failed CV",
+            extra={"event": "cv_archive_delete_error", "file_name": filename, "cv_drive_file_id": file_id},
+        )
+
+
+async def _iterate(source: IngestionSource) -> AsyncIterator[IntakeFile]:
+    if hasattr(source, "__aiter__"):
+        async for intake in source:
+            yield intake
+    else:
+        for intake in source:
+            yield intake
+
+
+@lru_cache(maxsize=1)
+def get_ingestion_pipeline() -> IngestionPipeline:
+    settings = IngestionSettings()
+    return IngestionPipeline(
+        StageLimits(
+            archive=settings.INGESTION_ARCHIVE_CONCURRENCY,
+            parse=settings.INGESTION_PARSE_CONCURRENCY,
+            analyze=settings.INGESTION_ANALYZE_CONCURRENCY,
+            queue_size=settings.INGESTION_STAGE_QUEUE_SIZE,
+        ),
+        admission=get_admission_controller(),
+    )
@@ -0,0 +1,213 @@
+import asyncio
+import io
+import logging
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from googleapiclient.discovery import Resource
+from googleapiclient.http import MediaIoBaseUpload
+
+from backend.src.models.job_offers_model import JobOffer
+from backend.src.services.drive_folders import resolve_folder
+from backend.src.services.google_drive_connect import download_bytes, get_service, list_folder_files
+from backend.src.services.storage_format import (
+    MIME_TYPES,
+    app_properties,
+    decode,
+    encode,
+    is_trusted,
+    load_models,
+    storage_encoding,
+)
+from backend.src.utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+
+class GoogleDriveJobOfferFileStore:
+    """
+    One Drive file per offer, job_offer-<id>.json, in the "oferta" folder.
+    The folder listing is the index: it gives every offer file with its
+    modifiedTime, so a reload downloads only offers changed since the last
+    one, and a create, update or delete writes only the affected offer.
+
+    A job_offers.json left by the single-file store is migrated on load: the
+    offers without a file are written, then it is renamed to
+    job_offers.json.migrated. An interrupted migration resumes on the next load.
+
+    Drive calls run in a worker thread, one at a time per store.
+    """
+
+    FOLDER_NAME = "oferta"
+    LEGACY_FILE_NAME = "job_offers.json"
+    FILE_NAME_RE = re.compile(r"^job_offer-(.+)\.json$")
+    # Bump whenever JobOffer changes in a way old files do not satisfy.
+    SCHEMA_VERSION = "1"
+
+    def __init__(self):
+        self.service: Optional[Resource] = None
+        self.folder_id: Optional[str] = None
+        # Drive file id -> (modifiedTime, offer) of offers already downloaded.
+        self._offers_by_file: Dict[str, Tuple[str, JobOffer]] = {}
+        self._io_lock = threading.Lock()
+
+    def _ensure_folder(self):
+        if self.service is None:
+            self.service = get_service()
+        if not self.folder_id:
+            self.folder_id = resolve_folder(self.service, self.FOLDER_NAME)
+
+    @staticmethod
+    def _file_name(offer_id: str) -> str:
+        return f"job_offer-{offer_id}.json"
+
+    def _list_files(self) -> List[Dict[str, Any]]:
+        return list_folder_files(self.service, self.folder_id, order_by="createdTime")
+
+    def _offer_files(self, files: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Offer id -> file, in creation order."""
+        return {m.group(1): f for f in files if (m := self.FILE_NAME_RE.match(f["name"]))}
+
+    def _load_offer(self, offer_file: Dict[str, Any]) -> Optional[JobOffer]:
+        payload = download_bytes(self.service, offer_file["id"])
+        try:
+            raw = json_codec.loads(decode(payload))
+        except ValueError as e:
+            logger.error("Error occured when reading from %s: %s", offer_file["name"], e)
+            return None
+
+        trusted = is_trusted(payload, offer_file.get("appProperties"), self.SCHEMA_VERSION)
+        offers = load_models(JobOffer, [raw], trusted=trusted, source=offer_file["name"])
+        return offers[0] if offers else None
+
+    def _write_offer(self, offer: JobOffer, existing: Optional[Dict[str, Any]]) -> None:
+        encoding = storage_encoding()
+        payload = encode(json_codec.dumps(offer.model_dump()), encoding)
+        media = MediaIoBaseUpload(io.BytesIO(payload), mimetype=MIME_TYPES[encoding], resumable=False)
+        body: Dict[str, Any] = {"appProperties": app_properties(payload, self.SCHEMA_VERSION)}
+
+        if existing:
+            # Updating in place keeps the file id, so other readers' caches stay keyed correctly.
+            written = self.service.files().update(
+                fileId=existing["id"],
+                body=body,
+                media_body=media,
+                fields="id, modifiedTime",
+            ).execute()
+        else:
+            body.update(name=self._file_name(offer.id), parents=[self.folder_id])
+            written = self.service.files().create(
+                body=body,
+                media_body=media,
+                fields="id, modifiedTime",
+            ).execute()
+
+        if written.get("modifiedTime"):
+            self._offers_by_file[written["id"]] = (written["modifiedTime"], offer)
+
+    async def load_all(self) -> List[JobOffer]:
+        return await asyncio.to_thread(self._load_all)
+
+    def _load_all(self) -> List[JobOffer]:
+        with self._io_lock:
+            self._ensure_folder()
+
+            try:
+                files = self._list_files()
+                legacy = next((f for f in files if f["name"] == self.LEGACY_FILE_NAME), None)
+                if legacy:
+                    try:
+                        self._migrate(legacy, self._offer_files(files))
+                    except Exception as e:
+                        logger.error("Migration of %s stopped, resuming on next load: %s", self.LEGACY_FILE_NAME, e)
+                    files = self._list_files()
+                return self._load_offers(self._offer_files(files))
+
+            except Exception as e:
+                logger.error("Error occured when reading job offers: %s", e)
+                return []
+
+    def _load_offers(self, offer_files: Dict[str, Dict[str, Any]]) -> List[JobOffer]:
+        offers: List[JobOffer] = []
+        downloaded = 0
+        for offer_file in offer_files.values():
+            cached = self._offers_by_file.get(offer_file["id"])
+            if cached and cached[0] == offer_file.get("modifiedTime"):
+                offers.append(cached[1])
+                continue
+
+            offer = self._load_offer(offer_file)
+            downloaded += 1
+            if offer is not None:
+                self._offers_by_file[offer_file["id"]] = (offer_file.get("modifiedTime"), offer)
+                offers.append(offer)
+
+        live = {f["id"] for f in offer_files.values()}
+        for file_id in list(self._offers_by_file):
+            if file_id not in live:
+                del self._offers_by_file[file_id]
+
+        if downloaded:
+            logger.info("Reloaded %d of %d job offers from Drive", downloaded, len(offer_files))
+        return offers
+
+    async def save_all(self, offers: List[JobOffer]):
+        keep = {o.id for o in offers}
+        await asyncio.to_thread(self._save_changes, offers, keep, None)
+
+    async def save_changes(self, offers: List[JobOffer], changed_ids: Iterable[str], deleted_ids: Iterable[str]):
+        """Writes only the offers in changed_ids and removes the files of deleted_ids."""
+        changed_ids = set(changed_ids)
+        deleted_ids = set(deleted_ids)
+        if not changed_ids and not deleted_ids:
+            return
+        await asyncio.to_thread(self._save_changes, offers, changed_ids, deleted_ids)
+
+    def _save_changes(self, offers: List[JobOffer], changed_ids: Set[str], deleted_ids: Optional[Set[str]]):
+        """deleted_ids None removes every offer file not in changed_ids."""
+        with self._io_lock:
+            self._ensure_folder()
+            try:
+                existing = self._offer_files(self._list_files())
+                if deleted_ids is None:
+                    deleted_ids = set(existing) - changed_ids
+                for offer in offers:
+                    if offer.id in changed_ids:
+                        self._write_offer(offer, existing.get(offer.id))
+                for offer_id in deleted_ids:
+                    offer_file = existing.get(offer_id)
+                    if offer_file:
+                        self.service.files().delete(fileId=offer_file["id"]).execute()
+                        self._offers_by_file.pop(offer_file["id"], None)
+
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Błąd zapisu ofert pracy: {e}"
+                )
+
+    def _migrate(self, legacy: Dict[str, Any], offer_files: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Writes the legacy offers that have no file yet and renames the legacy
+        file last, so a migration cut short is finished by the next load.
+        Offers that already have a file keep it: it may have been changed since.
+        """
+        payload = download_bytes(self.service, legacy["id"])
+        trusted = is_trusted(payload, legacy.get("appProperties"), self.SCHEMA_VERSION)
+        offers = load_models(JobOffer, json_codec.loads(decode(payload)), trusted=trusted, source=self.LEGACY_FILE_NAME)
+
+        missing = [offer for offer in offers if offer.id not in offer_files]
+        for offer in missing:
+            self._write_offer(offer, None)
+        self.service.files().update(
+            fileId=legacy["id"],
+            body={"name": f"{self.LEGACY_FILE_NAME}.migrated"},
+        ).execute()
+        logger.info(
+            "Migrated %d of %d job offers from %s to one file per offer",
+            len(missing),
+            len(offers),
+            self.LEGACY_FILE_NAME,
+        )
@@ -1,35 +1,153 @@
+import asyncio
+import logging
 import uuid
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
 
-from pydantic import ValidationError
+from backend.src.config.settings.google_drive import GoogleDriveSettings
+from backend.src.models.job_offers_model import JobOffer, JobOfferCreate, JobOfferUpdate, Requirement
+from backend.src.services.job_offers.job_offers_store import JobOfferStore, create_job_offer_store
+from backend.src.utils.single_flight import AsyncSingleFlight
 
-from backend.src.models.job_offers_model import JobOffer, JobOfferCreate, Requirement
-from backend.src.services.job_offers.job_offers_store import GoogleDriveJobOfferStore
+logger = logging.getLogger(__name__)
 
 
 class JobOfferRepository:
-    def __init__(self, store: GoogleDriveJobOfferStore):
+    """
+    In-memory catalog of job offers backed by a store on Drive.
+
+    By default every mutation is written before the request returns. With
+    write_behind, mutations only update the cache and a background task writes
+    them once no change came for debounce_s seconds, or at most max_delay_s
+    after the first unwritten change. flush() writes pending changes now.
+
+    A failed background write is retried after retry_base_s, doubling up to
+    retry_max_s. After max_attempts failures in a row the task gives up until
+    the next change or flush(); the changes stay pending and the last error
+    is kept in flush_error.
+    """
+
+    def __init__(
+        self,
+        store: JobOfferStore,
+        *,
+        write_behind: bool = False,
+        debounce_s: float = 2.0,
+        max_delay_s: float = 10.0,
+        retry_base_s: float = 1.0,
+        retry_max_s: float = 60.0,
+        max_attempts: int = 8,
+    ):
         self.store = store
+        self._write_behind = write_behind
+        self._debounce_s = debounce_s
+        self._max_delay_s = max_delay_s
+        self._retry_base_s = retry_base_s
+        self._retry_max_s = retry_max_s
+        self._max_attempts = max_attempts
+        self.flush_error: Optional[Exception] = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._first_change: Optional[float] = None
+        self._last_change = 0.0
         self._cache: Dict[str, JobOffer] = {}
+        # Offers changed or deleted since the last flush.
+        self._dirty: Set[str] = set()
+        self._deleted: Set[str] = set()
         self._loaded = False
+        self._loading = AsyncSingleFlight()
 
     async def _load(self):
         if self._loaded:
             return
+        # Concurrent first requests share one download of job_offers.json.
+        await self._loading.do("load", self._load_from_store)
 
-        raw = await self.store.load_all()
-        for item in raw:
-            try:
-                job = JobOffer(**item)
-                self._cache[job.id] = job
-            except ValidationError:
-                continue
+    async def _load_from_store(self):
+        if self._loaded:
+            return
+
+        for job in await self.store.load_all():
+            self._cache[job.id] = job
 
         self._loaded = True
 
     async def _flush(self):
-        data = [j.dict() for j in self._cache.values()]
-        await self.store.save_all(data)
+        async with self._flush_lock:
+            dirty, deleted = self._dirty, self._deleted
+            if not dirty and not deleted:
+                return
+            self._dirty, self._deleted = set(), set()
+            try:
+                await self.store.save_changes(list(self._cache.values()), dirty, deleted)
+            except BaseException as e:
+                # Keep them for the next flush; changes made meanwhile are newer.
+                # Also on cancel: the write may still be running in its thread.
+                self._dirty |= dirty - self._deleted
+                self._deleted |= deleted - self._dirty
+                if isinstance(e, Exception):
+                    self.flush_error = e
+                raise
+            self.flush_error = None
+
+    async def _persist(self):
+        if not self._write_behind:
+            await self._flush()
+            return
+
+        now = asyncio.get_running_loop().time()
+        self._last_change = now
+        if self._first_change is None:
+            self._first_change = now
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later(), name="job-offers-write-behind")
+
+    async def _flush_later(self):
+        loop = asyncio.get_running_loop()
+        failures = 0
+        while self._dirty or self._deleted:
+            first_change = self._first_change if self._first_change is not None else self._last_change
+            deadline = min(self._last_change + self._debounce_s, first_change + self._max_delay_s)
+            if loop.time() < deadline:
+                await asyncio.sleep(deadline - loop.time())
+                continue
+
+            self._first_change = None
+            try:
+                await self._flush()
+                failures = 0
+            except Exception:
+                failures += 1
+                if failures >= self._max_attempts:
+                    logger.exception(
+                        "Write-behind flush of job offers failed %d times, giving up until the next change", failures
+                    )
+                    return
+                delay = min(self._retry_base_s * 2 ** (failures - 1), self._retry_max_s)
+                logger.warning("Write-behind flush of job offers failed, retrying in %.1fs", delay, exc_info=True)
+                # Changes made meanwhile restart the debounce; otherwise the retry is due right after.
+                await asyncio.sleep(delay)
+
+    async def flush(self):
+        """Writes pending changes now; used on shutdown in write-behind mode."""
+        task = self._flush_task
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._flush_task = None
+        self._first_change = None
+        await self._flush()
+
+    @staticmethod
+    def _build(job_id: str, payload: JobOfferCreate) -> JobOffer:
+        return JobOffer(
+            id=job_id,
+            **payload.dict(exclude={"requirements", "id"}),
+            requirements=[
+                Requirement(id=str(uuid.uuid4()), **r.dict())
+                for r in payload.requirements
+            ],
+        )
 
     async def list(self) -> List[JobOffer]:
         await self._load()
@@ -43,19 +161,11 @@ class JobOfferRepository:
         await self._load()
 
         job_id = str(uuid.uuid4())
-        reqs = [
-            Requirement(id=str(uuid.uuid4()), **r.dict())
-            for r in payload.requirements
-        ]
-
-        job = JobOffer(
-            id=job_id,
-            **payload.dict(exclude={"requirements"}),
-            requirements=reqs,
-        )
+        job = self._build(job_id, payload)
 
         self._cache[job_id] = job
-        await self._flush()
+        self._dirty.add(job_id)
+        await self._persist()
         return job
 
     async def update(self, job_id: str, payload: JobOfferCreate) -> JobOffer:
@@ -64,17 +174,11 @@ class JobOfferRepository:
         if job_id not in self._cache:
             raise KeyError(job_id)
 
-        updated = JobOffer(
-            id=job_id,
-            **payload.dict(exclude={"requirements"}),
-            requirements=[
-                Requirement(id=str(uuid.uuid4()), **r.dict())
-                for r in payload.requirements
-            ],
-        )
+        updated = self._build(job_id, payload)
 
         self._cache[job_id] = updated
-        await self._flush()
+        self._dirty.add(job_id)
+        await self._persist()
         return updated
 
     async def delete(self, job_id: str):
@@ -84,4 +188,54 @@ class JobOfferRepository:
             raise KeyError(job_id)
 
         del self._cache[job_id]
-        await self._flush()
+        self._dirty.discard(job_id)
+        self._deleted.add(job_id)
+        await self._persist()
+
+    async def bulk(
+        self,
+        create: List[JobOfferCreate],
+        update: List[JobOfferUpdate],
+        delete: List[str],
+    ) -> Tuple[List[JobOffer], List[JobOffer], List[str]]:
+        """
+        Applies all changes with a single flush. Everything is checked before
+        anything changes: unknown ids raise KeyError, an id given twice or both
+        updated and deleted raises ValueError.
+        """
+        await self._load()
+
+        update_ids = [u.id for u in update]
+        touched = update_ids + list(delete)
+        duplicates = sorted({i for i in touched if touched.count(i) > 1})
+        if duplicates:
+            raise ValueError(duplicates)
+        missing = [i for i in touched if i not in self._cache]
+        if missing:
+            raise KeyError(missing)
+
+        created = [self._build(str(uuid.uuid4()), payload) for payload in create]
+        updated = [self._build(payload.id, payload) for payload in update]
+
+        for job in created + updated:
+            self._cache[job.id] = job
+            self._dirty.add(job.id)
+        for job_id in delete:
+            del self._cache[job_id]
+            self._dirty.discard(job_id)
+            self._deleted.add(job_id)
+
+        if created or updated or delete:
+            await self._persist()
+        return created, updated, list(delete)
+
+
+@lru_cache(maxsize=1)
+def get_job_offer_repository() -> JobOfferRepository:
+    settings = GoogleDriveSettings()
+    return JobOfferRepository(
+        create_job_offer_store(),
+        write_behind=settings.JOB_OFFERS_WRITE_BEHIND,
+        debounce_s=settings.JOB_OFFERS_FLUSH_DEBOUNCE_SECONDS,
+        max_delay_s=settings.JOB_OFFERS_FLUSH_MAX_DELAY_SECONDS,
+    )
@@ -1,18 +1,32 @@
-import json
+import asyncio
 import logging
 import os
 import tempfile
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Iterable, Optional, Union
 
 from fastapi import HTTPException
 from googleapiclient.discovery import Resource
 
 from backend.src.services.google_drive_connect import (
     get_service,
-    list_files,
     upload_file,
     download_file,
 )
+from backend.src.config.settings.google_drive import GoogleDriveSettings
+from backend.src.models.job_offers_model import JobOffer
+from backend.src.services.drive_folders import resolve_folder
+from backend.src.services.job_offers.job_offers_file_store import GoogleDriveJobOfferFileStore
+from backend.src.services.storage_format import (
+    MIME_TYPES,
+    app_properties,
+    decode,
+    encode,
+    is_trusted,
+    load_models,
+    storage_encoding,
+)
+from backend.src.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
@@ -20,82 +34,67 @@ logger = logging.getLogger(__name__)
 class GoogleDriveJobOfferStore:
     FOLDER_NAME = "oferta"
     FILE_NAME = "job_offers.json"
+    # Bump whenever JobOffer changes in a way old files do not satisfy.
+    SCHEMA_VERSION = "1"
 
     def __init__(self):
         self.service: Optional[Resource] = None
         self.folder_id: Optional[str] = None
+        # The Drive client is not thread-safe; calls from worker threads take turns.
+        self._io_lock = threading.Lock()
 
     def _ensure_service(self):
         if self.service is None:
             self.service = get_service()
 
-    def _find_folder(self) -> Optional[str]:
-        self._ensure_service()
-        files = list_files(self.service, page_size=100)
-
-        for f in files:
-            if f.get("name") == self.FOLDER_NAME and \
-                    f.get("mimeType") == "application/vnd.google-apps.folder":
-                return f["id"]
-
-        return None
-
-    def _create_folder(self) -> str:
-        self._ensure_service()
-        file_metadata = {
-            "name": self.FOLDER_NAME,
-            "mimeType": "application/vnd.google-apps.folder"
-        }
-
-        created = self.service.files().create(
-            body=file_metadata,
-            fields="id"
-        ).execute()
-
-        return created["id"]
-
     def _ensure_folder(self):
         if self.folder_id:
             return
 
-        folder = self._find_folder()
-        if folder:
-            self.folder_id = folder
-        else:
-            logger.info("Directory 'oferta' does not exist. Creating a new folder on Google Drive.")
-            self.folder_id = self._create_folder()
+        self._ensure_service()
+        self.folder_id = resolve_folder(self.service, self.FOLDER_NAME)
 
-    def _find_json_file(self) -> Optional[str]:
+    def _find_json_file(self) -> Optional[Dict[str, Any]]:
         self._ensure_service()
         self._ensure_folder()
 
         query = f"'{self.folder_id}' in parents"
         files = self.service.files().list(
             q=query,
-            fields="files(id, name, mimeType)"
+            fields="files(id, name, mimeType, appProperties)"
         ).execute().get("files", [])
 
         for f in files:
             if f["name"] == self.FILE_NAME:
-                return f["id"]
+                return f
 
         return None
 
-    async def load_all(self) -> List[Dict[str, Any]]:
+    async def load_all(self) -> List[JobOffer]:
+        # Drive calls block; running them in a thread lets concurrent callers share one load.
+        return await asyncio.to_thread(self._load_all)
+
+    def _load_all(self) -> List[JobOffer]:
+        with self._io_lock:
+            return self._load_file()
+
+    def _load_file(self) -> List[JobOffer]:
         self._ensure_service()
         self._ensure_folder()
 
-        file_id = self._find_json_file()
-        if not file_id:
+        json_file = self._find_json_file()
+        if not json_file:
             return []
 
         with tempfile.NamedTemporaryFile(delete=False) as tmp:
             tmp_path = tmp.name
 
         try:
-            download_file(self.service, file_id, tmp_path)
-            with open(tmp_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            download_file(self.service, json_file["id"], tmp_path)
+            with open(tmp_path, "rb") as f:
+                payload = f.read()
+            trusted = is_trusted(payload, json_file.get("appProperties"), self.SCHEMA_VERSION)
+            return load_models(JobOffer, json_codec.loads(decode(payload)), trusted=trusted, source=self.FILE_NAME)
 
         except Exception as e:
             logger.error("Error occured when reading from job_offers.json: %s", e)
@@ -105,26 +104,36 @@ class GoogleDriveJobOfferStore:
             if os.path.exists(tmp_path):
                 os.remove(tmp_path)
 
-    async def save_all(self, offers: List[Dict[str, Any]]):
+    async def save_all(self, offers: List[JobOffer]):
+        await asyncio.to_thread(self._save_all, offers)
+
+    def _save_all(self, offers: List[JobOffer]):
+        with self._io_lock:
+            self._save_file(offers)
+
+    def _save_file(self, offers: List[JobOffer]):
         self._ensure_service()
         self._ensure_folder()
 
-        with tempfile.NamedTemporaryFile(delete=False, mode="w", encoding="utf-8") as tmp:
+        encoding = storage_encoding()
+        payload = encode(json_codec.dumps([o.model_dump() for o in offers]), encoding)
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
             tmp_path = tmp.name
-            json.dump(offers, tmp, ensure_ascii=False, indent=2)
+            tmp.write(payload)
 
         try:
-            existing_file_id = self._find_json_file()
+            existing_file = self._find_json_file()
 
-            if existing_file_id:
-                self.service.files().delete(fileId=existing_file_id).execute()
+            if existing_file:
+                self.service.files().delete(fileId=existing_file["id"]).execute()
 
             upload_file(
                 service=self.service,
                 file_path=tmp_path,
-                mime_type="application/json",
+                mime_type=MIME_TYPES[encoding],
                 parent_folder_id=self.folder_id,
                 file_name=self.FILE_NAME,
+                app_properties=app_properties(payload, self.SCHEMA_VERSION),
             )
 
         except Exception as e:
@@ -136,3 +145,18 @@ class GoogleDriveJobOfferStore:
         finally:
             if os.path.exists(tmp_path):
                 os.remove(tmp_path)
+
+    async def save_changes(self, offers: List[JobOffer], changed_ids: Iterable[str], deleted_ids: Iterable[str]):
+        """The single file has to be rewritten whole whatever changed."""
+        if set(changed_ids) or set(deleted_ids):
+            await self.save_all(offers)
+
+
+JobOfferStore = Union[GoogleDriveJobOfferStore, GoogleDriveJobOfferFileStore]
+
+
+def create_job_offer_store() -> JobOfferStore:
+    """The store selected by JOB_OFFERS_STORAGE."""
+    if GoogleDriveSettings().JOB_OFFERS_STORAGE == "per_offer":
+        return GoogleDriveJobOfferFileStore()
+    return GoogleDriveJobOfferStore()
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Union
 
 from backend.src.models.candidate_matching import JobMatch, RequirementMatch
 from backend.src.models.job_offers_model import JobOffer
+from backend.src.services.analyzed_cv import AnalyzedCV
 from backend.src.services.synonym_recognition import SynonymRecognizer
 
 
@@ -11,10 +12,6 @@ class JobMatchScorer:
     def __init__(self, synonym_recognizer: SynonymRecognizer | None):
         self.synonym_recognizer = synonym_recognizer
 
-    @staticmethod
-    def _normalize(text: str) -> str:
-        return text.lower()
-
     def _match_requirement(self, text_norm: str, keywords: List[str]) -> bool:
         if not keywords:
             return False
@@ -34,8 +31,8 @@ class JobMatchScorer:
 
         return False
 
-    def score_for_job(self, cv_text: str, job: JobOffer) -> JobMatch:
-        text_norm = self._normalize(cv_text)
+    def score_for_job(self, cv_text: Union[str, AnalyzedCV], job: JobOffer) -> JobMatch:
+        text_norm = AnalyzedCV.of(cv_text).normalized
 
         matched_reqs: List[RequirementMatch] = []
         missing_required: List[RequirementMatch] = []
@@ -1,8 +1,9 @@
 import re
 from dataclasses import dataclass
-from typing import List, Optional, Iterable
+from typing import List, Optional, Iterable, Union
 
 from backend.src.models.job_offers_model import JobOffer
+from backend.src.services.analyzed_cv import AnalyzedCV
 
 
 @dataclass
@@ -16,15 +17,10 @@ class JobSelectionResult:
 class JobSelectionService:
     def select_jobs(
         self,
-        cv_text: str,
+        cv_text: Union[str, AnalyzedCV],
         all_jobs: Iterable[JobOffer],
     ) -> JobSelectionResult:
-        text_norm = cv_text.lower()
-
-        text_without_contacts = re.sub(r"\S+@\S+", " ", text_norm)
-        text_without_contacts = re.sub(r"https?://\S+", " ", text_without_contacts)
-
-        text_without_contacts = re.sub(r"\s+", " ", text_without_contacts)
+        text_without_contacts = AnalyzedCV.of(cv_text).without_contacts
 
         active_jobs = [j for j in all_jobs if j.status in ("active", "ACTIVE")]
 
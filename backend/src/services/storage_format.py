@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import types
+import zlib
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional, Type, TypeVar, Union, get_args, get_origin
+
+from pydantic import BaseModel, EmailStr, TypeAdapter, ValidationError
+
+from backend.src.config.settings.google_drive import GoogleDriveSettings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+_DECODE_ERRORS = (OSError, EOFError, zlib.error) + ((zstandard.ZstdError,) if zstandard else ())
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+# Field types whose JSON value already is the field value. Anything else that
+# is not a model, list or dict (URLs, enums, ...) is still run through
+# validation, or model_dump() would see a str where it expects e.g. a Url.
+_PLAIN_TYPES = (str, int, float, bool, EmailStr, Any)
+
+# Drive appProperties written next to every storage file.
+SCHEMA_VERSION_PROPERTY = "schema_version"
+CHECKSUM_PROPERTY = "sha256"
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+MIME_TYPES = {
+    "json": "application/json",
+    "gzip": "application/gzip",
+    "zstd": "application/zstd",
+}
+
+
+@lru_cache(maxsize=1)
+def storage_encoding() -> str:
+    """Encoding for newly written files, from STORAGE_ENCODING."""
+    encoding = GoogleDriveSettings().STORAGE_ENCODING
+    if encoding == "zstd" and zstandard is None:
+        logger.warning("STORAGE_ENCODING=zstd but zstandard is not installed, writing gzip instead.")
+        return "gzip"
+    return encoding
+
+
+def encode(payload: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        # mtime=0 keeps the output, and so its checksum, deterministic.
+        return gzip.compress(payload, compresslevel=6, mtime=0)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=6).compress(payload)
+    return payload
+
+
+def decode(data: bytes) -> bytes:
+    """Plain bytes of a stored file, whatever encoding it was written with."""
+    try:
+        if data.startswith(GZIP_MAGIC):
+            return gzip.decompress(data)
+        if data.startswith(ZSTD_MAGIC):
+            if zstandard is None:
+                raise ValueError("File is zstd-compressed but zstandard is not installed.")
+            return zstandard.ZstdDecompressor().decompress(data)
+    except _DECODE_ERRORS as e:
+        raise ValueError(f"Corrupted compressed file: {e}") from e
+    return data
+
+
+def app_properties(payload: bytes, schema_version: str) -> Dict[str, str]:
+    return {
+        SCHEMA_VERSION_PROPERTY: schema_version,
+        CHECKSUM_PROPERTY: hashlib.sha256(payload).hexdigest(),
+    }
+
+
+def is_trusted(payload: bytes, properties: Optional[Dict[str, str]], schema_version: str) -> bool:
+    """
+    True when the file was written by this code at the current schema version
+    and has not been modified since: its checksum property matches its bytes.
+    """
+    if not properties or properties.get(SCHEMA_VERSION_PROPERTY) != schema_version:
+        return False
+    return properties.get(CHECKSUM_PROPERTY) == hashlib.sha256(payload).hexdigest()
+
+
+def load_models(model: Type[M], items: Any, *, trusted: bool, source: str) -> List[M]:
+    """
+    Turns stored dicts into models. Trusted files are constructed without
+    validation. Anything else is validated as one list, and if that fails,
+    record by record, skipping the invalid ones.
+    """
+    if not isinstance(items, list):
+        logger.error("Expected a list in %s, got %s", source, type(items).__name__)
+        return []
+
+    if trusted:
+        return [construct(model, item) for item in items]
+
+    try:
+        return _list_adapter(model).validate_python(items)
+    except ValidationError:
+        pass
+
+    models: List[M] = []
+    for item in items:
+        try:
+            models.append(model.model_validate(item))
+        except ValidationError as e:
+            logger.error("Wrong record in %s, skipping: %s", source, e)
+    return models
+
+
+def construct(model: Type[M], data: Dict[str, Any]) -> M:
+    """
+    model_construct() that also builds nested models and coerces non-plain
+    field types, for data known to be valid.
+    """
+    values = {}
+    for name, value in data.items():
+        field = model.model_fields.get(name)
+        values[name] = _construct_value(field.annotation, value) if field is not None else value
+    return model.model_construct(**values)
+
+
+def _construct_value(annotation: Any, value: Any) -> Any:
+    if value is None:
+        return None
+
+    origin = get_origin(annotation)
+    if origin is Union or origin is types.UnionType:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _construct_value(args[0], value) if len(args) == 1 else _adapter(annotation).validate_python(value)
+    if origin is Literal:
+        return value
+    if origin is list and isinstance(value, list):
+        args = get_args(annotation)
+        return [_construct_value(args[0], v) for v in value] if args else value
+    if origin is dict and isinstance(value, dict):
+        args = get_args(annotation)
+        return {k: _construct_value(args[1], v) for k, v in value.items()} if args else value
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel) and isinstance(value, dict):
+        return construct(annotation, value)
+    if annotation is datetime and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if annotation in _PLAIN_TYPES:
+        return value
+    return _adapter(annotation).validate_python(value)
+
+
+@lru_cache(maxsize=None)
+def _adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
-import re
 import spacy
 from sentence_transformers import SentenceTransformer, util
 
+from backend.src.services.analyzed_cv import AnalyzedCV
+
 
 class SynonymRecognizer:
     _nlp = None
@@ -25,35 +26,14 @@ class SynonymRecognizer:
             )
         return cls._model
 
-    def __init__(self, text: str, threshold: float = 0.7):
+    def __init__(self, text: Union[str, AnalyzedCV], threshold: float = 0.7):
         self._nlp = self._get_nlp()
         self._model = self._get_model()
         self._threshold = threshold
 
-        self._filtered_tokens: List[Tuple[str, str]] = self._preprocess_text(text)
-
-        if self._filtered_tokens:
-            self._tokens_embedding = self._model.encode(
-                [token[1] for token in self._filtered_tokens],
-                convert_to_tensor=True,
-            )
-        else:
-            self._tokens_embedding = None
-
-    def _preprocess_text(self, text: str) -> List[Tuple[str, str]]:
-        cleaned_text = " ".join(
-            [re.sub(r"[^\w\d\s]", "", token.lower()) for token in text.split()]
-        )
-        doc = self._nlp(cleaned_text)
-
-        return [
-            (token.text, token.lemma_)
-            for token in doc
-            if not token.is_stop
-            and not token.is_punct
-            and not token.is_space
-            and not token.is_digit
-        ]
+        cv = AnalyzedCV.of(text)
+        self._filtered_tokens: List[Tuple[str, str]] = cv.lemmas(self._nlp)
+        self._tokens_embedding = cv.embeddings(self._nlp, self._model)
 
     def find_synonyms(self, word: str) -> List[str]:
         if self._tokens_embedding is None or not self._filtered_tokens:
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import mmap
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional, Union
+
+from fastapi import UploadFile
+
+logger = logging.getLogger(__name__)
+
+class MappedFile(mmap.mmap):
+    """
+    Read-only map of a spooled upload. fileno() gives the mapped file, so the
+    parsing sandbox can pass its descriptor to a worker instead of the bytes.
+    """
+
+    def __new__(cls, fileno: int) -> "MappedFile":
+        mapped = super().__new__(cls, fileno, 0, access=mmap.ACCESS_READ)
+        mapped._fileno = fileno
+        return mapped
+
+    def fileno(self) -> int:
+        return self._fileno
+
+
+ContentBuffer = Union[bytes, mmap.mmap]
+
+SPOOL_THRESHOLD = 1024 * 1024
+_COPY_CHUNK = 1024 * 1024
+
+
+@dataclass
+class IntakeFile:
+    """
+    Uploaded CV kept in its spooled file instead of a bytes copy.
+
+    Starlette already spools multipart bodies to disk past 1 MB; small files
+    stay in memory and are handed out as bytes, larger ones are memory-mapped.
+    A SpooledTemporaryFile rolls over once its size exceeds spool_threshold,
+    so the size alone tells which of the two it is.
+    """
+    filename: Optional[str]
+    content_type: Optional[str]
+    size: int
+    file: BinaryIO
+    spool_threshold: int = SPOOL_THRESHOLD
+
+    @classmethod
+    def from_upload(cls, upload: UploadFile) -> "IntakeFile":
+        size = upload.size
+        if size is None:
+            size = upload.file.seek(0, io.SEEK_END)
+        return cls(
+            filename=upload.filename,
+            content_type=upload.content_type,
+            size=size,
+            file=upload.file,
+        )
+
+    @property
+    def in_memory(self) -> bool:
+        return isinstance(self.file, io.BytesIO) or self.size <= self.spool_threshold
+
+    @contextmanager
+    def open_buffer(self) -> Iterator[ContentBuffer]:
+        if self.in_memory or self.size == 0:
+            self.file.seek(0)
+            yield self.file.read()
+            return
+
+        mapped = MappedFile(self.file.fileno())
+        try:
+            yield mapped
+        finally:
+            try:
+                mapped.close()
+            except BufferError:
+                logger.debug("Buffer of %s still referenced; leaving unmap to GC", self.filename)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+async def spool_upload(upload: UploadFile, *, threshold: int = SPOOL_THRESHOLD) -> IntakeFile:
+    """Copies an upload into a spooled file owned by the caller, chunk by chunk."""
+    spooled = tempfile.SpooledTemporaryFile(max_size=threshold)
+    size = 0
+    await upload.seek(0)
+    while True:
+        chunk = await upload.read(_COPY_CHUNK)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > threshold:
+            await asyncio.to_thread(spooled.write, chunk)
+        else:
+            spooled.write(chunk)
+
+    return IntakeFile(
+        filename=upload.filename,
+        content_type=upload.content_type,
+        size=size,
+        file=spooled,
+        spool_threshold=threshold,
+    )
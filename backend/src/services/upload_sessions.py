@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+from backend.src.config.settings.ingestion import IngestionSettings
+from backend.src.services.cv_ingestion import (
+    create_parsing_service,
+    ingest_as_completed,
+    load_jobs,
+    summarize_results,
+)
+from backend.src.services.cv_processing import CandidateProcessingResult
+from backend.src.services.upload_intake import IntakeFile
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class UploadOffsetMismatch(Exception):
+    """A chunk did not start where the stored part of the file ends."""
+
+    def __init__(self, offset: int):
+        super().__init__(f"Expected offset {offset}.")
+        self.offset = offset
+
+
+class UploadStateError(Exception):
+    """The session or file is not in a state that allows the operation."""
+
+
+@dataclass
+class SessionFile:
+    id: str
+    filename: str
+    content_type: str
+    size: int
+    path: str
+    expected_sha256: Optional[str] = None
+    offset: int = 0
+    status: str = "uploading"  # uploading -> queued -> processed | failed, or duplicate
+    duplicate_of: Optional[str] = None
+    candidate_id: Optional[str] = None
+    sha256: Optional[str] = None
+    _hash: Any = field(default_factory=hashlib.sha256, repr=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    def to_view(self) -> Dict[str, Any]:
+        return {
+            "file_id": self.id,
+            "file_name": self.filename,
+            "size": self.size,
+            "offset": self.offset,
+            "status": self.status,
+            "duplicate_of": self.duplicate_of,
+            "candidate_id": self.candidate_id,
+        }
+
+
+@dataclass
+class UploadSession:
+    id: str
+    top_n: int
+    priority: str
+    directory: str
+    status: str = "open"  # open -> completing -> done
+    files: Dict[str, SessionFile] = field(default_factory=dict)
+    results: List[CandidateProcessingResult] = field(default_factory=list)
+    last_activity: float = field(default_factory=time.time)
+    _queue: asyncio.Queue = field(default_factory=asyncio.Queue, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def to_view(self) -> Dict[str, Any]:
+        view: Dict[str, Any] = {
+            "session_id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "files": [f.to_view() for f in self.files.values()],
+        }
+        view.update(summarize_results(self.results, self.top_n))
+        return view
+
+
+class UploadSessionManager:
+    """
+    Resumable uploads: a client opens a session, registers files, sends each
+    file in chunks at explicit offsets and finalizes it. A dropped connection
+    only costs the chunk in flight; the client asks for the offset and goes on.
+
+    Finalized files go straight into the session's ingestion pipeline run,
+    which lives until the session is completed or expires. Files are
+    deduplicated by the SHA-256 computed from the received bytes across all
+    live sessions, so a re-sent CV is not processed twice. duplicate_of only
+    names files of the same session.
+    """
+
+    def __init__(self, *, root_dir: Optional[str] = None, ttl_s: int = 24 * 60 * 60, max_chunk_bytes: int = 16 * 1024 * 1024):
+        self._root_dir = root_dir
+        self._ttl_s = ttl_s
+        self.max_chunk_bytes = max_chunk_bytes
+        self._sessions: Dict[str, UploadSession] = {}
+        self._by_sha256: Dict[str, Tuple[str, str]] = {}
+        self._closing: Set[asyncio.Task] = set()
+
+    def create_session(self, *, top_n: int, priority: str) -> UploadSession:
+        self._evict_expired()
+        if self._root_dir:
+            os.makedirs(self._root_dir, exist_ok=True)
+        session = UploadSession(
+            id=str(uuid.uuid4()),
+            top_n=top_n,
+            priority=priority,
+            directory=tempfile.mkdtemp(prefix="cv-upload-", dir=self._root_dir),
+        )
+        self._sessions[session.id] = session
+        return session
+
+    def get_session(self, session_id: str) -> UploadSession:
+        self._evict_expired()
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        session.last_activity = time.time()
+        return session
+
+    def get_file(self, session_id: str, file_id: str) -> SessionFile:
+        session = self.get_session(session_id)
+        session_file = session.files.get(file_id)
+        if session_file is None:
+            raise KeyError(file_id)
+        return session_file
+
+    def add_file(
+        self,
+        session_id: str,
+        *,
+        filename: str,
+        content_type: str,
+        size: int,
+        sha256: Optional[str] = None,
+    ) -> SessionFile:
+        session = self.get_session(session_id)
+        if session.status != "open":
+            raise UploadStateError("Session no longer accepts files.")
+
+        file_id = str(uuid.uuid4())
+        session_file = SessionFile(
+            id=file_id,
+            filename=filename,
+            content_type=content_type,
+            size=size,
+            path=os.path.join(session.directory, file_id),
+            expected_sha256=sha256.lower() if sha256 else None,
+        )
+        open(session_file.path, "wb").close()
+        session.files[file_id] = session_file
+        return session_file
+
+    async def write_chunk(self, session_id: str, file_id: str, offset: int, chunks: AsyncIterator[bytes]) -> SessionFile:
+        """
+        Appends a chunk that starts at offset. Bytes received before a dropped
+        connection are kept, so the next chunk resumes from the stored offset.
+        """
+        session_file = self.get_file(session_id, file_id)
+        async with session_file._lock:
+            if session_file.status != "uploading":
+                raise UploadStateError(f"File is {session_file.status}.")
+            if offset != session_file.offset:
+                raise UploadOffsetMismatch(session_file.offset)
+
+            received = 0
+            f = await _in_thread(open, session_file.path, "ab")
+            try:
+                async for data in chunks:
+                    received += len(data)
+                    if received > self.max_chunk_bytes or session_file.offset + len(data) > session_file.size:
+                        raise UploadStateError("Chunk exceeds the chunk limit or the declared file size.")
+                    await _in_thread(_append, session_file, f, data)
+            finally:
+                await _in_thread(f.close)
+        return session_file
+
+    async def finalize(self, session_id: str, file_id: str) -> SessionFile:
+        session = self.get_session(session_id)
+        session_file = self.get_file(session_id, file_id)
+        async with session_file._lock:
+            if session_file.status != "uploading":
+                return session_file
+            if session.status != "open":
+                # The pipeline run only takes files until the session is completed.
+                raise UploadStateError("Session no longer accepts files.")
+            if session_file.offset != session_file.size:
+                raise UploadOffsetMismatch(session_file.offset)
+
+            digest = session_file._hash.hexdigest()
+            if session_file.expected_sha256 and digest != session_file.expected_sha256:
+                raise UploadStateError("SHA-256 of the uploaded file does not match.")
+            session_file.sha256 = digest
+
+            if self._mark_duplicate(session, session_file, digest):
+                _remove(session_file.path)
+                return session_file
+
+            self._by_sha256[digest] = (session.id, session_file.id)
+            session_file.status = "queued"
+            session._queue.put_nowait((session_file, _open_intake(session_file)))
+            self._ensure_running(session)
+        return session_file
+
+    def complete(self, session_id: str) -> UploadSession:
+        """No more files will come; the session finishes once queued files are processed."""
+        session = self.get_session(session_id)
+        if session.status == "open":
+            session.status = "completing"
+            session._queue.put_nowait(None)
+            if session._task is None:
+                session.status = "done"
+        return session
+
+    async def stop(self) -> None:
+        while self._sessions:
+            _, session = self._sessions.popitem()
+            await self._close(session)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def _mark_duplicate(self, session: UploadSession, session_file: SessionFile, digest: str) -> bool:
+        original = self._by_sha256.get(digest)
+        if original is None:
+            return False
+        original_session_id, original_file_id = original
+        session_file.status = "duplicate"
+        # Ids of another client's session are not given out.
+        session_file.duplicate_of = original_file_id if original_session_id == session.id else None
+        session_file.sha256 = digest
+        logger.info(
+            "Duplicate CV upload skipped",
+            extra={
+                "event": "cv_upload_duplicate",
+                "file_name": session_file.filename,
+                "session_id": session.id,
+                "duplicate_of": original_file_id,
+            },
+        )
+        return True
+
+    def _ensure_running(self, session: UploadSession) -> None:
+        if session._task is None:
+            session._task = asyncio.create_task(self._run(session), name=f"upload-session-{session.id}")
+
+    async def _run(self, session: UploadSession) -> None:
+        files_by_intake: Dict[int, SessionFile] = {}
+
+        async def source() -> AsyncIterator[IntakeFile]:
+            while True:
+                item = await session._queue.get()
+                if item is None:
+                    return
+                session_file, intake = item
+                files_by_intake[id(intake)] = session_file
+                yield intake
+
+        try:
+            parsing_service = create_parsing_service()
+            jobs = await load_jobs()
+            async for intake, result in ingest_as_completed(
+                source(), parsing_service, jobs, priority=session.priority
+            ):
+                intake.close()
+                session_file = files_by_intake.pop(id(intake))
+                if result is None:
+                    session_file.status = "failed"
+                    # A failed file must not block a retry of the same content.
+                    self._by_sha256.pop(session_file.sha256, None)
+                else:
+                    session_file.status = "processed"
+                    session_file.candidate_id = result.record.id
+                    session.results.append(result)
+        except Exception:
+            logger.exception(
+                "Upload session ingestion failed",
+                extra={"event": "cv_upload_session_error", "session_id": session.id},
+            )
+            for session_file in session.files.values():
+                if session_file.status == "queued":
+                    session_file.status = "failed"
+        finally:
+            session.status = "done"
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        for session in list(self._sessions.values()):
+            if now - session.last_activity > self._ttl_s:
+                del self._sessions[session.id]
+                task = asyncio.ensure_future(self._close(session))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+
+    async def _close(self, session: UploadSession) -> None:
+        if session._task is not None:
+            session._task.cancel()
+            await asyncio.gather(session._task, return_exceptions=True)
+        while not session._queue.empty():
+            item = session._queue.get_nowait()
+            if item is not None:
+                item[1].close()
+        for session_file in session.files.values():
+            if session_file.sha256 and self._by_sha256.get(session_file.sha256) == (session.id, session_file.id):
+                del self._by_sha256[session_file.sha256]
+        shutil.rmtree(session.directory, ignore_errors=True)
+
+
+def _open_intake(session_file: SessionFile) -> IntakeFile:
+    f = open(session_file.path, "rb")
+    # The open handle keeps the data; the directory entry is no longer needed.
+    _remove(session_file.path)
+    return IntakeFile(
+        filename=session_file.filename,
+        content_type=session_file.content_type,
+        size=session_file.size,
+        file=f,
+    )
+
+
+async def _in_thread(func: Callable[..., T], *args) -> T:
+    """
+    asyncio.to_thread that, when cancelled, still waits for the call to end,
+    so the file and the hash never run ahead of the recorded offset.
+    """
+    call = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.shield(call)
+    except asyncio.CancelledError:
+        await asyncio.wait({call})
+        raise
+
+
+def _append(session_file: SessionFile, f: BinaryIO, data: bytes) -> None:
+    f.write(data)
+    session_file._hash.update(data)
+    session_file.offset += len(data)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=1)
+def get_upload_sessions() -> UploadSessionManager:
+    settings = IngestionSettings()
+    return UploadSessionManager(
+        root_dir=settings.INGESTION_UPLOAD_SESSION_DIR,
+        ttl_s=settings.INGESTION_UPLOAD_SESSION_TTL_SECONDS,
+        max_chunk_bytes=settings.INGESTION_UPLOAD_MAX_CHUNK_MB * 1024 * 1024,
+    )
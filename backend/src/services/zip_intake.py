@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import mimetypes
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, List, Optional
+
+from backend.src.services.upload_intake import SPOOL_THRESHOLD, IntakeFile
+from backend.src.utils.file_validation import allowed_MIME, max_size
+
+logger = logging.getLogger(__name__)
+
+_COPY_CHUNK = 256 * 1024
+_EXT_TO_MIME = {ext: mime for mime, ext in allowed_MIME.items()}
+
+
+class ZipArchiveRejected(Exception):
+    """The archive as a whole is unreadable or exceeds the intake limits."""
+
+
+@dataclass(frozen=True)
+class ZipLimits:
+    max_entries: int = 1000
+    max_total_bytes: int = 1024 * 1024 * 1024
+    max_entry_bytes: int = max_size
+    max_ratio: float = 100.0
+
+
+@dataclass
+class SkippedEntry:
+    file_name: str
+    reason: str
+
+
+def guess_content_type(filename: str) -> Optional[str]:
+    ext = os.path.splitext(filename)[1].lower()
+    return _EXT_TO_MIME.get(ext) or mimetypes.guess_type(filename)[0]
+
+
+def _is_metadata(name: str) -> bool:
+    return name.startswith("__MACOSX/") or os.path.basename(name).startswith(".")
+
+
+class ZipIntake:
+    """
+    Reads CVs straight out of an uploaded ZIP, one entry at a time, without
+    unpacking the archive. Each entry is copied into its own spooled file only
+    when the pipeline asks for it.
+
+    Zip bomb protection: the central directory is checked up front (entry count,
+    declared total size, per-entry size and compression ratio), and the actual
+    decompressed bytes are counted while reading, so a lying header cannot
+    make an entry bigger than declared.
+    """
+
+    def __init__(self, file: BinaryIO, limits: ZipLimits = ZipLimits()):
+        self._limits = limits
+        try:
+            self._zip = zipfile.ZipFile(file)
+        except (zipfile.BadZipFile, OSError) as e:
+            raise ZipArchiveRejected(f"Not a valid ZIP archive: {e}") from e
+
+        self.skipped: List[SkippedEntry] = []
+        self.entries: List[zipfile.ZipInfo] = []
+        try:
+            self._scan()
+        except ZipArchiveRejected:
+            self._zip.close()
+            raise
+
+    def _scan(self) -> None:
+        infos = [i for i in self._zip.infolist() if not i.is_dir()]
+        # Metadata added by archivers (macOS resource forks, dot files) does not count towards the limit.
+        counted = sum(1 for i in infos if not _is_metadata(i.filename))
+        if counted > self._limits.max_entries:
+            raise ZipArchiveRejected(
+                f"Archive has {counted} entries, the limit is {self._limits.max_entries}."
+            )
+
+        declared_total = 0
+        for info in infos:
+            name = info.filename
+            base = os.path.basename(name)
+            if _is_metadata(name):
+                self._skip(name, "System metadata file.")
+                continue
+            if os.path.splitext(base)[1].lower() not in _EXT_TO_MIME:
+                self._skip(name, "Unsupported file type.")
+                continue
+            if info.flag_bits & 0x1:
+                self._skip(name, "Encrypted entry.")
+                continue
+            if info.file_size > self._limits.max_entry_bytes:
+                self._skip(name, "Wrong file size.")
+                continue
+            if info.compress_size and info.file_size / info.compress_size > self._limits.max_ratio:
+                self._skip(name, "Suspicious compression ratio.")
+                continue
+
+            declared_total += info.file_size
+            self.entries.append(info)
+
+        if declared_total > self._limits.max_total_bytes:
+            raise ZipArchiveRejected(
+                f"Archive unpacks to {declared_total} bytes, the limit is {self._limits.max_total_bytes}."
+            )
+
+    def _skip(self, name: str, reason: str) -> None:
+        logger.warning(
+            "ZIP entry skipped",
+            extra={"event": "cv_zip_entry_skipped", "file_name": name, "reason": reason},
+        )
+        self.skipped.append(SkippedEntry(file_name=name, reason=reason))
+
+    def _extract(self, info: zipfile.ZipInfo) -> Optional[IntakeFile]:
+        # Never trust the header: read at most the declared size + 1 byte.
+        limit = info.file_size
+        spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_THRESHOLD)
+        size = 0
+        try:
+            with self._zip.open(info) as entry:
+                while True:
+                    chunk = entry.read(min(_COPY_CHUNK, limit + 1 - size))
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > limit:
+                        raise ZipArchiveRejected("Entry is larger than declared.")
+                    spooled.write(chunk)
+        except ZipArchiveRejected as e:
+            spooled.close()
+            self._skip(info.filename, str(e))
+            return None
+        except (zipfile.BadZipFile, OSError, EOFError, NotImplementedError) as e:
+            spooled.close()
+            self._skip(info.filename, f"Unreadable entry: {e}")
+            return None
+
+        spooled.seek(0)
+        filename = os.path.basename(info.filename)
+        return IntakeFile(
+            filename=filename,
+            content_type=guess_content_type(filename),
+            size=size,
+            file=spooled,
+        )
+
+    async def iter_files(self) -> AsyncIterator[IntakeFile]:
+        """Yields entries lazily; decompression runs off the event loop."""
+        for info in self.entries:
+            intake = await asyncio.to_thread(self._extract, info)
+            if intake is not None:
+                yield intake
+
+    def close(self) -> None:
+        self._zip.close()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Offline batch processing of a directory of CVs, without the HTTP API.
+
+Parses, extracts, selects and scores every PDF/DOCX under a directory across
+a pool of worker processes and appends the results to candidates.json in bulk.
+CV files are archived to Drive right before their batch is stored.
+Progress is checkpointed, so an interrupted run continues where it stopped.
+
+Usage:
+    python -m backend.src.utils.batch_process_cvs test_CVs/ --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Set
+
+from backend.src.config.logging_config import configure_logging
+from backend.src.models.job_offers_model import JobOffer
+from backend.src.services.candidate_storage import CandidateRecord, GoogleDriveCandidateStore
+from backend.src.services.cv_ingestion import load_jobs, parsing_settings
+from backend.src.services.cv_processing import CandidateAnalysis, analyze_cv, parse_cv
+from backend.src.services.cv_storage import delete_cv_from_drive, save_cv_stream_to_drive
+from backend.src.services.document_parsing import DocumentParsingService
+from backend.src.services.storage_format import construct
+from backend.src.services.zip_intake import guess_content_type
+from backend.src.utils.file_validation import allowed_MIME, validate_upload
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = ".cv_batch_checkpoint.jsonl"
+
+
+@dataclass
+class FileOutcome:
+    path: str
+    size: int
+    status: str  # "analyzed", "rejected" or "failed"
+    analysis: Optional[CandidateAnalysis] = None
+    error: Optional[str] = None
+    parse_s: float = 0.0
+    analyze_s: float = 0.0
+
+
+_worker: Dict[str, object] = {}
+
+
+def _init_worker(jobs_data: List[dict]) -> None:
+    configure_logging()
+    _worker["parsing_service"] = DocumentParsingService(max_pages=parsing_settings.PARSER_MAX_PAGES)
+    # Dumped from validated offers by the parent process.
+    _worker["jobs"] = [construct(JobOffer, j) for j in jobs_data]
+
+
+def _process_path(path: str) -> FileOutcome:
+    filename = os.path.basename(path)
+    content_type = guess_content_type(filename)
+    try:
+        size = os.path.getsize(path)
+        is_valid, info = validate_upload(size, filename, content_type)
+        if not is_valid:
+            return FileOutcome(path=path, size=size, status="rejected", error=info)
+
+        with open(path, "rb") as f:
+            content = f.read()
+
+        started = time.perf_counter()
+        cv_text = parse_cv(content, filename, content_type, _worker["parsing_service"])
+        parsed = time.perf_counter()
+        analysis = analyze_cv(cv_text, _worker["jobs"], filename)
+        analyzed = time.perf_counter()
+
+        return FileOutcome(
+            path=path,
+            size=size,
+            status="analyzed",
+            analysis=analysis,
+            parse_s=parsed - started,
+            analyze_s=analyzed - parsed,
+        )
+    except Exception as e:
+        return FileOutcome(path=path, size=0, status="failed", error=f"{type(e).__name__}: {e}")
+
+
+def _archive(path: str) -> str:
+    filename = os.path.basename(path)
+    with open(path, "rb") as f:
+        return save_cv_stream_to_drive(f, filename, guess_content_type(filename))
+
+
+def iter_cv_paths(root: str) -> Iterator[str]:
+    extensions = set(allowed_MIME.values())
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if os.path.splitext(name)[1].lower() in extensions:
+                yield os.path.join(dirpath, name)
+
+
+class Checkpoint:
+    """
+    Append-only JSON lines file of finished paths. A path is written only after
+    its candidate is stored, so stored and rejected files are never repeated;
+    failed ones are retried on the next run.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load_done(self) -> Set[str]:
+        done: Set[str] = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line after a crash
+                if entry.get("status") in ("stored", "rejected"):
+                    done.add(entry["path"])
+        return done
+
+    def record(self, entries: List[dict]) -> None:
+        with open(self.path, "a+b") as f:
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Close a line torn by a crash, so the first new entry is not glued to it.
+                    f.write(b"\n")
+            for entry in entries:
+                f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+@dataclass
+class RunStats:
+    total: int = 0
+    skipped: int = 0
+    stored: int = 0
+    rejected: int = 0
+    failed: int = 0
+    bytes: int = 0
+    parse_s: float = 0.0
+    analyze_s: float = 0.0
+
+    def summary(self, elapsed_s: float) -> str:
+        done = self.stored + self.rejected + self.failed
+        rate = done / elapsed_s if elapsed_s > 0 else 0.0
+        mb_rate = self.bytes / (1024 * 1024) / elapsed_s if elapsed_s > 0 else 0.0
+        per_file = (self.parse_s + self.analyze_s) / self.stored if self.stored else 0.0
+        return (
+            f"files: {self.total} (skipped from checkpoint: {self.skipped}), "
+            f"stored: {self.stored}, rejected: {self.rejected}, failed: {self.failed}; "
+            f"elapsed: {elapsed_s:.1f}s, throughput: {rate:.2f} files/s, {mb_rate:.2f} MB/s; "
+            f"parse: {self.parse_s:.1f}s, analyze: {self.analyze_s:.1f}s of worker time "
+            f"({per_file:.2f}s per stored CV)"
+        )
+
+
+class BatchProcessor:
+    def __init__(self, *, workers: int, flush_every: int, checkpoint: Checkpoint, archive: bool):
+        self.workers = workers
+        self.flush_every = flush_every
+        self.checkpoint = checkpoint
+        self.archive = archive
+        self.stats = RunStats()
+        self._store: Optional[GoogleDriveCandidateStore] = None
+        self._pending_records: List[CandidateRecord] = []
+        self._pending_entries: List[dict] = []
+        # Candidate id -> CV path, archived to Drive when its batch is stored.
+        self._pending_paths: Dict[str, str] = {}
+
+    def run(self, root: str, jobs: List[JobOffer]) -> RunStats:
+        done = self.checkpoint.load_done()
+        paths = []
+        for path in iter_cv_paths(root):
+            self.stats.total += 1
+            if os.path.relpath(path, root) in done:
+                self.stats.skipped += 1
+            else:
+                paths.append(path)
+
+        logger.info("Processing %d CV files (%d already done)", len(paths), self.stats.skipped)
+        if not paths:
+            return self.stats
+
+        jobs_data = [j.model_dump() for j in jobs]
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(self.workers, initializer=_init_worker, initargs=(jobs_data,)) as pool:
+            try:
+                for outcome in pool.imap_unordered(_process_path, paths, chunksize=4):
+                    self._handle(root, outcome)
+            finally:
+                self._flush()
+        return self.stats
+
+    def _handle(self, root: str, outcome: FileOutcome) -> None:
+        rel_path = os.path.relpath(outcome.path, root)
+        self.stats.bytes += outcome.size
+
+        if outcome.status == "rejected":
+            self.stats.rejected += 1
+            self._pending_entries.append({"path": rel_path, "status": "rejected", "reason": outcome.error})
+        elif outcome.status == "failed":
+            self.stats.failed += 1
+            logger.error("Processing %s failed: %s", rel_path, outcome.error)
+            self._pending_entries.append({"path": rel_path, "status": "failed", "reason": outcome.error})
+        else:
+            self.stats.parse_s += outcome.parse_s
+            self.stats.analyze_s += outcome.analyze_s
+            analysis = outcome.analysis
+            record = CandidateRecord(
+                id=str(uuid.uuid4()),
+                profile=analysis.profile,
+                job_matches=analysis.job_matches,
+                global_rejection_reason=analysis.global_rejection_reason,
+            )
+            self._pending_records.append(record)
+            self._pending_paths[record.id] = outcome.path
+            self._pending_entries.append({"path": rel_path, "status": "stored", "candidate_id": record.id})
+
+        if len(self._pending_entries) >= self.flush_every:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.archive and self._pending_records:
+            self._archive_pending()
+        if self._pending_records:
+            if self._store is None:
+                self._store = GoogleDriveCandidateStore()
+            try:
+                self._store.append_candidates(self._pending_records)
+            except BaseException:
+                # The rerun archives these files again; do not leave the first copies behind.
+                for record in self._pending_records:
+                    if record.cv_drive_file_id:
+                        self._delete_archived(record.cv_drive_file_id)
+                raise
+            self.stats.stored += len(self._pending_records)
+        self.checkpoint.record(self._pending_entries)
+        self._pending_records = []
+        self._pending_entries = []
+        self._pending_paths = {}
+
+    def _archive_pending(self) -> None:
+        """
+        Uploads the CVs of the pending records right before they are stored,
+        so an interrupted run does not leave archived files without a record.
+        A file that cannot be uploaded is failed and retried on the next run.
+        """
+        records = self._pending_records
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            uploads = [executor.submit(_archive, self._pending_paths[r.id]) for r in records]
+
+        entries = {e.get("candidate_id"): e for e in self._pending_entries}
+        archived: List[CandidateRecord] = []
+        for record, upload in zip(records, uploads):
+            try:
+                record.cv_drive_file_id = upload.result()
+                archived.append(record)
+            except Exception as e:
+                path = entries[record.id]["path"]
+                logger.error("Archiving %s to Drive failed: %s", path, e)
+                self.stats.failed += 1
+                entries[record.id].update(status="failed", reason=f"{type(e).__name__}: {e}")
+                del entries[record.id]["candidate_id"]
+        self._pending_records = archived
+
+    @staticmethod
+    def _delete_archived(file_id: str) -> None:
+        try:
+            delete_cv_from_drive(file_id)
+        except Exception as e:
+            logger.error("Could not delete archived CV (id=%s): %s", file_id, e)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Process a directory of CVs without the HTTP API.")
+    parser.add_argument("directory", help="Directory searched recursively for PDF/DOCX files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--flush-every", type=int, default=100, help="Files per bulk write to candidates.json")
+    parser.add_argument("--checkpoint", help=f"Checkpoint file (default: <directory>/{CHECKPOINT_NAME})")
+    parser.add_argument("--no-archive", action="store_true", help="Do not upload CV files to Google Drive")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    root = os.path.abspath(args.directory)
+    if not os.path.isdir(root):
+        logger.error("%s is not a directory", root)
+        return 2
+
+    jobs = asyncio.run(load_jobs())
+    processor = BatchProcessor(
+        workers=max(1, args.workers),
+        flush_every=max(1, args.flush_every),
+        checkpoint=Checkpoint(args.checkpoint or os.path.join(root, CHECKPOINT_NAME)),
+        archive=not args.no_archive,
+    )
+
+    started = time.perf_counter()
+    try:
+        stats = processor.run(root, jobs)
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; progress up to the last flush is saved in the checkpoint")
+        stats = processor.stats
+    logger.info("Batch finished – %s", stats.summary(time.perf_counter() - started))
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Builds the name gazetteer used by CandidateExtractor from a tab-separated
+dump of the SGJP dictionary (the dictionary Morfeusz is generated from).
+
+Each dump line is: form, lemma, tag, classification, qualifiers. Nominative
+forms classified as "imię" or "nazwisko" are kept; forms that also occur as
+another kind of word are flagged as ambiguous.
+
+Usage:
+    python -m backend.src.utils.build_name_gazetteer sgjp-20241201.tab
+    python -m backend.src.utils.build_name_gazetteer sgjp.tab -o /opt/cv/names.gaz
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+from backend.src.config.logging_config import configure_logging
+from backend.src.services.candidate_extraction.name_gazetteer import (
+    AMBIGUOUS,
+    DEFAULT_PATH,
+    FIRST_NAME,
+    SURNAME,
+    NameGazetteer,
+    normalize,
+)
+
+logger = logging.getLogger(__name__)
+
+NAME_CLASSES = {"imię": FIRST_NAME, "nazwisko": SURNAME}
+_TAG_SPLIT_RE = re.compile(r"[:.]")
+
+
+def _rows(path: str) -> Iterator[Tuple[str, str, str]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 4:
+                continue
+            yield cols[0], cols[2], cols[3]
+
+
+def _name_flags(classification: str) -> int:
+    flags = 0
+    for name in classification.split("|"):
+        flags |= NAME_CLASSES.get(name.strip(), 0)
+    return flags
+
+
+def collect_names(path: str) -> Dict[str, int]:
+    """Two passes, so the common vocabulary never has to be held in memory."""
+    names: Dict[str, int] = {}
+    for form, tag, classification in _rows(path):
+        flags = _name_flags(classification)
+        if flags and "nom" in _TAG_SPLIT_RE.split(tag):
+            key = normalize(form)
+            names[key] = names.get(key, 0) | flags
+
+    for form, tag, classification in _rows(path):
+        if _name_flags(classification):
+            continue
+        key = normalize(form)
+        if key in names:
+            names[key] |= AMBIGUOUS
+    return names
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the first-name/surname gazetteer from an SGJP dump.")
+    parser.add_argument("dump", help="SGJP tab-separated dictionary dump")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_PATH), help="output file (default: %(default)s)")
+    args = parser.parse_args()
+
+    configure_logging()
+    names = collect_names(args.dump)
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    count = NameGazetteer.write(args.output, names.items())
+    ambiguous = sum(1 for flags in names.values() if flags & AMBIGUOUS)
+    logger.info("Wrote %d name forms (%d ambiguous) to %s", count, ambiguous, args.output)
+
+
+if __name__ == "__main__":
+    main()
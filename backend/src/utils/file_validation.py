@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
 allowed_MIME = {
     "application/pdf": ".pdf",
@@ -8,10 +8,16 @@ allowed_MIME = {
 max_size = 1024 * 1024 * 50  # 50 MB
 
 
-def validate_file(file_bytes: bytes, filename: str, content_type: str) -> Tuple[bool, str]:
+def validate_upload(size: Optional[int], filename: str, content_type: str) -> Tuple[bool, str]:
+    """
+    Validates file metadata only. size comes from the spooled multipart part,
+    so this limit is checked after the body was received; a rejected file is
+    never copied, parsed or archived. Oversized requests as a whole are
+    refused from Content-Length before reading (see routes.upload_route).
+    """
     message = f"{filename}: "
     valid = True
-    if len(file_bytes) > max_size:
+    if size is None or size > max_size:
         message += "Wrong file size. "
         valid = False
     if content_type not in allowed_MIME:
@@ -22,3 +28,4 @@ def validate_file(file_bytes: bytes, filename: str, content_type: str) -> Tuple[
         message += "OK"
 
     return valid, message
+
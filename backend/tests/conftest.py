@@ -1,6 +1,22 @@
 from pathlib import Path
+import os
 import sys
 
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+# Some modules load Config() on import; tests never reach Drive or SMTP.
+for name, value in {
+    "GOOGLE_DRIVE_CLIENT_ID": "test",
+    "GOOGLE_DRIVE_CLIENT_SECRET": "test",
+    "GOOGLE_DRIVE_DIR_ID": "test",
+    "GOOGLE_REFRESH_TOKEN": "test",
+    "GOOGLE_KEY": "test",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+    "SMTP_USER": "test",
+    "SMTP_PASSWORD": "test",
+    "SMTP_EMAIL": "test@example.com",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+morfeusz2 = pytest.importorskip("morfeusz2")
+
+from backend.src.services.analyzed_cv import AnalyzedCV
+from backend.src.services.candidate_extraction.candidate_extractor import CandidateExtractor, Segment
+from backend.src.services.document_parsing import DocumentParsingService
+
+CV_DIR = Path(__file__).resolve().parents[5] / "test_CVs"
+CV_PATHS = sorted(CV_DIR.glob("pdf/*.pdf")) + sorted(CV_DIR.glob("docx/*.docx"))
+
+
+def _whole_text_segments(lines: List[str]) -> List[Segment]:
+    """Segments as name extraction built them before tokens were analysed one by one."""
+    analyses = morfeusz2.Morfeusz().analyse("\n".join(lines[:10]))
+    by_position = {}
+    for start, end, analysis in analyses:
+        orth, _, tag, labels, *_ = analysis
+        _, tags, all_labels = by_position.setdefault((start, end), (orth, [], []))
+        tags.append(tag)
+        all_labels.extend(labels or [])
+    return [(orth, tuple(tags), tuple(labels)) for _, (orth, tags, labels) in sorted(by_position.items())]
+
+
+@pytest.mark.parametrize("path", CV_PATHS, ids=lambda p: p.name)
+def test_per_token_analysis_finds_the_same_names_as_whole_text(path: Path):
+    text = DocumentParsingService().extract_text(path.read_bytes(), filename=path.name).text
+    lines = AnalyzedCV(text).lines
+    extractor = CandidateExtractor()
+
+    expected = extractor._name_from_segments(_whole_text_segments(lines))
+
+    assert extractor._extract_with_morfeusz(lines) == expected
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.src.services.candidate_extraction import candidate_extractor
+from backend.src.services.candidate_extraction.candidate_extractor import CandidateExtractor
+from backend.src.services.candidate_extraction.name_gazetteer import (
+    AMBIGUOUS,
+    FIRST_NAME,
+    SURNAME,
+    NameGazetteer,
+)
+from backend.src.utils.build_name_gazetteer import collect_names
+
+
+ENTRIES = [
+    ("Jan", FIRST_NAME),
+    ("Anna", FIRST_NAME),
+    ("Łucja", FIRST_NAME),
+    ("Róża", FIRST_NAME | AMBIGUOUS),
+    ("Kowalski", SURNAME),
+    ("Żak", SURNAME),
+    ("Kowal", SURNAME | AMBIGUOUS),
+    ("Nowak", SURNAME),
+    ("nowak", FIRST_NAME),
+]
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    path = tmp_path / "names.gaz"
+    NameGazetteer.write(path, ENTRIES)
+    sut = NameGazetteer(path)
+    yield sut
+    sut.close()
+
+
+def test_lookup_is_case_insensitive_and_merges_flags(gazetteer: NameGazetteer):
+    assert len(gazetteer) == 8
+    assert gazetteer.lookup("JAN") == FIRST_NAME
+    assert gazetteer.lookup("łucja") == FIRST_NAME
+    assert gazetteer.lookup("Żak") == SURNAME
+    assert gazetteer.lookup("Nowak") == SURNAME | FIRST_NAME
+    assert gazetteer.lookup("Róża") & AMBIGUOUS
+
+
+@pytest.mark.parametrize("form", ["", "Ja", "Janek", "Aaa", "Źdźbło", "zzz"])
+def test_lookup_misses_unknown_forms(gazetteer: NameGazetteer, form: str):
+    assert gazetteer.lookup(form) == 0
+
+
+def test_rejects_files_without_magic(tmp_path):
+    path = tmp_path / "names.gaz"
+    path.write_bytes(b"not a gazetteer")
+
+    with pytest.raises(ValueError):
+        NameGazetteer(path)
+
+
+def test_extractor_uses_unambiguous_names(gazetteer: NameGazetteer, monkeypatch):
+    monkeypatch.setattr(candidate_extractor, "get_name_gazetteer", lambda: gazetteer)
+    monkeypatch.setattr(candidate_extractor, "morfeusz2", None)
+    sut = CandidateExtractor()
+
+    profile = sut.extract("Curriculum Vitae\nAnna Kowalski, programistka\nanna@example.com")
+
+    assert (profile.name, profile.surname) == ("Anna", "Kowalski")
+
+
+def test_extractor_leaves_ambiguous_names_to_morfeusz(gazetteer: NameGazetteer, monkeypatch):
+    monkeypatch.setattr(candidate_extractor, "get_name_gazetteer", lambda: gazetteer)
+    monkeypatch.setattr(candidate_extractor, "morfeusz2", object())
+    monkeypatch.setattr(CandidateExtractor, "_extract_with_morfeusz", lambda self, lines: ("Róża", "Nowak"))
+    sut = CandidateExtractor()
+
+    assert sut.extract("CV\nJan Kowal").name == "Róża"
+    assert sut.extract("CV\nJan Żak").name == "Jan"
+
+
+def test_collect_names_from_sgjp_dump(tmp_path):
+    dump = tmp_path / "sgjp.tab"
+    dump.write_text(
+        "# form\tlemma\ttag\tclass\tqualifiers\n"
+        "Jan\tJan\tsubst:sg:nom:m1\timię\t\n"
+        "Jana\tJan\tsubst:sg:gen.acc:m1\timię\t\n"
+        "Kowal\tKowal\tsubst:sg:nom:m1\tnazwisko\t\n"
+        "kowal\tkowal\tsubst:sg:nom:m1\tnazwa_pospolita\t\n"
+        "Róża\tRóża\tsubst:sg:nom.voc:f\timię|nazwisko\t\n",
+        encoding="utf-8",
+    )
+
+    assert collect_names(str(dump)) == {
+        "jan": FIRST_NAME,
+        "kowal": SURNAME | AMBIGUOUS,
+        "róża": FIRST_NAME | SURNAME,
+    }
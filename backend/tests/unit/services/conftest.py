@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import itertools
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+
+class _Request:
+    def __init__(self, run):
+        self._run = run
+
+    def execute(self):
+        return self._run()
+
+
+class FakeDrive:
+    """
+    Drive files() API over an in-memory folder. list returns every file, as a
+    "name contains" query would; fail_creates_after=n lets n creates succeed
+    and fails the rest.
+    """
+
+    def __init__(self) -> None:
+        self.files_by_id: Dict[str, Dict[str, Any]] = {}
+        self.downloads: List[str] = []
+        self.fail_creates_after: Optional[int] = None
+        self._ids = itertools.count(1)
+        self._clock = itertools.count(1)
+
+    def add(self, name: str, content: bytes, app_properties: Optional[Dict[str, str]] = None) -> str:
+        file_id = f"file-{next(self._ids)}"
+        self.files_by_id[file_id] = {
+            "id": file_id,
+            "name": name,
+            "appProperties": app_properties or {},
+            "content": content,
+        }
+        self._touch(file_id)
+        return file_id
+
+    def _touch(self, file_id: str) -> None:
+        self.files_by_id[file_id]["modifiedTime"] = f"2026-10-19T00:00:{next(self._clock):06d}Z"
+
+    def by_name(self, name: str) -> Dict[str, Any]:
+        (f,) = [f for f in self.files_by_id.values() if f["name"] == name]
+        return f
+
+    def names(self) -> List[str]:
+        return sorted(f["name"] for f in self.files_by_id.values())
+
+    def files(self) -> "FakeDrive":
+        return self
+
+    def list(self, **kwargs) -> _Request:
+        listed = [{k: v for k, v in f.items() if k != "content"} for f in self.files_by_id.values()]
+        return _Request(lambda: {"files": listed})
+
+    def create(self, body, media_body, fields=None) -> _Request:
+        def run():
+            if self.fail_creates_after is not None:
+                if self.fail_creates_after == 0:
+                    raise ConnectionResetError("Drive went away")
+                self.fail_creates_after -= 1
+            file_id = self.add(body["name"], media_body.getbytes(0, media_body.size()), body.get("appProperties"))
+            return {"id": file_id, "modifiedTime": self.files_by_id[file_id]["modifiedTime"]}
+
+        return _Request(run)
+
+    def update(self, fileId, body=None, media_body=None, fields=None) -> _Request:
+        def run():
+            f = self.files_by_id[fileId]
+            f.update((body or {}).items())
+            if media_body is not None:
+                f["content"] = media_body.getbytes(0, media_body.size())
+            self._touch(fileId)
+            return {"id": fileId, "modifiedTime": f["modifiedTime"]}
+
+        return _Request(run)
+
+    def delete(self, fileId) -> _Request:
+        return _Request(lambda: self.files_by_id.pop(fileId) and {})
+
+    def download(self, file_id: str) -> bytes:
+        self.downloads.append(self.files_by_id[file_id]["name"])
+        return self.files_by_id[file_id]["content"]
+
+
+@pytest.fixture
+def drive(monkeypatch, drive_module) -> FakeDrive:
+    """A FakeDrive behind the Drive helpers that drive_module, set by each test module, imports."""
+    fake = FakeDrive()
+    monkeypatch.setattr(drive_module, "get_service", lambda: fake)
+    monkeypatch.setattr(drive_module, "resolve_folder", lambda service, name: "folder")
+    monkeypatch.setattr(drive_module, "download_bytes", lambda service, file_id: fake.download(file_id))
+    return fake
@@ -1,9 +1,12 @@
 from __future__ import annotations
+import mmap
 from pathlib import Path
 
 import pytest
 
-from backend.src.services.document_parsing import DocumentParsingService
+from backend.src.services.document_parsing import DocumentParsingService, ExtractionError
+from backend.src.services.document_parsing.parser_registry import ParserRegistry
+from backend.src.services.document_parsing.parsers import DocumentParser
 
 
 TEST_DIR = Path(__file__).resolve().parent
@@ -24,8 +27,8 @@ def expected_text() -> str:
 @pytest.mark.parametrize(
     "bin_path, filename, content_type, expected_parser",
     [
-        (PDF_PATH, "Valid_1.pdf", "application/pdf", {"pdfminer"}),
-        (DOCX_PATH, "Valid_1.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", {"python-docx"})
+        (PDF_PATH, "Valid_1.pdf", "application/pdf", {"pypdfium2", "pdfminer"}),
+        (DOCX_PATH, "Valid_1.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", {"ooxml-stream", "python-docx"})
     ],
 )
 def test_parses_valid_documents(bin_path: Path, filename: str, content_type: str, expected_parser: set[str], expected_text: str):
@@ -41,3 +44,65 @@ def test_parses_valid_documents(bin_path: Path, filename: str, content_type: str
     assert parsed.used_parser in expected_parser
     assert isinstance(parsed.text, str)
     assert parsed.text == expected_text
+
+
+@pytest.mark.parametrize(
+    "bin_path, filename, content_type",
+    [
+        (PDF_PATH, "Valid_1.pdf", "application/pdf"),
+        (DOCX_PATH, "Valid_1.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    ],
+)
+def test_parses_memory_mapped_documents(bin_path: Path, filename: str, content_type: str, expected_text: str):
+    sut = DocumentParsingService()
+
+    with open(bin_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        parsed = sut.extract_text(mapped, filename=filename, content_type=content_type)
+
+    assert parsed.text == expected_text
+
+
+class _StubParser(DocumentParser):
+    def __init__(self, name: str, priority: int, result):
+        self.name = name
+        self.priority = priority
+        self._result = result
+
+    def supports(self, *, mime, ext) -> bool:
+        return mime == "application/pdf"
+
+    def extract_text(self, content: bytes) -> str:
+        if isinstance(self._result, Exception):
+            raise self._result
+        return self._result
+
+
+@pytest.mark.parametrize(
+    "fast_result, expected_parser",
+    [
+        ("Jan Kowalski\nDoświadczenie zawodowe w obróbce drewna", "fast"),
+        (ExtractionError("broken xref"), "slow"),
+        ("   \n", "slow"),
+    ],
+)
+def test_falls_back_to_lower_priority_parser(fast_result, expected_parser: str):
+    registry = ParserRegistry([
+        _StubParser("slow", 10, "Jan Kowalski\nDoświadczenie zawodowe w produkcji rowerów"),
+        _StubParser("fast", 100, fast_result),
+    ])
+    sut = DocumentParsingService(registry)
+
+    parsed = sut.extract_text(b"%PDF-1.7", content_type="application/pdf")
+
+    assert parsed.used_parser == expected_parser
+
+
+def test_raises_when_all_parsers_fail():
+    registry = ParserRegistry([
+        _StubParser("fast", 100, ExtractionError("broken xref")),
+        _StubParser("slow", 10, ExtractionError("broken trailer")),
+    ])
+    sut = DocumentParsingService(registry)
+
+    with pytest.raises(ExtractionError):
+        sut.extract_text(b"%PDF-1.7", content_type="application/pdf")
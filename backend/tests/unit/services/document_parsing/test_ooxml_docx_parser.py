@@ -0,0 +1,73 @@
+from __future__ import annotations
+import io
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+from backend.src.services.document_parsing import ExtractionError
+from backend.src.services.document_parsing.parsers import DocxParser, OoxmlDocxParser
+
+
+DOCX_DIR = Path(__file__).resolve().parents[5] / "test_CVs" / "docx"
+
+
+@pytest.fixture()
+def parser() -> OoxmlDocxParser:
+    return OoxmlDocxParser()
+
+
+@pytest.fixture(scope="module")
+def docx_with_tables() -> bytes:
+    doc = Document()
+    doc.add_paragraph("Jan Kowalski")
+    table = doc.add_table(rows=3, cols=3)
+    table.cell(0, 0).text = "Umiejętność"
+    table.cell(0, 1).text = "Poziom"
+    table.cell(1, 0).text = "Python"
+    table.cell(1, 1).merge(table.cell(1, 2)).text = "zaawansowany"
+    table.cell(1, 0).merge(table.cell(2, 0))
+    table.cell(2, 1).text = "średni"
+    doc.add_paragraph("Doświadczenie\tzawodowe")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "mime,ext,expected",
+    [
+        ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", None, True),
+        (None, ".docx", True),
+        (None, ".DOCX", True),
+
+        ("application/pdf", None, False),
+        (None, ".pdf", False),
+    ],
+)
+def test_ooxml_supports_by_mime_and_ext(parser: OoxmlDocxParser, mime, ext, expected: bool):
+    assert parser.supports(mime=mime, ext=ext) is expected
+
+
+@pytest.mark.parametrize("path", sorted(DOCX_DIR.glob("*.docx")), ids=lambda p: p.name)
+def test_ooxml_matches_python_docx(parser: OoxmlDocxParser, path: Path):
+    content = path.read_bytes()
+    assert parser.extract_text(content) == DocxParser().extract_text(content)
+
+
+def test_ooxml_emits_tables_in_document_order(parser: OoxmlDocxParser, docx_with_tables: bytes):
+    lines = parser.extract_text(docx_with_tables).split("\n")
+
+    assert lines == [
+        "Jan Kowalski",
+        "Umiejętność | Poziom | ",
+        "Python | zaawansowany | zaawansowany",
+        "Python | średni | ",
+        "Doświadczenie\tzawodowe",
+    ]
+    assert sorted(lines) == sorted(DocxParser().extract_text(docx_with_tables).split("\n"))
+
+
+def test_ooxml_raises_for_non_docx(parser: OoxmlDocxParser):
+    with pytest.raises(ExtractionError):
+        parser.extract_text(b"PK\x03\x04 not really a zip")
@@ -0,0 +1,107 @@
+from __future__ import annotations
+import io
+from pathlib import Path
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+
+from backend.src.services.document_parsing import DocumentParsingService, ExtractionError, ParsingSandbox
+from backend.src.services.document_parsing.parser_registry import ParserRegistry
+from backend.src.services.document_parsing.parsers import DocumentParser, PdfiumParser, PdfParser
+
+
+class _BrokenParser(DocumentParser):
+    name = "broken"
+
+    def supports(self, *, mime, ext) -> bool:
+        return True
+
+    def extract_text(self, content: bytes) -> str:
+        raise ExtractionError("broken")
+
+
+PDF_DIR = Path(__file__).resolve().parents[5] / "test_CVs" / "pdf"
+
+
+@pytest.fixture(scope="module")
+def three_page_pdf() -> bytes:
+    writer = PdfWriter()
+    for name in ("Valid_1.pdf", "Valid_2.pdf", "Valid_3.pdf"):
+        for page in PdfReader(PDF_DIR / name).pages:
+            writer.add_page(page)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("parser", [PdfParser(), PdfiumParser()], ids=lambda p: p.name)
+def test_iter_pages_is_page_bounded(parser, three_page_pdf: bytes):
+    if not parser.supports(mime="application/pdf", ext=".pdf"):
+        pytest.skip(f"{parser.name} unavailable")
+
+    all_pages = list(parser.iter_pages(three_page_pdf))
+    first_pages = list(parser.iter_pages(three_page_pdf, max_pages=2))
+
+    assert len(all_pages) == 3
+    assert first_pages == all_pages[:2]
+
+
+@pytest.mark.parametrize("parser", [PdfParser(), PdfiumParser()], ids=lambda p: p.name)
+def test_service_respects_page_budget(parser, three_page_pdf: bytes):
+    if not parser.supports(mime="application/pdf", ext=".pdf"):
+        pytest.skip(f"{parser.name} unavailable")
+    sut = DocumentParsingService(ParserRegistry([parser]))
+
+    full = sut.extract_text(three_page_pdf, content_type="application/pdf")
+    first = sut.extract_text(three_page_pdf, content_type="application/pdf", max_pages=1)
+    all_pages = sut.extract_text(three_page_pdf, content_type="application/pdf", max_pages=3)
+
+    assert full.text.startswith(first.text)
+    assert len(full.text) > len(first.text)
+    assert all_pages.text == full.text
+
+
+@pytest.mark.parametrize("parser", [PdfParser(), PdfiumParser()], ids=lambda p: p.name)
+def test_explicit_zero_overrides_default_budget(parser, three_page_pdf: bytes):
+    if not parser.supports(mime="application/pdf", ext=".pdf"):
+        pytest.skip(f"{parser.name} unavailable")
+    sut = DocumentParsingService(ParserRegistry([parser]), max_pages=1)
+
+    budgeted = sut.extract_text(three_page_pdf, content_type="application/pdf")
+    unlimited = sut.extract_text(three_page_pdf, content_type="application/pdf", max_pages=0)
+
+    assert len(unlimited.text) > len(budgeted.text)
+    assert unlimited.text == DocumentParsingService(ParserRegistry([parser])).extract_text(
+        three_page_pdf, content_type="application/pdf"
+    ).text
+
+
+def test_iter_pages_can_stop_early(three_page_pdf: bytes):
+    pages = PdfParser().iter_pages(three_page_pdf)
+
+    assert "Mariola Bobrowska" in next(pages)
+    pages.close()
+
+
+def test_service_streams_pages_through_the_sandbox(three_page_pdf: bytes):
+    sandbox = ParsingSandbox(workers=1)
+    try:
+        sut = DocumentParsingService(ParserRegistry([PdfParser()]), sandbox=sandbox, max_pages=2)
+        pages = list(sut.iter_pages(three_page_pdf, content_type="application/pdf"))
+        everything = list(sut.iter_pages(three_page_pdf, content_type="application/pdf", max_pages=0))
+    finally:
+        sandbox.close()
+
+    assert len(pages) == 2
+    assert "Mariola Bobrowska" in pages[0]
+    assert pages == everything[:2]
+    assert len(everything) == 3
+
+
+def test_service_pages_fall_back_to_the_next_parser(three_page_pdf: bytes):
+    sut = DocumentParsingService(ParserRegistry([_BrokenParser(), PdfParser()]))
+
+    pages = sut.iter_pages(three_page_pdf, content_type="application/pdf")
+
+    assert "Mariola Bobrowska" in next(pages)
+    pages.close()
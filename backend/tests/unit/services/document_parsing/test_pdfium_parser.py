@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.src.services.document_parsing.parsers import PdfiumParser
+
+pytest.importorskip("pypdfium2")
+
+
+@pytest.fixture()
+def parser() -> PdfiumParser:
+    return PdfiumParser()
+
+
+@pytest.mark.parametrize(
+    "mime,ext,expected",
+    [
+        ("application/pdf", None, True),
+        (None, ".pdf", True),
+        (None, ".PDF", True),
+
+        ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", None, False),
+        (None, ".docx", False),
+
+        ("application/pdf", ".docx", True),
+        ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", ".pdf", False),
+    ],
+)
+def test_pdfium_supports_by_mime_and_ext(parser: PdfiumParser, mime, ext, expected: bool):
+    assert parser.supports(mime=mime, ext=ext) is expected
+
+
+def test_pdfium_outranks_pdfminer(parser: PdfiumParser):
+    from backend.src.services.document_parsing.parsers import PdfParser
+
+    assert parser.priority > PdfParser.priority
@@ -14,16 +14,16 @@ def reg() -> ParserRegistry:
 @pytest.mark.parametrize(
     "mime,ext,expected_name",
     [
-        ("application/pdf", None, {"pdfminer"}),
-        (None, ".pdf", {"pdfminer"}),
-        (None, ".PDF", {"pdfminer"}),
+        ("application/pdf", None, {"pypdfium2", "pdfminer"}),
+        (None, ".pdf", {"pypdfium2", "pdfminer"}),
+        (None, ".PDF", {"pypdfium2", "pdfminer"}),
 
-        ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", None, {"python-docx"}),
-        (None, ".docx", {"python-docx"}),
-        (None, ".DOCX", {"python-docx"}),
+        ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", None, {"ooxml-stream", "python-docx"}),
+        (None, ".docx", {"ooxml-stream", "python-docx"}),
+        (None, ".DOCX", {"ooxml-stream", "python-docx"}),
 
-        ("application/pdf", ".docx", {"pdfminer"}),
-        ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", ".pdf", {"python-docx"}),
+        ("application/pdf", ".docx", {"pypdfium2", "pdfminer"}),
+        ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", ".pdf", {"ooxml-stream", "python-docx"}),
     ],
 )
 def test_registry_selects_parser(reg: ParserRegistry, mime, ext, expected_name):
@@ -39,3 +39,9 @@ def test_registry_raises_for_unknown_type(reg: ParserRegistry):
 def test_registry_raises_when_both_missing(reg: ParserRegistry):
     with pytest.raises(UnsupportedFormatError):
         reg.find(mime=None, ext=None)
+
+
+def test_registry_ranks_pdf_parsers_by_priority(reg: ParserRegistry):
+    names = [p.name for p in reg.find_all(mime="application/pdf", ext=".pdf")]
+    assert names[-1] == "pdfminer"
+    assert set(names) <= {"pypdfium2", "pdfminer"}
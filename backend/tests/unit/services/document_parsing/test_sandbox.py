@@ -0,0 +1,110 @@
+from __future__ import annotations
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from backend.src.services.document_parsing import ExtractionError, ParsingSandbox
+from backend.src.services.document_parsing.parsers import DocumentParser, PdfParser
+from backend.src.services.upload_intake import MappedFile
+
+
+PDF_PATH = Path(__file__).resolve().parents[5] / "test_CVs" / "pdf" / "Valid_1.pdf"
+
+
+class _SleepyParser(DocumentParser):
+    name = "sleepy"
+
+    def supports(self, *, mime, ext) -> bool:
+        return True
+
+    def extract_text(self, content: bytes) -> str:
+        time.sleep(float(content))
+        return "done"
+
+
+class _GreedyParser(DocumentParser):
+    name = "greedy"
+
+    def supports(self, *, mime, ext) -> bool:
+        return True
+
+    def extract_text(self, content: bytes) -> str:
+        hog = bytearray(int(content))
+        time.sleep(5)
+        return str(len(hog))
+
+
+class _PagedParser(DocumentParser):
+    name = "paged"
+
+    def supports(self, *, mime, ext) -> bool:
+        return True
+
+    def extract_text(self, content: bytes) -> str:
+        return self.page_separator.join(self.iter_pages(content))
+
+    def iter_pages(self, content: bytes, *, max_pages=None):
+        for number in range(max_pages or 1000):
+            yield f"page {number}"
+
+
+@pytest.fixture()
+def sandbox():
+    sut = ParsingSandbox(workers=1, timeout_s=1.0, max_rss_bytes=512 * 1024 * 1024)
+    yield sut
+    sut.close()
+
+
+def test_sandbox_runs_parser_in_worker(sandbox: ParsingSandbox):
+    text = sandbox.run(PdfParser(), PDF_PATH.read_bytes())
+    assert "Mariola Bobrowska" in text
+
+
+def test_sandbox_kills_parser_on_timeout_and_recycles_worker(sandbox: ParsingSandbox):
+    with pytest.raises(ExtractionError, match="timed out"):
+        sandbox.run(_SleepyParser(), b"30")
+
+    assert sandbox.run(_SleepyParser(), b"0") == "done"
+
+
+def test_sandbox_kills_parser_over_memory_limit(sandbox: ParsingSandbox):
+    with pytest.raises(ExtractionError, match="memory limit"):
+        sandbox.run(_GreedyParser(), str(768 * 1024 * 1024).encode())
+
+
+def test_sandbox_propagates_extraction_errors(sandbox: ParsingSandbox):
+    with pytest.raises(ExtractionError, match="PDF"):
+        sandbox.run(PdfParser(), b"not a pdf")
+
+
+def test_sandbox_streams_bounded_pages(sandbox: ParsingSandbox):
+    pages = list(sandbox.iter_pages(PdfParser(), PDF_PATH.read_bytes(), 1))
+    assert len(pages) == 1
+    assert "Mariola Bobrowska" in pages[0]
+
+
+def test_sandbox_worker_is_reused_after_stream_is_closed_early(sandbox: ParsingSandbox):
+    pages = sandbox.iter_pages(_PagedParser(), b"")
+    assert next(pages) == "page 0"
+    pages.close()
+    (worker,) = sandbox._idle
+
+    assert sandbox.run(_SleepyParser(), b"0") == "done"
+    assert sandbox._idle == [worker]
+
+
+def test_sandbox_maps_file_backed_buffers_in_the_worker(sandbox: ParsingSandbox):
+    with tempfile.TemporaryFile() as f:
+        f.write(PDF_PATH.read_bytes())
+        f.flush()
+        mapped = MappedFile(f.fileno())
+        try:
+            text = sandbox.run(PdfParser(), mapped)
+            pages = list(sandbox.iter_pages(PdfParser(), mapped, 1))
+        finally:
+            mapped.close()
+
+    assert "Mariola Bobrowska" in text
+    assert "Mariola Bobrowska" in pages[0]
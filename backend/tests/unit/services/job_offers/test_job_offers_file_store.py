@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from backend.src.models.job_offers_model import JobOffer
+from backend.src.services.job_offers import job_offers_file_store
+from backend.src.services.job_offers.job_offers_file_store import GoogleDriveJobOfferFileStore
+from backend.src.utils import json_codec
+
+
+@pytest.fixture
+def drive_module():
+    return job_offers_file_store
+
+
+def _offer(offer_id: str, title: str = "Stolarz") -> JobOffer:
+    return JobOffer(
+        id=offer_id,
+        title=title,
+        requirements=[{"id": f"r-{offer_id}", "type": "SKILL", "name": "Drewno", "priority": "REQUIRED", "weight": 5}],
+    )
+
+
+def _legacy(drive, *offers: JobOffer) -> None:
+    drive.add("job_offers.json", json_codec.dumps([o.model_dump() for o in offers]))
+
+
+def _stored(drive, offer_id: str) -> Dict[str, Any]:
+    return json_codec.loads(drive.by_name(f"job_offer-{offer_id}.json")["content"])
+
+
+def _load(store: GoogleDriveJobOfferFileStore) -> List[str]:
+    return sorted(o.id for o in asyncio.run(store.load_all()))
+
+
+def test_legacy_file_is_migrated_and_renamed(drive):
+    _legacy(drive, _offer("a"), _offer("b"))
+    store = GoogleDriveJobOfferFileStore()
+
+    assert _load(store) == ["a", "b"]
+    assert drive.names() == ["job_offer-a.json", "job_offer-b.json", "job_offers.json.migrated"]
+
+    drive.downloads.clear()
+    assert _load(store) == ["a", "b"]
+    assert drive.downloads == []
+
+
+def test_interrupted_migration_resumes_without_overwriting_offer_files(drive):
+    _legacy(drive, _offer("a"), _offer("b"), _offer("c"))
+    drive.fail_creates_after = 1
+    store = GoogleDriveJobOfferFileStore()
+
+    assert _load(store) == ["a"]
+    assert "job_offers.json" in drive.names()
+
+    # Changed after the interrupted run; the legacy copy must not win.
+    asyncio.run(store.save_changes([_offer("a", "Tokarz")], {"a"}, set()))
+    drive.fail_creates_after = None
+
+    assert _load(store) == ["a", "b", "c"]
+    assert drive.names() == ["job_offer-a.json", "job_offer-b.json", "job_offer-c.json", "job_offers.json.migrated"]
+    assert _stored(drive, "a")["title"] == "Tokarz"
+
+
+def test_reload_downloads_only_changed_offers(drive):
+    store = GoogleDriveJobOfferFileStore()
+    asyncio.run(store.save_all([_offer("a"), _offer("b")]))
+    drive.downloads.clear()
+
+    assert _load(store) == ["a", "b"]
+    assert drive.downloads == []
+
+    other = GoogleDriveJobOfferFileStore()
+    asyncio.run(other.save_changes([_offer("a"), _offer("b", "Tokarz")], {"b"}, set()))
+
+    assert _load(store) == ["a", "b"]
+    assert drive.downloads == ["job_offer-b.json"]
+
+
+def test_save_changes_writes_changed_and_removes_deleted_offers(drive):
+    store = GoogleDriveJobOfferFileStore()
+    asyncio.run(store.save_all([_offer("a"), _offer("b"), _offer("c")]))
+
+    asyncio.run(store.save_changes([_offer("a", "Tokarz"), _offer("b")], {"a"}, {"c"}))
+
+    assert drive.names() == ["job_offer-a.json", "job_offer-b.json"]
+    assert _stored(drive, "a")["title"] == "Tokarz"
+
+    asyncio.run(store.save_all([_offer("b")]))
+    assert drive.names() == ["job_offer-b.json"]
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Iterable, List, Set, Tuple
+
+import pytest
+
+from backend.src.models.job_offers_model import JobOffer, JobOfferCreate
+from backend.src.services.job_offers.job_offers_repository import JobOfferRepository
+
+
+class FakeStore:
+    """Records save_changes calls; the first `failures` calls raise."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.saves: List[Tuple[float, Set[str], Set[str]]] = []
+        self.attempts = 0
+        self.failures = failures
+
+    async def load_all(self) -> List[JobOffer]:
+        return []
+
+    async def save_changes(self, offers: List[JobOffer], changed_ids: Iterable[str], deleted_ids: Iterable[str]):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ConnectionResetError("Drive went away")
+        self.saves.append((asyncio.get_running_loop().time(), set(changed_ids), set(deleted_ids)))
+
+
+PAYLOAD = JobOfferCreate(
+    title="Stolarz",
+    requirements=[{"type": "SKILL", "name": "Drewno", "priority": "REQUIRED", "weight": 5}],
+)
+
+
+def _write_behind(store: FakeStore, **kwargs) -> JobOfferRepository:
+    options = dict(debounce_s=0.05, max_delay_s=1.0, retry_base_s=0.01, retry_max_s=0.02)
+    options.update(kwargs)
+    return JobOfferRepository(store, write_behind=True, **options)
+
+
+async def _idle(repo: JobOfferRepository) -> None:
+    await asyncio.wait_for(repo._flush_task, timeout=5)
+
+
+def test_write_through_saves_every_change():
+    store = FakeStore()
+    repo = JobOfferRepository(store)
+
+    async def scenario():
+        job = await repo.create(PAYLOAD)
+        await repo.delete(job.id)
+        return job
+
+    job = asyncio.run(scenario())
+
+    assert [(changed, deleted) for _, changed, deleted in store.saves] == [({job.id}, set()), (set(), {job.id})]
+
+
+def test_changes_within_debounce_are_saved_once():
+    store = FakeStore()
+    repo = _write_behind(store)
+
+    async def scenario():
+        created = [await repo.create(PAYLOAD) for _ in range(3)]
+        await repo.delete(created[0].id)
+        assert store.saves == []
+        await _idle(repo)
+        return created
+
+    created = asyncio.run(scenario())
+
+    assert [(changed, deleted) for _, changed, deleted in store.saves] == [
+        ({created[1].id, created[2].id}, {created[0].id})
+    ]
+
+
+def test_steady_changes_are_saved_within_max_delay():
+    store = FakeStore()
+    repo = _write_behind(store, debounce_s=0.05, max_delay_s=0.15)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        # A change every 20 ms never leaves a 50 ms quiet period.
+        while loop.time() - started < 0.4:
+            await repo.create(PAYLOAD)
+            await asyncio.sleep(0.02)
+        await _idle(repo)
+        return started
+
+    started = asyncio.run(scenario())
+
+    assert len(store.saves) >= 2
+    assert store.saves[0][0] - started < 0.3
+    assert sum(len(changed) for _, changed, _ in store.saves) == len(repo._cache)
+
+
+def test_flush_writes_pending_changes_at_once():
+    store = FakeStore()
+    repo = _write_behind(store, debounce_s=60, max_delay_s=60)
+
+    async def scenario():
+        job = await repo.create(PAYLOAD)
+        await asyncio.wait_for(repo.flush(), timeout=1)
+        assert repo._flush_task is None
+        return job
+
+    job = asyncio.run(scenario())
+
+    assert [changed for _, changed, _ in store.saves] == [{job.id}]
+
+
+def test_failed_writes_are_retried_with_backoff():
+    store = FakeStore(failures=2)
+    repo = _write_behind(store, retry_base_s=0.05, retry_max_s=1.0)
+
+    async def scenario():
+        job = await repo.create(PAYLOAD)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await _idle(repo)
+        return job, loop.time() - started
+
+    job, elapsed = asyncio.run(scenario())
+
+    assert store.attempts == 3
+    assert [changed for _, changed, _ in store.saves] == [{job.id}]
+    # Debounce, then 0.05 s and 0.1 s between the attempts.
+    assert elapsed >= 0.05 + 0.05 + 0.1
+    assert repo.flush_error is None
+
+
+def test_gives_up_after_max_attempts_and_keeps_changes():
+    store = FakeStore(failures=10)
+    repo = _write_behind(store, max_attempts=3)
+
+    async def scenario():
+        job = await repo.create(PAYLOAD)
+        await _idle(repo)
+        assert store.attempts == 3
+        assert isinstance(repo.flush_error, ConnectionResetError)
+        assert repo._dirty == {job.id}
+
+        store.failures = 0
+        await repo.flush()
+        return job
+
+    job = asyncio.run(scenario())
+
+    assert [changed for _, changed, _ in store.saves] == [{job.id}]
+    assert repo.flush_error is None
+
+
+def test_flush_raises_when_the_store_fails():
+    store = FakeStore(failures=1)
+    repo = _write_behind(store, debounce_s=60, max_delay_s=60)
+
+    async def scenario():
+        await repo.create(PAYLOAD)
+        with pytest.raises(ConnectionResetError):
+            await repo.flush()
+        assert repo._dirty
+
+    asyncio.run(scenario())
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.src.services import admission
+from backend.src.services.admission import AdmissionController, AdmissionRejected
+
+
+@pytest.fixture(autouse=True)
+def idle_cpu(monkeypatch):
+    monkeypatch.setattr(admission, "_cpu_load", lambda: None)
+
+
+def _controller(**kwargs) -> AdmissionController:
+    # window_s=0 closes a window on every observed CV.
+    defaults = dict(initial_limit=4, min_limit=2, max_limit=6, window_s=0.0)
+    defaults.update(kwargs)
+    return AdmissionController(**defaults)
+
+
+def _saturate(sut: AdmissionController) -> None:
+    async def fill():
+        for _ in range(sut.limit):
+            await sut.acquire()
+
+    asyncio.run(fill())
+
+
+def test_limit_grows_by_one_per_saturated_window():
+    sut = _controller()
+    _saturate(sut)
+
+    sut.release(1.0)
+
+    assert sut.limit == 5
+
+
+def test_limit_does_not_grow_when_pipeline_is_not_saturated():
+    sut = _controller(initial_limit=6, max_limit=10)
+    asyncio.run(sut.acquire())
+
+    sut.release(1.0)
+
+    assert sut.limit == 6
+
+
+def test_limit_is_clamped_to_max():
+    sut = _controller(initial_limit=6, max_limit=6)
+    _saturate(sut)
+
+    for _ in range(3):
+        sut.release(1.0)
+        asyncio.run(sut.acquire())
+
+    assert sut.limit == 6
+
+
+def test_slow_service_time_cuts_limit_multiplicatively():
+    sut = _controller(initial_limit=6, max_limit=8)
+    _saturate(sut)
+    sut.release(1.0)
+    asyncio.run(sut.acquire())
+    assert sut.limit == 7
+
+    sut.release(3.0)
+
+    assert sut.limit == 5
+
+
+def test_limit_is_clamped_to_min():
+    sut = _controller(initial_limit=3)
+    _saturate(sut)
+    sut.release(1.0)
+    assert sut.limit == 4
+
+    for _ in range(3):
+        sut.release(10.0)
+
+    assert sut.limit == 2
+
+
+def test_cpu_overload_cuts_limit(monkeypatch):
+    sut = _controller(cpu_threshold=1.5)
+    _saturate(sut)
+    monkeypatch.setattr(admission, "_cpu_load", lambda: 1.6)
+
+    sut.release(1.0)
+
+    assert sut.limit == 3
+
+
+def test_full_cpu_below_threshold_does_not_cut_limit(monkeypatch):
+    sut = _controller(cpu_threshold=1.5)
+    _saturate(sut)
+    monkeypatch.setattr(admission, "_cpu_load", lambda: 1.0)
+
+    sut.release(1.0)
+
+    assert sut.limit == 5
+
+
+def test_reserve_rejects_once_backlog_is_full():
+    sut = _controller(max_backlog=10)
+    held = sut.reserve(14)
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        sut.reserve(1)
+    assert excinfo.value.retry_after >= 1
+
+    held.close()
+    sut.reserve(1)
+
+
+def test_oversized_request_is_accepted_when_backlog_is_empty():
+    sut = _controller(max_backlog=10)
+
+    sut.reserve(100)
+
+    with pytest.raises(AdmissionRejected):
+        sut.reserve(1)
+
+
+def test_reservation_gives_back_places_one_by_one():
+    sut = _controller(max_backlog=0)
+    held = sut.reserve(4)
+
+    held.release()
+    sut.reserve(1)
+    with pytest.raises(AdmissionRejected):
+        sut.reserve(1)
+
+    held.close()
+    held.close()
+    sut.reserve(3)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def _serve(sut: AdmissionController, clock: FakeClock, queued, *, service_s: float = 1.0):
+    """
+    Holds the single slot, queues (name, flow) requests in order, then serves
+    them one at a time on the fake clock. Returns names in service order.
+    """
+    order = []
+
+    async def request(name, flow):
+        await sut.acquire(flow)
+        order.append(name)
+
+    async def main():
+        await sut.acquire(sut.flow("normal"))
+        tasks = []
+        for name, flow in queued:
+            tasks.append(asyncio.create_task(request(name, flow)))
+            await asyncio.sleep(0)
+        for _ in range(len(queued)):
+            clock.now += service_s
+            sut.release(service_s)
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        sut.release()
+
+    asyncio.run(main())
+    return order
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(admission, "time", fake)
+    return fake
+
+
+def _single_slot() -> AdmissionController:
+    # A window far longer than the test keeps AIMD from moving the limit.
+    return AdmissionController(initial_limit=1, min_limit=1, max_limit=1, window_s=1e9)
+
+
+def test_interactive_flow_overtakes_queued_bulk_flow(clock: FakeClock):
+    sut = _single_slot()
+    bulk = sut.flow("bulk")
+    interactive = sut.flow("interactive")
+    queued = [(f"bulk-{i}", bulk) for i in range(10)] + [("interactive", interactive)]
+
+    order = _serve(sut, clock, queued)
+
+    assert order[0] == "interactive"
+    assert order[1:] == [f"bulk-{i}" for i in range(10)]
+    assert clock.now == 11.0
+
+
+def test_backlogged_flows_are_served_in_proportion_to_weight(clock: FakeClock):
+    sut = _single_slot()
+    normal = sut.flow("normal")
+    bulk = sut.flow("bulk")
+    queued = [(f"bulk-{i}", bulk) for i in range(12)] + [(f"normal-{i}", normal) for i in range(12)]
+
+    order = _serve(sut, clock, queued)
+
+    first = order[:9]
+    assert sum(name.startswith("normal") for name in first) == 6
+    assert sum(name.startswith("bulk") for name in first) == 3
+    assert sorted(order) == sorted(name for name, _ in queued)
+
+
+def test_late_flow_gets_no_credit_for_idle_time(clock: FakeClock):
+    sut = _single_slot()
+    bulk = sut.flow("bulk")
+    first = _serve(sut, clock, [(f"bulk-{i}", bulk) for i in range(5)])
+    assert first == [f"bulk-{i}" for i in range(5)]
+
+    normal = sut.flow("normal")
+    queued = [(f"bulk-{i}", bulk) for i in range(5, 11)] + [(f"normal-{i}", normal) for i in range(6)]
+    order = _serve(sut, clock, queued)
+
+    # Weight 2 against 1 from the moment it joins, not a burst to catch up.
+    assert order[0] == "normal-0"
+    assert sum(name.startswith("bulk") for name in order[:6]) == 2
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from backend.src.models.candidate_matching import JobMatch
+from backend.src.models.candidate_profile import CandidateProfile
+from backend.src.services import candidate_storage
+from backend.src.services.candidate_storage import CandidateRecord, GoogleDriveCandidateStore
+from backend.src.utils import json_codec
+
+
+@pytest.fixture
+def drive_module():
+    return candidate_storage
+
+
+def _record(
+    candidate_id: str,
+    created_at: Optional[datetime],
+    job_ids: tuple = (),
+    rejected: bool = False,
+) -> CandidateRecord:
+    return CandidateRecord(
+        id=candidate_id,
+        profile=CandidateProfile(name="Jan", surname=candidate_id),
+        job_matches=[
+            JobMatch(
+                job_id=job_id, job_title="Stolarz", status="MATCHED", score_percent=100, total_score=5, max_score=5
+            )
+            for job_id in job_ids
+        ],
+        global_rejection_reason="Brak danych." if rejected else None,
+        created_at=created_at,
+    )
+
+
+def _at(month: int, day: int = 15) -> datetime:
+    return datetime(2026, month, day, 12, tzinfo=timezone.utc)
+
+
+def _manifest(drive) -> Dict[str, Any]:
+    return json_codec.loads(drive.by_name("candidates_manifest.json")["content"])["shards"]
+
+
+def _ids(records: List[CandidateRecord]) -> List[str]:
+    return sorted(r.id for r in records)
+
+
+def test_appends_go_to_monthly_shards_and_the_manifest(drive):
+    store = GoogleDriveCandidateStore()
+
+    store.append_candidates([_record("a", _at(8), ("job-1",)), _record("b", _at(9), ("job-2",))])
+    store.append_candidates([_record("c", _at(9), rejected=True)])
+
+    assert drive.names() == ["candidates-2026-08.json", "candidates-2026-09.json", "candidates_manifest.json"]
+    assert _manifest(drive) == {
+        "2026-08": {"count": 1, "job_ids": ["job-1"], "has_global_rejections": False},
+        "2026-09": {"count": 2, "job_ids": ["job-2"], "has_global_rejections": True},
+    }
+    assert _ids(store.load_all()) == ["a", "b", "c"]
+
+
+def test_query_by_job_reads_only_shards_that_can_match(drive):
+    store = GoogleDriveCandidateStore()
+    store.append_candidates([_record("a", _at(8), ("job-1",))])
+    store.append_candidates([_record("b", _at(9), ("job-2",))])
+    store.append_candidates([_record("c", _at(10), ("job-2",))])
+    drive.downloads.clear()
+
+    records, total = store.query_with_total(job_id="job-1")
+
+    assert _ids(records) == ["a"]
+    assert total == 3
+    assert drive.downloads == ["candidates_manifest.json", "candidates-2026-08.json"]
+
+
+def test_query_by_dates_keeps_undated_legacy_records(drive):
+    legacy = json_codec.dumps([_record("old", None, ("job-1",)).model_dump()])
+    drive.add("candidates.json", legacy)
+    store = GoogleDriveCandidateStore()
+    store.append_candidates([_record("a", _at(8), ("job-1",)), _record("b", _at(9, 1), ("job-1",))])
+    store.append_candidates([_record("c", _at(10), ("job-1",))])
+    drive.downloads.clear()
+
+    records, total = store.query_with_total(created_from=_at(9, 1), created_to=_at(9, 30))
+
+    assert _ids(records) == ["b", "old"]
+    assert total == 4
+    assert "candidates-2026-08.json" not in drive.downloads
+    assert "candidates-2026-10.json" not in drive.downloads
+
+
+def test_total_counts_shards_missing_from_the_manifest(drive):
+    store = GoogleDriveCandidateStore()
+    store.append_candidates([_record("a", _at(8)), _record("b", _at(9))])
+    drive.files_by_id.pop(drive.by_name("candidates_manifest.json")["id"])
+
+    records, total = store.query_with_total(created_from=_at(9, 1))
+
+    assert _ids(records) == ["b"]
+    assert total == 2
+
+
+def test_delete_updates_the_shard_and_its_summary(drive):
+    store = GoogleDriveCandidateStore()
+    store.append_candidates([_record("a", _at(9), ("job-1",)), _record("b", _at(9), ("job-2",))])
+
+    assert store.delete_candidate("a")
+    assert not store.delete_candidate("a")
+
+    assert _ids(store.load_all()) == ["b"]
+    assert _manifest(drive)["2026-09"] == {"count": 1, "job_ids": ["job-2"], "has_global_rejections": False}
+
+
+def test_only_store_files_are_deduplicated(drive):
+    store = GoogleDriveCandidateStore()
+    store.append_candidates([_record("a", _at(9))])
+    stale = drive.add("candidates-2026-09.json", json_codec.dumps([]))
+    drive.files_by_id[stale]["modifiedTime"] = "2026-01-01T00:00:00Z"
+    drive.add("Jan_candidates_cv.pdf", b"%PDF-1.4")
+    drive.add("Jan_candidates_cv.pdf", b"%PDF-1.4")
+
+    assert _ids(store.load_all()) == ["a"]
+
+    assert stale not in drive.files_by_id
+    assert drive.names().count("Jan_candidates_cv.pdf") == 2
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import warnings
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from pydantic import AnyUrl, BaseModel
+
+from backend.src.models.candidate_matching import CandidateRecord
+from backend.src.models.job_offers_model import JobOffer
+from backend.src.services.storage_format import app_properties, construct, decode, encode, is_trusted, load_models
+from backend.src.utils import json_codec
+
+RECORD = {
+    "id": "c-1",
+    "profile": {
+        "name": "Mariola",
+        "surname": "Bobrowska",
+        "email": "mariola@example.com",
+        "phone_number": "+48 600 100 200",
+        "linkedin_profile": "https://www.linkedin.com/in/mariola",
+        "education": [{"school_name": "PW", "start_year": 2015, "end_year": 2019, "field_of_study": "Informatyka"}],
+        "skills": [{"name": "Python", "category": "SKILL", "proficiency": 0.8}],
+    },
+    "cv_drive_file_id": "drive-1",
+    "job_matches": [
+        {
+            "job_id": "job-1",
+            "job_title": "Stolarz",
+            "status": "MATCHED",
+            "score_percent": 100,
+            "total_score": 7,
+            "max_score": 7,
+            "matched_requirements": [{"requirement_id": "r-1", "name": "Drewno", "priority": "REQUIRED", "weight": 5, "matched": True}],
+        }
+    ],
+}
+
+OFFER = {
+    "id": "job-1",
+    "title": "Stolarz",
+    "requirements": [
+        {"id": "r-1", "type": "SKILL", "name": "Drewno", "priority": "REQUIRED", "weight": 5, "keywords": ["drewno"]},
+    ],
+}
+
+
+class Link(BaseModel):
+    url: AnyUrl
+    seen_at: Optional[datetime] = None
+
+
+class Catalog(BaseModel):
+    links: Dict[str, Link]
+    mirrors: List[AnyUrl] = []
+
+
+CATALOG = {
+    "links": {"cv": {"url": "https://example.com/cv.pdf", "seen_at": "2026-10-01T12:00:00+00:00"}},
+    "mirrors": ["https://mirror.example.com/"],
+}
+
+
+def _dump_strict(model: BaseModel) -> dict:
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        return model.model_dump(mode="json")
+
+
+def test_construct_matches_validate_for_candidate_record():
+    constructed = construct(CandidateRecord, RECORD)
+    validated = CandidateRecord.model_validate(RECORD)
+
+    assert constructed == validated
+    assert isinstance(constructed.profile.linkedin_profile, AnyUrl)
+    assert _dump_strict(constructed) == _dump_strict(validated)
+
+
+def test_construct_matches_validate_for_job_offer():
+    constructed = construct(JobOffer, OFFER)
+
+    assert constructed == JobOffer.model_validate(OFFER)
+    assert _dump_strict(constructed) == _dump_strict(JobOffer.model_validate(OFFER))
+
+
+def test_construct_coerces_dict_values_urls_and_datetimes():
+    constructed = construct(Catalog, CATALOG)
+    validated = Catalog.model_validate(CATALOG)
+
+    assert constructed == validated
+    assert constructed.links["cv"].seen_at == datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+    assert _dump_strict(constructed) == _dump_strict(validated)
+
+
+def test_round_trip_through_trusted_storage():
+    payload = encode(json_codec.dumps([CandidateRecord.model_validate(RECORD).model_dump(mode="json")]), "gzip")
+    properties = app_properties(payload, "1")
+    assert is_trusted(payload, properties, "1")
+
+    loaded = load_models(CandidateRecord, json_codec.loads(decode(payload)), trusted=True, source="test")
+
+    assert loaded == [CandidateRecord.model_validate(RECORD)]
+
+
+def test_untrusted_records_are_validated_one_by_one():
+    broken = dict(OFFER, id="job-2", requirements="not a list")
+
+    loaded = load_models(JobOffer, [OFFER, broken], trusted=False, source="test")
+
+    assert [o.id for o in loaded] == ["job-1"]
+
+
+def test_modified_file_is_not_trusted():
+    payload = json_codec.dumps([OFFER])
+    properties = app_properties(payload, "1")
+
+    assert not is_trusted(payload + b" ", properties, "1")
+    assert not is_trusted(payload, properties, "2")
+    assert not is_trusted(payload, None, "1")
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from types import SimpleNamespace
+from typing import AsyncIterator, List
+
+import pytest
+
+pytest.importorskip("spacy")
+
+from backend.src.services import upload_sessions
+from backend.src.services.upload_sessions import (
+    UploadOffsetMismatch,
+    UploadSessionManager,
+    UploadStateError,
+)
+
+CV = b"%PDF-1.4 " + bytes(range(256)) * 8
+
+
+@pytest.fixture(autouse=True)
+def fake_pipeline(monkeypatch):
+    """Ingestion that stores every queued file as a candidate named after it."""
+    async def ingest(source, parsing_service, jobs, priority):
+        async for intake in source:
+            intake.file.seek(0)
+            content = intake.file.read()
+            yield intake, SimpleNamespace(record=SimpleNamespace(id=f"candidate-{len(content)}"))
+
+    async def load_jobs():
+        return []
+
+    monkeypatch.setattr(upload_sessions, "ingest_as_completed", ingest)
+    monkeypatch.setattr(upload_sessions, "load_jobs", load_jobs)
+    monkeypatch.setattr(upload_sessions, "create_parsing_service", lambda: None)
+
+
+@pytest.fixture
+def manager(tmp_path) -> UploadSessionManager:
+    return UploadSessionManager(root_dir=str(tmp_path), max_chunk_bytes=1024)
+
+
+async def _stream(*parts: bytes) -> AsyncIterator[bytes]:
+    for part in parts:
+        yield part
+
+
+async def _interrupted(part: bytes) -> AsyncIterator[bytes]:
+    yield part
+    raise ConnectionResetError("client went away")
+
+
+def _chunks(data: bytes, size: int) -> List[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+async def _upload(manager: UploadSessionManager, session_id: str, data: bytes, **kwargs):
+    session_file = manager.add_file(
+        session_id, filename="cv.pdf", content_type="application/pdf", size=len(data), **kwargs
+    )
+    for chunk in _chunks(data, 1024):
+        await manager.write_chunk(session_id, session_file.id, session_file.offset, _stream(chunk))
+    return session_file
+
+
+def test_chunk_at_wrong_offset_is_rejected_with_stored_offset(manager: UploadSessionManager):
+    async def scenario():
+        session = manager.create_session(top_n=3, priority="normal")
+        f = manager.add_file(session.id, filename="cv.pdf", content_type="application/pdf", size=len(CV))
+        await manager.write_chunk(session.id, f.id, 0, _stream(CV[:100]))
+
+        with pytest.raises(UploadOffsetMismatch) as excinfo:
+            await manager.write_chunk(session.id, f.id, 0, _stream(CV[:100]))
+        assert excinfo.value.offset == 100
+
+        with pytest.raises(UploadOffsetMismatch):
+            await manager.write_chunk(session.id, f.id, 200, _stream(CV[200:300]))
+        assert f.offset == 100
+
+    asyncio.run(scenario())
+
+
+def test_interrupted_chunk_keeps_received_bytes_and_resumes(manager: UploadSessionManager):
+    async def scenario():
+        session = manager.create_session(top_n=3, priority="normal")
+        f = manager.add_file(session.id, filename="cv.pdf", content_type="application/pdf", size=len(CV))
+
+        with pytest.raises(ConnectionResetError):
+            await manager.write_chunk(session.id, f.id, 0, _interrupted(CV[:700]))
+        assert f.offset == 700
+
+        await manager.write_chunk(session.id, f.id, 700, _stream(CV[700:1000], CV[1000:1400]))
+        await manager.write_chunk(session.id, f.id, 1400, _stream(CV[1400:]))
+        await manager.finalize(session.id, f.id)
+        assert f.sha256 == hashlib.sha256(CV).hexdigest()
+
+    asyncio.run(scenario())
+
+
+def test_chunk_beyond_declared_size_or_chunk_limit_is_rejected(manager: UploadSessionManager):
+    async def scenario():
+        session = manager.create_session(top_n=3, priority="normal")
+        f = manager.add_file(session.id, filename="cv.pdf", content_type="application/pdf", size=100)
+        with pytest.raises(UploadStateError):
+            await manager.write_chunk(session.id, f.id, 0, _stream(CV[:101]))
+
+        g = manager.add_file(session.id, filename="cv.pdf", content_type="application/pdf", size=len(CV))
+        with pytest.raises(UploadStateError):
+            await manager.write_chunk(session.id, g.id, 0, _stream(CV[:600], CV[600:1100]))
+
+    asyncio.run(scenario())
+
+
+def test_finalize_before_last_byte_is_rejected(manager: UploadSessionManager):
+    async def scenario():
+        session = manager.create_session(top_n=3, priority="normal")
+        f = manager.add_file(session.id, filename="cv.pdf", content_type="application/pdf", size=len(CV))
+        await manager.write_chunk(session.id, f.id, 0, _stream(CV[:10]))
+
+        with pytest.raises(UploadOffsetMismatch):
+            await manager.finalize(session.id, f.id)
+        assert f.status == "uploading"
+
+    asyncio.run(scenario())
+
+
+def test_finalize_checks_declared_sha256(manager: UploadSessionManager):
+    async def scenario():
+        session = manager.create_session(top_n=3, priority="normal")
+        f = await _upload(manager, session.id, CV, sha256="0" * 64)
+
+        with pytest.raises(UploadStateError):
+            await manager.finalize(session.id, f.id)
+
+    asyncio.run(scenario())
+
+
+def test_finalized_file_is_processed_once_session_completes(manager: UploadSessionManager):
+    async def scenario():
+        session = manager.create_session(top_n=3, priority="normal")
+        f = await _upload(manager, session.id, CV)
+
+        assert (await manager.finalize(session.id, f.id)).status == "queued"
+        assert (await manager.finalize(session.id, f.id)).status == "queued"
+        manager.complete(session.id)
+        await session._task
+
+        assert f.status == "processed"
+        assert f.candidate_id == f"candidate-{len(CV)}"
+        assert session.status == "done"
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_finalize_after_complete_is_rejected(manager: UploadSessionManager):
+    async def scenario():
+        session = manager.create_session(top_n=3, priority="normal")
+        first = await _upload(manager, session.id, CV)
+        await manager.finalize(session.id, first.id)
+        late = await _upload(manager, session.id, CV[:-1])
+
+        manager.complete(session.id)
+        with pytest.raises(UploadStateError):
+            await manager.finalize(session.id, late.id)
+        await session._task
+
+        assert late.status == "uploading"
+        with pytest.raises(UploadStateError):
+            manager.add_file(session.id, filename="cv.pdf", content_type="application/pdf", size=1)
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_duplicates_use_received_bytes_and_hide_foreign_file_ids(manager: UploadSessionManager):
+    async def scenario():
+        first = manager.create_session(top_n=3, priority="normal")
+        original = await _upload(manager, first.id, CV)
+        await manager.finalize(first.id, original.id)
+
+        # A client claiming someone else's hash still has to send its bytes.
+        other = manager.create_session(top_n=3, priority="normal")
+        claimed = manager.add_file(
+            other.id,
+            filename="cv.pdf",
+            content_type="application/pdf",
+            size=len(CV),
+            sha256=hashlib.sha256(CV).hexdigest(),
+        )
+        assert claimed.status == "uploading"
+        assert claimed.offset == 0
+
+        for chunk in _chunks(CV, 1024):
+            await manager.write_chunk(other.id, claimed.id, claimed.offset, _stream(chunk))
+        await manager.finalize(other.id, claimed.id)
+        assert claimed.status == "duplicate"
+        assert claimed.duplicate_of is None
+
+        again = await _upload(manager, first.id, CV)
+        await manager.finalize(first.id, again.id)
+        assert again.status == "duplicate"
+        assert again.duplicate_of == original.id
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_expired_sessions_are_closed(manager: UploadSessionManager):
+    async def scenario():
+        session = manager.create_session(top_n=3, priority="normal")
+        f = await _upload(manager, session.id, CV)
+        session.last_activity -= 24 * 60 * 60 + 1
+
+        manager.create_session(top_n=3, priority="normal")
+        with pytest.raises(KeyError):
+            manager.get_file(session.id, f.id)
+        assert len(manager._closing) == 1
+        await manager.stop()
+        assert not manager._closing
+
+    asyncio.run(scenario())
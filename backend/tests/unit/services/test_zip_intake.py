@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import struct
+import zipfile
+from typing import Dict, List
+
+import pytest
+
+from backend.src.services.upload_intake import IntakeFile
+from backend.src.services.zip_intake import ZipArchiveRejected, ZipIntake, ZipLimits
+
+PDF = b"%PDF-1.4 " + bytes(range(256)) * 40
+
+
+def _zip(entries: Dict[str, bytes], compression: int = zipfile.ZIP_DEFLATED) -> io.BytesIO:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    buf.seek(0)
+    return buf
+
+
+def _files(intake: ZipIntake) -> List[IntakeFile]:
+    async def collect():
+        return [f async for f in intake.iter_files()]
+
+    return asyncio.run(collect())
+
+
+def _reasons(intake: ZipIntake) -> Dict[str, str]:
+    return {s.file_name: s.reason for s in intake.skipped}
+
+
+def test_reads_supported_entries():
+    sut = ZipIntake(_zip({"cvs/jan.pdf": PDF, "anna.DOCX": b"PK docx"}))
+
+    files = _files(sut)
+
+    assert [(f.filename, f.content_type, f.size) for f in files] == [
+        ("jan.pdf", "application/pdf", len(PDF)),
+        ("anna.DOCX", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", 7),
+    ]
+    assert sut.skipped == []
+
+
+def test_skips_unsupported_types_and_hidden_files():
+    sut = ZipIntake(_zip({"cv.pdf": PDF, "notes.txt": b"hello", "photo.jpg": b"\xff\xd8", ".DS_Store": b"x"}))
+
+    assert [i.filename for i in sut.entries] == ["cv.pdf"]
+    assert _reasons(sut) == {
+        "notes.txt": "Unsupported file type.",
+        "photo.jpg": "Unsupported file type.",
+        ".DS_Store": "System metadata file.",
+    }
+
+
+def test_skips_entry_with_suspicious_compression_ratio():
+    sut = ZipIntake(_zip({"bomb.pdf": b"%PDF" + bytes(1024 * 1024), "cv.pdf": PDF}), ZipLimits(max_ratio=100.0))
+
+    assert [i.filename for i in sut.entries] == ["cv.pdf"]
+    assert _reasons(sut) == {"bomb.pdf": "Suspicious compression ratio."}
+
+
+def test_skips_entry_over_size_limit():
+    sut = ZipIntake(_zip({"big.pdf": PDF}, zipfile.ZIP_STORED), ZipLimits(max_entry_bytes=len(PDF) - 1))
+
+    assert sut.entries == []
+    assert _reasons(sut) == {"big.pdf": "Wrong file size."}
+
+
+def test_rejects_archive_over_declared_total():
+    archive = _zip({"a.pdf": PDF, "b.pdf": PDF}, zipfile.ZIP_STORED)
+
+    with pytest.raises(ZipArchiveRejected, match="unpacks to"):
+        ZipIntake(archive, ZipLimits(max_total_bytes=2 * len(PDF) - 1))
+
+
+def test_rejects_archive_with_too_many_entries():
+    archive = _zip({f"cv{i}.pdf": PDF for i in range(3)})
+
+    with pytest.raises(ZipArchiveRejected, match="entries"):
+        ZipIntake(archive, ZipLimits(max_entries=2))
+
+
+def test_macos_metadata_does_not_count_towards_entry_limit():
+    archive = _zip({"cv.pdf": PDF, "__MACOSX/._cv.pdf": b"x", "__MACOSX/cvs/._a.pdf": b"x", "cvs/.hidden.pdf": PDF})
+
+    sut = ZipIntake(archive, ZipLimits(max_entries=1))
+
+    assert [i.filename for i in sut.entries] == ["cv.pdf"]
+    assert set(_reasons(sut).values()) == {"System metadata file."}
+    assert len(sut.skipped) == 3
+
+
+def test_entry_larger_than_declared_is_never_returned():
+    data = bytearray(_zip({"cv.pdf": PDF}).getvalue())
+    declared = 100
+    # Lie about the uncompressed size in both the local header and the central directory.
+    struct.pack_into("<I", data, data.find(b"PK\x03\x04") + 22, declared)
+    struct.pack_into("<I", data, data.find(b"PK\x01\x02") + 24, declared)
+
+    sut = ZipIntake(io.BytesIO(bytes(data)))
+    assert [i.file_size for i in sut.entries] == [declared]
+
+    assert _files(sut) == []
+    assert list(_reasons(sut)) == ["cv.pdf"]
+
+
+def test_invalid_archive_is_rejected():
+    with pytest.raises(ZipArchiveRejected, match="Not a valid ZIP"):
+        ZipIntake(io.BytesIO(b"not a zip"))
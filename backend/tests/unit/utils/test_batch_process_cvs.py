@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+pytest.importorskip("spacy")
+
+from backend.src.models.candidate_profile import CandidateProfile
+from backend.src.utils import batch_process_cvs
+from backend.src.utils.batch_process_cvs import BatchProcessor, Checkpoint, FileOutcome, RunStats
+
+
+@pytest.fixture
+def checkpoint(tmp_path) -> Checkpoint:
+    return Checkpoint(str(tmp_path / "checkpoint.jsonl"))
+
+
+def test_missing_checkpoint_is_empty(checkpoint: Checkpoint):
+    assert checkpoint.load_done() == set()
+
+
+def test_stored_and_rejected_are_done_failed_are_retried(checkpoint: Checkpoint):
+    checkpoint.record([
+        {"path": "a.pdf", "status": "stored", "candidate_id": "1"},
+        {"path": "b.pdf", "status": "rejected", "reason": "Wrong file size."},
+        {"path": "c.pdf", "status": "failed", "reason": "ValueError: broken"},
+    ])
+
+    assert checkpoint.load_done() == {"a.pdf", "b.pdf"}
+
+
+def test_failed_entry_is_done_once_a_later_run_stores_it(checkpoint: Checkpoint):
+    checkpoint.record([{"path": "c.pdf", "status": "failed", "reason": "timeout"}])
+    checkpoint.record([{"path": "c.pdf", "status": "stored", "candidate_id": "2"}])
+
+    assert checkpoint.load_done() == {"c.pdf"}
+
+
+def test_torn_last_line_is_ignored(checkpoint: Checkpoint):
+    checkpoint.record([
+        {"path": "a.pdf", "status": "stored", "candidate_id": "1"},
+        {"path": "b.pdf", "status": "stored", "candidate_id": "2"},
+    ])
+    torn = json.dumps({"path": "c.pdf", "status": "stored", "candidate_id": "3"})[:20]
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write(torn)
+
+    assert checkpoint.load_done() == {"a.pdf", "b.pdf"}
+
+    # The next run appends after the torn line without losing its own entries.
+    checkpoint.record([{"path": "d.pdf", "status": "rejected", "reason": "Wrong content type."}])
+    assert checkpoint.load_done() == {"a.pdf", "b.pdf", "d.pdf"}
+
+
+class FakeStore:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.stored: List = []
+
+    def append_candidates(self, records) -> None:
+        if self.fail:
+            raise ConnectionResetError("Drive went away")
+        self.stored.extend(records)
+
+
+@pytest.fixture
+def drive(monkeypatch):
+    archived = {}
+    deleted = []
+
+    def archive(path: str) -> str:
+        if "broken" in path:
+            raise ConnectionResetError("upload failed")
+        archived[path] = f"drive-{len(archived)}"
+        return archived[path]
+
+    monkeypatch.setattr(batch_process_cvs, "_archive", archive)
+    monkeypatch.setattr(batch_process_cvs, "delete_cv_from_drive", deleted.append)
+    return SimpleNamespace(archived=archived, deleted=deleted)
+
+
+def _processor(checkpoint: Checkpoint, store: FakeStore) -> BatchProcessor:
+    processor = BatchProcessor(workers=2, flush_every=100, checkpoint=checkpoint, archive=True)
+    processor._store = store
+    return processor
+
+
+def _analyzed(path: str) -> FileOutcome:
+    analysis = SimpleNamespace(profile=CandidateProfile(name="Jan"), job_matches=[], global_rejection_reason=None)
+    return FileOutcome(path=path, size=10, status="analyzed", analysis=analysis)
+
+
+def test_cvs_are_archived_when_their_batch_is_stored(checkpoint: Checkpoint, drive):
+    store = FakeStore()
+    processor = _processor(checkpoint, store)
+    processor._handle("/cvs", _analyzed("/cvs/a.pdf"))
+    processor._handle("/cvs", _analyzed("/cvs/broken.pdf"))
+    assert drive.archived == {}
+
+    processor._flush()
+
+    assert [r.cv_drive_file_id for r in store.stored] == ["drive-0"]
+    assert processor.stats.stored == 1
+    assert processor.stats.failed == 1
+    # The file that could not be archived is retried on the next run.
+    assert checkpoint.load_done() == {"a.pdf"}
+
+
+def test_archived_cvs_are_deleted_when_the_batch_is_not_stored(checkpoint: Checkpoint, drive):
+    processor = _processor(checkpoint, FakeStore(fail=True))
+    processor._handle("/cvs", _analyzed("/cvs/a.pdf"))
+    processor._handle("/cvs", _analyzed("/cvs/b.pdf"))
+
+    with pytest.raises(ConnectionResetError):
+        processor._flush()
+
+    assert sorted(drive.deleted) == sorted(drive.archived.values())
+    assert checkpoint.load_done() == set()
+
+
+def test_summary_reports_counts_and_throughput():
+    stats = RunStats(
+        total=10,
+        skipped=2,
+        stored=4,
+        rejected=3,
+        failed=1,
+        bytes=8 * 1024 * 1024,
+        parse_s=6.0,
+        analyze_s=2.0,
+    )
+
+    assert stats.summary(4.0) == (
+        "files: 10 (skipped from checkpoint: 2), stored: 4, rejected: 3, failed: 1; "
+        "elapsed: 4.0s, throughput: 2.00 files/s, 2.00 MB/s; "
+        "parse: 6.0s, analyze: 2.0s of worker time (2.00s per stored CV)"
+    )
+
+
+def test_summary_of_empty_run_does_not_divide_by_zero():
+    assert RunStats().summary(0.0) == (
+        "files: 0 (skipped from checkpoint: 0), stored: 0, rejected: 0, failed: 0; "
+        "elapsed: 0.0s, throughput: 0.00 files/s, 0.00 MB/s; "
+        "parse: 0.0s, analyze: 0.0s of worker time (0.00s per stored CV)"
+    )
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+from pydantic import AnyUrl, BaseModel
+
+from backend.src.utils import json_codec
+
+DATA = [
+    {
+        "id": "c-1",
+        "profile": {"name": "Łucja", "surname": "Żak-Węgrzyn", "linkedin_profile": None, "skills": []},
+        "job_matches": [{"job_id": "job-1", "score_percent": 87, "ratio": 0.125, "matched": True}],
+        "global_rejection_reason": "CV nie zawiera wymaganych danych kandydata: e-mail.",
+    },
+    {"id": "c-2", "profile": {}, "job_matches": [], "global_rejection_reason": None},
+]
+
+
+class Profile(BaseModel):
+    name: str
+    linkedin_profile: AnyUrl
+    created_at: datetime
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return json_codec
+
+
+def test_output_is_compact_json_dumps(codec):
+    expected = json.dumps(DATA, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    assert codec.dumps(DATA) == expected
+
+
+def test_reads_files_written_by_json_dumps(codec):
+    previous = json.dumps(DATA, ensure_ascii=False, indent=2).encode("utf-8")
+
+    assert codec.loads(previous) == DATA
+    assert codec.loads(previous.decode("utf-8")) == DATA
+
+
+def test_round_trip(codec):
+    assert codec.loads(codec.dumps(DATA)) == json.loads(json.dumps(DATA, ensure_ascii=False, indent=2))
+
+
+def test_encodes_models_urls_and_dates(codec):
+    created_at = datetime(2026, 10, 1, 12, 30, tzinfo=timezone.utc)
+    profile = Profile(name="Jan", linkedin_profile="https://www.linkedin.com/in/jan", created_at=created_at)
+    data = {
+        "profile": profile,
+        "url": profile.linkedin_profile,
+        "created_at": created_at,
+        "day": date(2026, 10, 1),
+    }
+
+    decoded = codec.loads(codec.dumps(data))
+
+    assert decoded == {
+        "profile": profile.model_dump(mode="json"),
+        "url": "https://www.linkedin.com/in/jan",
+        "created_at": "2026-10-01T12:30:00+00:00",
+        "day": "2026-10-01",
+    }
+    # Stores dump models in python mode; the stored file must validate back to the same model.
+    assert Profile.model_validate(codec.loads(codec.dumps(profile.model_dump()))) == profile
+
+
+def test_unknown_types_are_rejected(codec):
+    with pytest.raises(TypeError):
+        codec.dumps({"value": object()})
+
+
+def test_invalid_json_raises_value_error(codec):
+    with pytest.raises(ValueError):
+        codec.loads(b'{"id": ')
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.src.utils.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def _run_concurrently(flight: SingleFlight, fn, count: int):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do("key", fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    results, errors = _run_concurrently(flight, load, 5)
+
+    assert results == ["value"] * 5
+    assert errors == []
+    assert len(calls) == 1
+
+
+def test_leader_error_reaches_followers():
+    flight = SingleFlight()
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.1)
+        raise ValueError("drive down")
+
+    results, errors = _run_concurrently(flight, load, 5)
+
+    assert results == []
+    assert len(errors) == 5
+    assert all(isinstance(e, ValueError) for e in errors)
+    assert len(calls) == 1
+
+
+def test_key_is_released_after_completion():
+    flight = SingleFlight()
+
+    with pytest.raises(ValueError):
+        flight.do("key", lambda: (_ for _ in ()).throw(ValueError("first")))
+
+    assert flight.do("key", lambda: "second") == "second"
+    assert flight.do("key", lambda: "third") == "third"
+    assert flight._calls == {}
+
+
+def test_async_concurrent_calls_share_one_execution():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("key", load) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["value"] * 5
+    assert len(calls) == 1
+
+
+def test_async_leader_error_reaches_followers_and_key_is_released():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("drive down")
+
+    async def ok():
+        return "value"
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.do("key", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight._calls == {}
+        return await flight.do("key", ok)
+
+    assert asyncio.run(scenario()) == "value"
+    assert len(calls) == 1
+
+
+def test_async_cancelled_waiter_does_not_cancel_shared_call():
+    flight = AsyncSingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def scenario():
+        first = asyncio.create_task(flight.do("key", load))
+        second = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "value"